@@ -0,0 +1 @@
+"""Engine benchmarks on a recording ``maya.cmds`` stand-in (no Maya needed)."""
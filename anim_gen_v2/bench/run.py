@@ -0,0 +1,315 @@
+"""Call-count and latency benchmark for ``engine.generate()``.
+
+Runs a full generate for every bundled preset (``anim_gen_v2/presets``)
+with every combination of the secondary / arms layers on top of the
+cycle's primary layer, against the recording ``maya.cmds`` stand-in
+(:mod:`.standin`).  Each case is measured in three phases:
+
+``cold``
+    first generate after opening the rig scene (empty caches, no keys)
+``warm``
+    the same generate again (keys exist, full clear and re-key)
+``tweak``
+    one primary param nudged, incremental generate (auto-update drag)
+
+and reports Python time, ``cmds`` / ``mel`` calls and calls per key.
+Results are compared against the committed ``baseline.json``: more
+calls or a different key count than the baseline is a regression, and
+so is a phase's total time above the baseline's by more than
+``--time-tolerance``::
+
+    python -m anim_gen_v2.bench.run                      # compare
+    python -m anim_gen_v2.bench.run --update-baseline    # re-record
+
+Call counts are exact and machine independent; times depend on the
+machine, so re-record the baseline on the machine that compares (or
+pass ``--ignore-time``).  Times include the stand-in's own overhead.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+
+from ..core import plan
+from . import standin
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'baseline.json')
+
+CYCLE_TYPES = ('walk', 'run', 'sidestep')
+PHASES = ('cold', 'warm', 'tweak')
+
+# layers enabled per case; the primary layer is always on
+COMBOS = (('primary',),
+          ('primary', 'secondary'),
+          ('primary', 'arms'),
+          ('primary', 'secondary', 'arms'))
+ROLES = ('primary', 'secondary', 'arms')
+
+# plain transforms added to the rig so resolver scans cost what a
+# production rig's would
+FILLER_NODES = 250
+
+STANDARD_ATTRS = ('translateX', 'translateY', 'translateZ',
+                  'rotateX', 'rotateY', 'rotateZ',
+                  'scaleX', 'scaleY', 'scaleZ', 'visibility')
+
+
+# ── scene ──
+
+def rig_for(layers, start, end, filler=FILLER_NODES):
+    """``{node: [attr, ...]}`` with every control *layers* can touch."""
+    enabled = [layer.enabled for layer in layers]
+    for layer in layers:
+        layer.enabled = True
+    kp = plan.build(layers, start, end)
+    plan.clear_layer_cache()
+    for layer, on in zip(layers, enabled):
+        layer.enabled = on
+    rig = {}
+    for ctrl in kp.clear_ctrls:
+        rig.setdefault(ctrl, set(STANDARD_ATTRS)).update(kp.clear_attrs)
+    for c in kp.curves:
+        rig.setdefault(c.ctrl, set(STANDARD_ATTRS)).add(c.attr)
+    for ctrl in kp.fkik:
+        rig.setdefault(ctrl, set(STANDARD_ATTRS)).add('FKIKBlend')
+    for i in range(filler):
+        rig['benchFiller{:03d}'.format(i)] = set(STANDARD_ATTRS)
+    return {node: sorted(attrs) for node, attrs in rig.items()}
+
+
+def tweak(layer):
+    """Nudge the first numeric param of *layer* (sorted by name)."""
+    for key, value in sorted(layer.params().items()):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            layer.set_params({key: value + 1.0})
+            return key
+    return None
+
+
+# ── measuring ──
+
+def _measure(scene, fn):
+    scene.reset_calls()
+    t0 = time.perf_counter()
+    fn()
+    ms = (time.perf_counter() - t0) * 1000.0
+    return {'ms': ms, 'calls': scene.total_calls(),
+            'keys': scene.key_count(), 'commands': dict(scene.calls)}
+
+
+def bench_case(scene, engine, batch, data, cycle_type, combo, start, end,
+               variation=0, seed=None, repeat=3, filler=FILLER_NODES):
+    """Measure one preset / layer combination; returns ``{phase: result}``.
+
+    Call and key counts come from the last repetition (they are the
+    same every time); ``ms`` is the fastest repetition.
+    """
+    best = {}
+    rig = None
+    for _ in range(repeat):
+        layers = batch.layers_for_preset(data, cycle_type)
+        for role, layer in zip(ROLES, layers):
+            layer.enabled = role in combo
+        if rig is None:
+            rig = rig_for(layers, start, end, filler)
+        scene.open_scene(rig, (start, end))
+        engine.invalidate_cache()
+        plan.clear_layer_cache()
+        generate = partial(engine.generate, layers, variation=variation,
+                           seed=seed)
+        runs = {'cold': _measure(scene, generate),
+                'warm': _measure(scene, generate)}
+        tweak(layers[0])
+        runs['tweak'] = _measure(scene, partial(generate, incremental=True))
+        for phase, r in runs.items():
+            if phase in best:
+                r['ms'] = min(r['ms'], best[phase]['ms'])
+            best[phase] = r
+    plan.clear_layer_cache()
+    return best
+
+
+def run_all(start=1.0, end=25.0, cycle_types=CYCLE_TYPES, repeat=3,
+            filler=FILLER_NODES, verbose=True):
+    """Benchmark every bundled preset; returns ``{case name: phases}``."""
+    results = {}
+    with standin.installed() as scene:
+        from ..core import batch, engine, presets
+
+        for cycle_type in cycle_types:
+            # library presets only: project_root='' skips the workspace
+            for entry in presets.list_presets(cycle_type, project_root=''):
+                data = presets.load(entry['path'])
+                variation, seed = presets.variation_settings(data)
+                for combo in COMBOS:
+                    name = '{}/{}/{}'.format(cycle_type, entry['name'],
+                                             '+'.join(combo))
+                    results[name] = bench_case(scene, engine, batch, data,
+                                               cycle_type, combo, start, end,
+                                               variation, seed, repeat,
+                                               filler)
+                    if verbose:
+                        print(format_case(name, results[name]))
+    return results
+
+
+# ── reporting ──
+
+def _per_key(r):
+    return r['calls'] / float(r['keys']) if r['keys'] else 0.0
+
+
+def format_case(name, phases):
+    parts = ['{:<5} {:>4} calls {:>5.2f}/key {:>6.1f} ms'.format(
+        phase, phases[phase]['calls'], _per_key(phases[phase]),
+        phases[phase]['ms']) for phase in PHASES]
+    return '// {:<48} {}'.format(name, ' | '.join(parts))
+
+
+def summary(results):
+    """Totals per phase plus the busiest commands over every case."""
+    lines = []
+    commands = {}
+    for phase in PHASES:
+        rs = [phases[phase] for phases in results.values()]
+        calls = sum(r['calls'] for r in rs)
+        keys = sum(r['keys'] for r in rs)
+        ms = sum(r['ms'] for r in rs)
+        lines.append('// {:<5} {} cases: {} calls, {} keys ({:.2f} calls/key), '
+                     '{:.1f} ms'.format(phase, len(rs), calls, keys,
+                                        calls / float(keys) if keys else 0.0,
+                                        ms))
+        for r in rs:
+            for cmd, n in r['commands'].items():
+                commands[cmd] = commands.get(cmd, 0) + n
+    top = sorted(commands.items(), key=lambda kv: -kv[1])[:8]
+    lines.append('// busiest commands: ' + ', '.join(
+        '{} {}'.format(cmd, n) for cmd, n in top))
+    return '\n'.join(lines)
+
+
+# ── baseline ──
+
+def save_baseline(results, path=BASELINE, **meta):
+    data = {'meta': dict(meta, python=sys.version.split()[0]),
+            'cases': results}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline(path=BASELINE):
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare(results, baseline, time_tolerance=0.5):
+    """Return one message per regression against *baseline* results.
+
+    Per case and phase: more calls or a different scene key count.
+    Per phase, unless *time_tolerance* is None: a total time (over the
+    cases both runs have) more than ``time_tolerance`` above the
+    baseline's.  Single cases take a few ms, too little to time alone.
+    """
+    problems = []
+    totals = {phase: [0.0, 0.0] for phase in PHASES}
+    for name, phases in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for phase in PHASES:
+            r, b = phases[phase], base.get(phase)
+            if b is None:
+                continue
+            totals[phase][0] += r['ms']
+            totals[phase][1] += b['ms']
+            where = '{} [{}]'.format(name, phase)
+            if r['keys'] != b['keys']:
+                problems.append('{}: {} keys, baseline {}'.format(
+                    where, r['keys'], b['keys']))
+            if r['calls'] > b['calls']:
+                grew = sorted(
+                    (cmd, n - b['commands'].get(cmd, 0))
+                    for cmd, n in r['commands'].items()
+                    if n > b['commands'].get(cmd, 0))
+                problems.append('{}: {} calls, baseline {} ({})'.format(
+                    where, r['calls'], b['calls'],
+                    ', '.join('{} +{}'.format(c, n) for c, n in grew)))
+    if time_tolerance is not None:
+        for phase in PHASES:
+            ms, base_ms = totals[phase]
+            if base_ms and ms > base_ms * (1.0 + time_tolerance):
+                problems.append('{} phase: {:.1f} ms, baseline {:.1f} ms'.format(
+                    phase, ms, base_ms))
+    missing = sorted(set(baseline) - set(results))
+    for name in missing:
+        problems.append('{}: in the baseline but not benchmarked'.format(name))
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description='Benchmark engine.generate() call counts and latency '
+                    'on a recording maya.cmds stand-in.')
+    ap.add_argument('--start', type=float, default=1)
+    ap.add_argument('--end', type=float, default=25)
+    ap.add_argument('--types', nargs='+', default=list(CYCLE_TYPES),
+                    choices=CYCLE_TYPES)
+    ap.add_argument('--repeat', type=int, default=3,
+                    help='repetitions per case (fastest time is kept)')
+    ap.add_argument('--filler', type=int, default=FILLER_NODES,
+                    help='extra transforms in the rig scene')
+    ap.add_argument('--baseline', default=BASELINE)
+    ap.add_argument('--update-baseline', action='store_true',
+                    help='record the results as the new baseline')
+    ap.add_argument('--time-tolerance', type=float, default=0.5,
+                    help='allowed slowdown over the baseline (0.5 = 50%%)')
+    ap.add_argument('--ignore-time', action='store_true',
+                    help='only compare call and key counts')
+    ap.add_argument('--quiet', action='store_true',
+                    help='only print the summary')
+    args = ap.parse_args(argv)
+
+    results = run_all(args.start, args.end, args.types, max(1, args.repeat),
+                      args.filler, verbose=not args.quiet)
+    print(summary(results))
+    if args.update_baseline:
+        save_baseline(results, args.baseline, start=args.start, end=args.end,
+                      repeat=args.repeat, filler=args.filler)
+        print('// AnimGenV2 bench: baseline written -> {}'.format(
+            args.baseline))
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print('// AnimGenV2 bench: no baseline at {} '
+              '(run with --update-baseline)'.format(args.baseline))
+        return 0
+    meta = baseline.get('meta', {})
+    if (meta.get('start'), meta.get('end'), meta.get('filler')) \
+            != (args.start, args.end, args.filler):
+        print('!! baseline was recorded with start={} end={} filler={}; '
+              'counts are not comparable'.format(
+                  meta.get('start'), meta.get('end'), meta.get('filler')))
+        return 1
+    cases = baseline.get('cases', {})
+    if args.types != list(CYCLE_TYPES):
+        cases = {k: v for k, v in cases.items()
+                 if k.split('/')[0] in args.types}
+    problems = compare(results, cases,
+                       None if args.ignore_time else args.time_tolerance)
+    for p in problems:
+        print('!! regression: {}'.format(p))
+    print('// AnimGenV2 bench: {} cases, {} regressions'.format(
+        len(results), len(problems)))
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,538 @@
+"""Recording in-memory stand-in for ``maya.cmds`` / ``maya.mel`` / OpenMaya.
+
+Just enough of Maya for :mod:`anim_gen_v2.core.engine` to run a full
+generate outside Maya: transforms with plain double attributes,
+animCurves with keys, tangents and infinity, incoming connections,
+locks, and the scene message callbacks the resolver registers.  Every
+``cmds`` / ``mel`` call is counted per command in :attr:`Scene.calls`,
+which is what the benchmark measures.
+
+Only the benchmark installs it, and only for the duration of a run::
+
+    with standin.installed() as scene:
+        from anim_gen_v2.core import engine
+        scene.open_scene({'RootX_M': ['translateX', ...]})
+        engine.generate(layers)
+        print(scene.total_calls(), scene.key_count())
+
+It is not a Maya emulator -- values are linearly interpolated, units
+are fixed (film / deg / cm) and unsupported flags are ignored.
+"""
+
+import bisect
+import contextlib
+import fnmatch
+import importlib
+import re
+import sys
+import types
+from collections import Counter
+
+# Modules that bind maya at import time; re-imported against the stand-in
+# and restored afterwards.
+MAYA_MODULES = ('maya', 'maya.cmds', 'maya.mel', 'maya.api',
+                'maya.api.OpenMaya')
+BOUND_MODULES = ('anim_gen_v2.core.resolver', 'anim_gen_v2.core.plugs',
+                 'anim_gen_v2.core.presets', 'anim_gen_v2.core.engine')
+
+_MEL_SETATTR = re.compile(r'setAttr\s+"([^"]+)"\s+([^;]+)')
+_RANGE = re.compile(r'^(.+)\.(\w+)\[(\d+):(\d+)\]$')
+
+
+def _as_list(obj):
+    if obj is None:
+        return []
+    if isinstance(obj, (list, tuple)):
+        return list(obj)
+    return [obj]
+
+
+def _time_range(t):
+    """``t=`` flag value as an inclusive ``(lo, hi)`` range."""
+    if isinstance(t, (list, tuple)):
+        return float(t[0]), float(t[-1])
+    return float(t), float(t)
+
+
+class Scene:
+    """In-memory scene plus the recorded call counts."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self._next_cb = 1
+        self._callbacks = {}   # id -> (event, fn)
+        self.reset()
+
+    # ── scene setup (not recorded) ──
+
+    def reset(self):
+        """Empty scene: no nodes, curves or connections."""
+        self.nodes = {}     # name -> {'type', 'attrs': {attr: value}, 'locked': set}
+        self.curves = {}    # animCurve -> {'plug', 'keys': [...], 'infinity'}
+        self.inputs = {}    # driven plug -> source plug
+        self.time = 1.0
+        self.playback = (1.0, 25.0)
+        self.undo_depth = 0
+
+    def open_scene(self, rig, playback=(1.0, 25.0), node_type='transform'):
+        """Replace the scene with *rig* (``{node: [attr, ...]}``).
+
+        Fires the after-open callbacks like a file open would, so the
+        resolver drops its scene map.
+        """
+        self.reset()
+        self.playback = (float(playback[0]), float(playback[1]))
+        self.time = self.playback[0]
+        for node, attrs in rig.items():
+            self.add_node(node, attrs, node_type)
+        self._fire('afterOpen')
+
+    def add_node(self, name, attrs=(), node_type='transform', locked=()):
+        self.nodes[name] = {'type': node_type,
+                            'attrs': {a: 0.0 for a in attrs},
+                            'locked': set(locked)}
+
+    def connect(self, src, dst):
+        """Drive plug *dst* from *src* (e.g. a constraint output)."""
+        self.inputs[dst] = src
+
+    def reset_calls(self):
+        self.calls.clear()
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def key_count(self):
+        """Keys on every animCurve in the scene."""
+        return sum(len(c['keys']) for c in self.curves.values())
+
+    # ── plug helpers ──
+
+    @staticmethod
+    def _split(plug):
+        node, _, attr = plug.partition('.')
+        return node, attr
+
+    def _plug_exists(self, plug):
+        node, attr = self._split(plug)
+        return node in self.nodes and attr in self.nodes[node]['attrs']
+
+    def _curve_of(self, plug):
+        src = self.inputs.get(plug)
+        if src is None:
+            return None
+        node = self._split(src)[0]
+        return node if node in self.curves else None
+
+    def _targets(self, objs, at=None):
+        """``(node, attr)`` plugs named by *objs* / the ``at=`` flag."""
+        out = []
+        for obj in _as_list(objs):
+            node, attr = self._split(obj)
+            if attr:
+                out.append((node, attr))
+            elif at:
+                out.extend((node, a) for a in _as_list(at))
+            elif node in self.nodes:
+                out.extend((node, a) for a in self.nodes[node]['attrs'])
+        return out
+
+    def _curve_targets(self, objs, at=None):
+        """animCurves named directly by *objs*, or driving the plugs."""
+        out = []
+        for obj in _as_list(objs):
+            if obj in self.curves and not at:
+                out.append(obj)
+                continue
+            for node, attr in self._targets(obj, at):
+                curve = self._curve_of('{}.{}'.format(node, attr))
+                if curve:
+                    out.append(curve)
+        return out
+
+    def _value(self, plug):
+        curve = self._curve_of(plug)
+        if curve:
+            return self._evaluate(curve, self.time)
+        node, attr = self._split(plug)
+        return self.nodes[node]['attrs'][attr]
+
+    def _evaluate(self, curve, t):
+        keys = self.curves[curve]['keys']
+        if not keys:
+            return 0.0
+        times = [k.t for k in keys]
+        if t <= times[0]:
+            return keys[0].v
+        if t >= times[-1]:
+            return keys[-1].v
+        i = bisect.bisect_right(times, t)
+        a, b = keys[i - 1], keys[i]
+        s = (t - a.t) / (b.t - a.t)
+        return a.v + (b.v - a.v) * s
+
+    def _set_key(self, node, attr, t, v, itt, ott):
+        plug = '{}.{}'.format(node, attr)
+        curve = self._curve_of(plug)
+        if curve is None:
+            curve = '{}_{}'.format(node.replace(':', '_'), attr)
+            n = 1
+            while curve in self.curves or curve in self.nodes:
+                n += 1
+                curve = '{}_{}{}'.format(node.replace(':', '_'), attr, n)
+            self.curves[curve] = {'plug': plug, 'keys': [],
+                                  'infinity': ('constant', 'constant')}
+            self.inputs[plug] = curve + '.output'
+        if v is None:
+            v = self._value(plug)
+        keys = self.curves[curve]['keys']
+        i = bisect.bisect_left(keys, _Key(t, 0.0))
+        if i < len(keys) and keys[i].t == t:
+            keys[i].v = float(v)
+            return
+        keys.insert(i, _Key(t, float(v), itt, ott))
+
+    # ── recorded commands ──
+
+    def ls(self, *args, **kwargs):
+        types_ = _as_list(kwargs.get('type'))
+        if 'transform' in types_:
+            types_.append('joint')
+        names = []
+        for arg in args:
+            names.extend(_as_list(arg))
+        if not names:
+            names = ['*']
+        out = []
+        for name in names:
+            if '.' in name:
+                if self._plug_exists(name):
+                    out.append(name)
+                continue
+            if not any(c in name for c in '*?['):
+                data = self.nodes.get(name)
+                if data and (not types_ or data['type'] in types_) \
+                        and name not in out:
+                    out.append(name)
+                continue
+            for node, data in self.nodes.items():
+                if types_ and data['type'] not in types_:
+                    continue
+                if fnmatch.fnmatchcase(node, name) and node not in out:
+                    out.append(node)
+        return out
+
+    def objExists(self, name):
+        if '.' in name:
+            return self._plug_exists(name)
+        return name in self.nodes or name in self.curves
+
+    def attributeQuery(self, attr, node=None, exists=False, **_):
+        return node in self.nodes and attr in self.nodes[node]['attrs']
+
+    def listAttr(self, node, locked=False, **_):
+        data = self.nodes.get(node)
+        if data is None:
+            return []
+        if locked:
+            return sorted(data['locked'])
+        return list(data['attrs'])
+
+    def getAttr(self, plug, lock=False, keyable=False, **_):
+        if not self._plug_exists(plug):
+            raise ValueError('No object matches name: {}'.format(plug))
+        node, attr = self._split(plug)
+        if lock:
+            return attr in self.nodes[node]['locked']
+        if keyable:
+            return True
+        return self._value(plug)
+
+    def setAttr(self, plug, *values, **_):
+        m = _RANGE.match(plug)
+        if m:
+            self._set_range(m.group(1), m.group(2), int(m.group(3)),
+                            int(m.group(4)), values)
+            return
+        if not self._plug_exists(plug):
+            raise RuntimeError('No object matches name: {}'.format(plug))
+        node, attr = self._split(plug)
+        if attr in self.nodes[node]['locked']:
+            raise RuntimeError('The attribute {} is locked'.format(plug))
+        if plug in self.inputs and self._curve_of(plug) is None:
+            raise RuntimeError('{} has an incoming connection'.format(plug))
+        self.nodes[node]['attrs'][attr] = float(values[0])
+
+    def _set_range(self, curve, field, lo, hi, values):
+        keys = self.curves[curve]['keys']
+        if hi >= len(keys):
+            raise RuntimeError('{}.{}[{}:{}] out of range'.format(
+                curve, field, lo, hi))
+        if field == 'ktv':
+            for i, j in enumerate(range(lo, hi + 1)):
+                keys[j].t = float(values[2 * i])
+                keys[j].v = float(values[2 * i + 1])
+            keys.sort()
+        else:
+            for i, j in enumerate(range(lo, hi + 1)):
+                keys[j].tangent[field] = float(values[i])
+
+    def connectionInfo(self, plug, isDestination=False, **_):
+        return plug in self.inputs if isDestination else False
+
+    def listConnections(self, objs, s=True, d=True, plugs=False,
+                        connections=False, type=None, **_):
+        out = []
+        for plug in _as_list(objs):
+            src = self.inputs.get(plug) if s else None
+            if src is None:
+                continue
+            src_node = self._split(src)[0]
+            if type == 'animCurve' and src_node not in self.curves:
+                continue
+            if connections:
+                out.append(plug)
+            out.append(src if plugs else src_node)
+        return out
+
+    def cutKey(self, objs, at=None, time=None, **_):
+        lo, hi = _time_range(time) if time is not None \
+            else (float('-inf'), float('inf'))
+        for curve in self._curve_targets(objs, at):
+            data = self.curves[curve]
+            data['keys'] = [k for k in data['keys'] if not lo <= k.t <= hi]
+            if not data['keys']:   # Maya deletes an emptied curve
+                del self.inputs[data['plug']]
+                del self.curves[curve]
+
+    def setKeyframe(self, objs, at=None, t=None, v=None, itt='auto',
+                    ott='auto', **_):
+        times = _as_list(t) or [self.time]
+        for node, attr in self._targets(objs, at):
+            if not self._plug_exists('{}.{}'.format(node, attr)):
+                continue
+            if attr in self.nodes[node]['locked']:
+                continue
+            for time in times:
+                self._set_key(node, attr, float(time), v, itt, ott)
+        return len(times)
+
+    def keyframe(self, objs, at=None, q=False, e=False, t=None,
+                 indexValue=False, vc=None, **_):
+        lo, hi = _time_range(t) if t is not None \
+            else (float('-inf'), float('inf'))
+        curves = self._curve_targets(objs, at)
+        if q:
+            out = []
+            for curve in curves:
+                keys = self.curves[curve]['keys']
+                if indexValue:
+                    out.extend(i for i, k in enumerate(keys)
+                               if lo <= k.t <= hi)
+                else:
+                    out.extend(k.t for k in keys if lo <= k.t <= hi)
+            return out
+        if e and vc is not None:
+            for curve in curves:
+                for k in self.curves[curve]['keys']:
+                    if lo <= k.t <= hi:
+                        k.v = float(vc)
+        return len(curves)
+
+    def keyTangent(self, objs, at=None, index=None, itt=None, ott=None, **_):
+        for curve in self._curve_targets(objs, at):
+            keys = self.curves[curve]['keys']
+            lo, hi = index if index is not None else (0, len(keys) - 1)
+            for k in keys[lo:hi + 1]:
+                if itt:
+                    k.itt = itt
+                if ott:
+                    k.ott = ott
+
+    def setInfinity(self, objs, at=None, poi='constant', pri='constant', **_):
+        for curve in self._curve_targets(objs, at):
+            self.curves[curve]['infinity'] = (pri, poi)
+
+    def currentUnit(self, q=False, time=False, angle=False, linear=False):
+        if time:
+            return 'film'
+        if angle:
+            return 'deg'
+        return 'cm'
+
+    def playbackOptions(self, q=False, min=False, max=False, **_):
+        return self.playback[0] if min else self.playback[1]
+
+    def currentTime(self, t=None, q=False, update=True):
+        if q or t is None:
+            return self.time
+        self.time = float(t)
+        return self.time
+
+    def undoInfo(self, openChunk=False, closeChunk=False, **_):
+        if openChunk:
+            self.undo_depth += 1
+        elif closeChunk:
+            self.undo_depth -= 1
+
+    def workspace(self, q=False, rd=False, **_):
+        return ''
+
+    def mel_eval(self, script):
+        for plug, value in _MEL_SETATTR.findall(script):
+            self.setAttr(plug, float(value))
+
+    # ── OpenMaya message callbacks ──
+
+    def _add_callback(self, event, fn):
+        cb = self._next_cb
+        self._next_cb += 1
+        self._callbacks[cb] = (event, fn)
+        return cb
+
+    def _remove_callback(self, cb):
+        self._callbacks.pop(cb, None)
+
+    def _fire(self, event):
+        for ev, fn in list(self._callbacks.values()):
+            if ev == event:
+                fn(None)
+
+    # ── module objects ──
+
+    def modules(self):
+        """``{module name: module}`` to put into ``sys.modules``."""
+        scene = self
+        cmds = types.ModuleType('maya.cmds')
+        for name in ('ls', 'objExists', 'attributeQuery', 'listAttr',
+                     'getAttr', 'setAttr', 'connectionInfo',
+                     'listConnections', 'cutKey', 'setKeyframe', 'keyframe',
+                     'keyTangent', 'setInfinity', 'currentUnit',
+                     'playbackOptions', 'currentTime', 'undoInfo',
+                     'workspace'):
+            setattr(cmds, name, self._recorded(name, getattr(self, name)))
+        mel = types.ModuleType('maya.mel')
+        mel.eval = self._recorded('mel.eval', self.mel_eval)
+
+        om = types.ModuleType('maya.api.OpenMaya')
+
+        class MObject:
+            def hasFn(self, _fn):
+                return False
+
+        class MFn:
+            kTransform = 'kTransform'
+
+        class MFnDependencyNode:
+            def __init__(self, _mobj):
+                pass
+
+            def name(self):
+                return ''
+
+        class MMessage:
+            removeCallback = staticmethod(scene._remove_callback)
+
+        class MDGMessage:
+            @staticmethod
+            def addNodeAddedCallback(fn, _type='dependNode'):
+                return scene._add_callback('nodeAdded', fn)
+
+            @staticmethod
+            def addNodeRemovedCallback(fn, _type='dependNode'):
+                return scene._add_callback('nodeRemoved', fn)
+
+        class MNodeMessage:
+            @staticmethod
+            def addNameChangedCallback(_node, fn):
+                return scene._add_callback('nameChanged', fn)
+
+        class MSceneMessage:
+            kAfterNew = 'afterNew'
+            kAfterOpen = 'afterOpen'
+            kBeforeNew = 'beforeNew'
+            kBeforeOpen = 'beforeOpen'
+
+            @staticmethod
+            def addCallback(event, fn):
+                return scene._add_callback(event, fn)
+
+        for cls in (MObject, MFn, MFnDependencyNode, MMessage, MDGMessage,
+                    MNodeMessage, MSceneMessage):
+            setattr(om, cls.__name__, cls)
+
+        api = types.ModuleType('maya.api')
+        api.OpenMaya = om
+        maya = types.ModuleType('maya')
+        maya.__path__ = []
+        maya.cmds, maya.mel, maya.api = cmds, mel, api
+        return {'maya': maya, 'maya.cmds': cmds, 'maya.mel': mel,
+                'maya.api': api, 'maya.api.OpenMaya': om}
+
+    def _recorded(self, name, fn):
+        calls = self.calls
+
+        def call(*args, **kwargs):
+            calls[name] += 1
+            return fn(*args, **kwargs)
+        call.__name__ = name
+        return call
+
+
+class _Key:
+    """One animCurve key, ordered by time."""
+
+    __slots__ = ('t', 'v', 'itt', 'ott', 'tangent')
+
+    def __init__(self, t, v, itt='auto', ott='auto'):
+        self.t = t
+        self.v = v
+        self.itt = itt
+        self.ott = ott
+        self.tangent = {}   # kix / kiy / kox / koy
+
+    def __lt__(self, other):
+        return self.t < other.t
+
+
+def real_maya_loaded():
+    """True if the real ``maya.cmds`` is already imported (inside Maya)."""
+    mod = sys.modules.get('maya.cmds')
+    return mod is not None and not getattr(mod, '__standin__', False)
+
+
+@contextlib.contextmanager
+def installed():
+    """Install a fresh stand-in :class:`Scene` as ``maya`` for the block.
+
+    The maya modules and the anim_gen_v2 modules bound to them are
+    swapped out on entry and restored on exit, so nothing outside the
+    block sees the stand-in.  Refuses to run inside a real Maya session.
+    """
+    if real_maya_loaded():
+        raise RuntimeError('the maya stand-in must not replace a real Maya '
+                           'session; run the benchmark from plain Python')
+    scene = Scene()
+    fakes = scene.modules()
+    fakes['maya.cmds'].__standin__ = True
+    saved = {name: sys.modules.pop(name, None)
+             for name in MAYA_MODULES + BOUND_MODULES}
+    sys.modules.update(fakes)
+    try:
+        for name in BOUND_MODULES:
+            importlib.import_module(name)
+        yield scene
+    finally:
+        for name in MAYA_MODULES + BOUND_MODULES:
+            sys.modules.pop(name, None)
+            if saved[name] is not None:
+                sys.modules[name] = saved[name]
+        # the package attributes must point back at the original modules
+        for name in BOUND_MODULES:
+            pkg, _, attr = name.rpartition('.')
+            if pkg not in sys.modules:
+                continue
+            if saved[name] is not None:
+                setattr(sys.modules[pkg], attr, saved[name])
+            elif hasattr(sys.modules[pkg], attr):
+                delattr(sys.modules[pkg], attr)
@@ -0,0 +1,169 @@
+"""Batch planner -- turn every preset in the library into a KeyPlan file.
+
+Loads each preset found by ``presets.list_presets()``, builds its Layer
+objects (primary for the cycle type + secondary + arms, exactly like
+the window does), evaluates all channels in a process pool and writes
+one plan file per preset.  A later Maya session applies any of them
+without recomputation::
+
+    from anim_gen_v2.core import engine, plan
+    engine.apply_plan(plan.KeyPlan.load(path).retimed(*engine.timeline_range()))
+
+Run from a plain Python / mayapy process::
+
+    python -m anim_gen_v2.core.batch OUT_DIR --start 1 --end 25 --workers 4
+
+Inside the Maya GUI ``sys.executable`` is ``maya.exe``, which can't
+host pool workers, so :func:`generate_library` runs serially there.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import plan, presets
+
+CYCLE_TYPES = ('walk', 'run', 'sidestep')
+
+
+# ── layers from preset data ──
+
+def layers_for_preset(data, cycle_type='walk'):
+    """Return the layer list for *cycle_type* with preset *data* applied."""
+    from ..layers.walk_primary import WalkPrimary
+    from ..layers.run_primary import RunPrimary
+    from ..layers.sidestep_primary import SidestepPrimary
+    from ..layers.walk_secondary import WalkSecondary
+    from ..layers.walk_arms import WalkArms
+
+    primary = {'run': RunPrimary,
+               'sidestep': SidestepPrimary}.get(cycle_type, WalkPrimary)()
+    secondary = WalkSecondary()
+    arms = WalkArms()
+    if 'primary' in data:
+        primary.set_params(data['primary'])
+    if 'secondary' in data:
+        secondary.set_params(data['secondary'])
+    if 'arms' in data:
+        arms.set_params(data['arms'])
+    return [primary, secondary, arms]
+
+
+# ── worker ──
+
+def plan_preset(job):
+    """Build and save the plan for one preset (runs in a pool worker).
+
+    *job* is a dict with ``entry`` (from ``list_presets``), ``cycle_type``,
+    ``start``, ``end`` and ``out_path``.  Returns a result dict; errors
+    are reported in it rather than raised so one bad preset doesn't
+    abort the batch.
+    """
+    entry = job['entry']
+    result = {'name': entry['name'], 'source': entry['source'],
+              'cycle_type': job['cycle_type'], 'path': job['out_path'],
+              'curves': 0, 'keys': 0, 'error': None}
+    t0 = time.perf_counter()
+    try:
+        data = presets.load(entry['path'])
+        layers = layers_for_preset(data, job['cycle_type'])
+        variation, seed = presets.variation_settings(data)
+        kp = plan.build(layers, job['start'], job['end'],
+                        variation=variation, seed=seed)
+        kp.meta.update({'preset': entry['name'], 'source': entry['source'],
+                        'cycle_type': job['cycle_type'],
+                        'preset_path': entry['path']})
+        kp.save(job['out_path'])
+        result['curves'] = len(kp.curves)
+        result['keys'] = kp.key_count()
+    except Exception as e:
+        result['error'] = '{}: {}'.format(type(e).__name__, e)
+    result['ms'] = (time.perf_counter() - t0) * 1000.0
+    return result
+
+
+# ── batch entry point ──
+
+def _in_maya_gui():
+    exe = os.path.basename(sys.executable).lower()
+    return exe.startswith('maya') and not exe.startswith('mayapy')
+
+
+def collect_jobs(out_dir, start, end, cycle_types=CYCLE_TYPES,
+                 binary=False, project_root=None):
+    """Return one job dict per preset found for *cycle_types*."""
+    ext = plan.BINARY_EXT if binary else '.json'
+    jobs = []
+    for cycle_type in cycle_types:
+        seen = set()
+        for entry in presets.list_presets(cycle_type, project_root):
+            name = entry['name']
+            if name in seen:   # project preset shadowing a library one
+                name = '{}__{}'.format(entry['source'], name)
+            seen.add(name)
+            jobs.append({
+                'entry': entry,
+                'cycle_type': cycle_type,
+                'start': start,
+                'end': end,
+                'out_path': os.path.join(out_dir, cycle_type, name + ext),
+            })
+    return jobs
+
+
+def generate_library(out_dir, start=1, end=25, cycle_types=CYCLE_TYPES,
+                     workers=None, binary=False, project_root=None,
+                     verbose=True):
+    """Plan every preset of *cycle_types* and write one file per preset.
+
+    *workers*: pool size (``None`` = CPU count, ``1`` = serial).
+    *binary*: write compact ``.agkp`` key tables instead of JSON.
+    *project_root*: Maya project whose ``data/anim_presets`` is included.
+
+    Returns the list of per-preset result dicts.
+    """
+    jobs = collect_jobs(out_dir, start, end, cycle_types, binary,
+                        project_root)
+    t0 = time.perf_counter()
+    if workers == 1 or len(jobs) < 2 or _in_maya_gui():
+        results = [plan_preset(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(plan_preset, jobs))
+    if verbose:
+        for r in results:
+            if r['error']:
+                print('!! {cycle_type}/{name}: {error}'.format(**r))
+            else:
+                print('// {cycle_type}/{name}: {curves} curves, {keys} keys '
+                      '({ms:.1f} ms)'.format(**r))
+        print('// AnimGenV2 batch: {} presets in {:.2f} s -> {}'.format(
+            len(results), time.perf_counter() - t0, out_dir))
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description='Write one KeyPlan file per anim_gen_v2 preset.')
+    ap.add_argument('out_dir')
+    ap.add_argument('--start', type=float, default=1)
+    ap.add_argument('--end', type=float, default=25)
+    ap.add_argument('--types', nargs='+', default=list(CYCLE_TYPES),
+                    choices=CYCLE_TYPES)
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--binary', action='store_true',
+                    help='write {} key tables instead of JSON'.format(
+                        plan.BINARY_EXT))
+    ap.add_argument('--project', default=None,
+                    help='Maya project root to include project presets from')
+    args = ap.parse_args(argv)
+    results = generate_library(args.out_dir, args.start, args.end,
+                               args.types, args.workers, args.binary,
+                               args.project)
+    return 1 if any(r['error'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
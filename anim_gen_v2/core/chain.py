@@ -0,0 +1,127 @@
+"""Chain wiggle -- one wave travelling down a long FK chain.
+
+A hair / tail / tentacle chain of any length is described by a handful
+of numbers instead of one row per joint: a falloff profile (amplitude
+weight from root to tip) shared by all axes, and per axis an amplitude,
+offset and phase lag per joint.  :func:`chain_channels` expands that to
+one wave Channel per joint and axis; ``plan.build`` evaluates them all
+in one vectorised ``evaluator`` pass and ``engine`` keys them in bulk::
+
+    weights = profile_weights(parse_profile(DEFAULT_PROFILE), len(nodes))
+    chs = chain_channels(nodes, {'rotateY': ChainAxis(25, lag=0.08)}, weights)
+
+Pure Python (no Maya).
+"""
+
+from dataclasses import dataclass
+
+from .channel import Channel
+from .patterns import Wave
+
+AXES = ('rotateX', 'rotateY', 'rotateZ')
+
+# keys per wave cycle; a lagged sine isn't aligned with the quarters,
+# so it gets twice the classic 5-point density
+KEYS_PER_CYCLE = 8
+
+# default profile: full amplitude at the root, easing to 20% at the tip
+DEFAULT_PROFILE = '1,0,2,0.2,1,2'
+
+
+@dataclass
+class ChainAxis:
+    """Wave for one rotate axis of the whole chain.
+
+    *amplitude* is scaled per joint by the falloff profile, *lag* is the
+    phase delay from one joint to the next in cycles (0.1 = the tip of
+    an 11-joint chain trails the root by a full cycle), *frequency* is
+    in cycles per playback range.
+    """
+
+    amplitude: float = 0.0
+    offset: float = 0.0
+    lag: float = 0.0
+    frequency: int = 1
+
+    def to_dict(self):
+        return {'amplitude': self.amplitude, 'offset': self.offset,
+                'lag': self.lag, 'frequency': self.frequency}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(amplitude=float(data.get('amplitude', 0.0)),
+                   offset=float(data.get('offset', 0.0)),
+                   lag=float(data.get('lag', 0.0)),
+                   frequency=max(1, int(data.get('frequency', 1))))
+
+
+# ── falloff profile ──
+
+def parse_profile(text):
+    """Parse a ``gradientControlNoAttr`` string into sorted points.
+
+    The string is ``value,position,interp`` triplets (interp 0 = none,
+    1 = linear, 2 = smooth, 3 = spline).  Returns ``[(position, value,
+    interp), ...]`` sorted by position; an empty string gives a flat
+    full-strength profile.
+    """
+    parts = [p for p in (text or '').split(',') if p.strip()]
+    points = []
+    for i in range(0, len(parts) - 2, 3):
+        try:
+            value = float(parts[i])
+            pos = float(parts[i + 1])
+            interp = int(float(parts[i + 2]))
+        except ValueError:
+            continue
+        points.append((pos, value, interp))
+    if not points:
+        return [(0.0, 1.0, 1)]
+    return sorted(points)
+
+
+def _profile_at(points, x):
+    if x <= points[0][0]:
+        return points[0][1]
+    for (p0, v0, interp), (p1, v1, _) in zip(points, points[1:]):
+        if x > p1:
+            continue
+        if interp == 0 or p1 <= p0:
+            return v0
+        s = (x - p0) / (p1 - p0)
+        if interp >= 2:   # smooth / spline: ease in and out
+            s = s * s * (3.0 - 2.0 * s)
+        return v0 + (v1 - v0) * s
+    return points[-1][1]
+
+
+def profile_weights(points, count):
+    """Falloff weight of each of *count* joints (root at 0, tip at 1)."""
+    if count < 2:
+        return [_profile_at(points, 0.0)] * count
+    return [_profile_at(points, i / (count - 1)) for i in range(count)]
+
+
+# ── channels ──
+
+def chain_channels(nodes, axes, weights):
+    """One wave Channel per joint and axis of the chain *nodes*.
+
+    *axes*: ``{attr: ChainAxis}``; axes with zero amplitude and offset
+    are skipped.  *weights*: per-joint falloff (``profile_weights``).
+    Joint ``i`` trails the root by ``i * lag`` cycles.
+    """
+    chs = []
+    for attr, axis in axes.items():
+        if not axis.amplitude and not axis.offset:
+            continue
+        freq = max(1, int(axis.frequency))
+        for i, (node, w) in enumerate(zip(nodes, weights)):
+            chs.append(Channel(node, attr, Wave.SINE,
+                               amplitude=axis.amplitude * w,
+                               offset=axis.offset,
+                               phase=-i * axis.lag,
+                               frequency=freq,
+                               n_points=KEYS_PER_CYCLE * freq + 1,
+                               label='{} {}'.format(node, attr)))
+    return chs
@@ -69,8 +69,16 @@ class Channel:
         return times[1] - times[0]
 
     def extended_normalized_times(self):
-        """Normalized times with one extra key before t=0 and after t=1."""
+        """Normalized times with one extra key before t=0 and after t=1.
+
+        Explicit *values* at *sample_at* positions wrap by one cycle
+        (second-to-last key at ``t - 1``, second key at ``t + 1``), which
+        stays periodic when the positions aren't evenly spaced.
+        """
         times = self.normalized_times()
+        if self.values is not None and self.sample_at is not None \
+                and len(times) >= 2:
+            return [times[-2] - 1.0] + times + [times[1] + 1.0]
         ivl = self._interval()
         return [times[0] - ivl] + times + [times[-1] + ivl]
 
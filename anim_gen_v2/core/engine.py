@@ -1,10 +1,21 @@
-"""Keyframe engine -- batch keying with undo-chunk wrapper."""
+"""Keyframe engine -- applies KeyPlans to Maya with undo-chunk wrapper.
 
-import random
+Planning (what to key) lives in :mod:`.plan` and runs without Maya;
+this module only writes plans to the scene.
+"""
+
+import math
 
 import maya.cmds as cmds
+import maya.mel as mel
+
+from . import plan, plugs, resolver
 
-from . import resolver
+# Keying backend used by _key_all():
+#   'bulk'    -- one setKeyframe per group of curves sharing key times,
+#                one ktv write per curve (default)
+#   'per_key' -- legacy one-call-per-key path, kept for debugging
+KEY_BACKEND = 'bulk'
 
 
 # ── timeline helpers ──
@@ -25,50 +36,115 @@ def frame_times(normalized, start=None, end=None):
     return [start + t * span for t in normalized]
 
 
+# ── per-pass caches ──
+
+def begin_pass():
+    """Reset per-pass caches (resolver results, plug capabilities).
+
+    Called by every entry point that touches keys; call it yourself
+    before using ``clear_keys`` / ``clear_plugs`` directly.
+    """
+    resolver.clear()
+    plugs.clear()
+    _units.clear()
+
+
+def changed_layers(layers):
+    """Enabled *layers* whose params changed since the last generate."""
+    start, end = timeline_range()
+    return plan.changed_layers(layers, start, end)
+
+
 # ── clear ──
 
 def clear_keys(ctrls, attrs=None):
     """Cut keys and reset attrs on *ctrls*, covering the extended range."""
     if attrs is None:
-        attrs = ['translateX', 'translateY', 'translateZ',
-                 'rotateX', 'rotateY', 'rotateZ', 'Roll']
-    start, end = timeline_range()
-    span = end - start
-    # clear generously: half the span beyond each side covers any offset
-    clear_start = start - span
-    clear_end = end + span
-    for name in ctrls:
-        node = resolver.resolve(name) or name
-        if not cmds.objExists(node):
+        attrs = plan.CLEAR_ATTRS
+    clear_plugs([(name, attr) for name in ctrls for attr in attrs])
+
+
+def clear_plugs(targets, time_range=None):
+    """Cut keys and reset each ``(ctrl, attr)`` in *targets* to 0.
+
+    *time_range* defaults to the playback range extended by one span
+    on each side (covers any curve offset).  All plugs are cleared in
+    one ``cutKey`` and reset in one batched write; the per-plug loop
+    is only used if the bulk path fails.
+    """
+    if time_range is None:
+        start, end = timeline_range()
+        span = end - start
+        time_range = (start - span, end + span)
+    pairs = []
+    for name, attr in targets:
+        pairs.append((resolver.resolve(name) or name, attr))
+    if not pairs:
+        return
+    try:
+        _clear_bulk(pairs, time_range)
+    except Exception as e:
+        print('!! bulk clear failed, clearing per plug: {}'.format(e))
+        _clear_each(pairs, time_range)
+
+
+def _clear_bulk(pairs, time_range):
+    full = ['{}.{}'.format(n, a) for n, a in pairs]
+    existing = set(cmds.ls(full) or [])
+    pairs = [p for p, f in zip(pairs, full) if f in existing]
+    if not pairs:
+        return
+    full = ['{}.{}'.format(n, a) for n, a in pairs]
+    cmds.cutKey(full, time=time_range)
+
+    # one query for every incoming connection left after the cut,
+    # one locked-attr listing per node
+    conns = cmds.listConnections(full, s=True, d=False, plugs=True,
+                                 connections=True) or []
+    driven = set(conns[0::2])
+    locked = {}
+    for node in sorted(set(n for n, _ in pairs)):
+        locked[node] = set(cmds.listAttr(node, locked=True) or [])
+    reset = []
+    for (node, attr), plug in zip(pairs, full):
+        is_locked = attr in locked[node]
+        is_driven = plug in driven
+        plugs.prime(node, attr, exists=True, locked=is_locked,
+                    connected=is_driven)
+        if not is_locked and not is_driven:
+            reset.append(plug)
+    if reset:
+        mel.eval(''.join('setAttr "{}" 0;'.format(p) for p in reset))
+
+
+def _clear_each(pairs, time_range):
+    for node, attr in pairs:
+        if not plugs.node_exists(node):
             continue
-        for attr in attrs:
-            if not cmds.attributeQuery(attr, node=node, exists=True):
-                continue
-            full = '{}.{}'.format(node, attr)
-            cmds.cutKey(node, at=attr, time=(clear_start, clear_end))
-            if not cmds.getAttr(full, lock=True) \
-               and not cmds.connectionInfo(full, isDestination=True):
-                try:
-                    cmds.setAttr(full, 0)
-                except Exception:
-                    pass
+        if not plugs.exists(node, attr):
+            continue
+        full = '{}.{}'.format(node, attr)
+        cmds.cutKey(node, at=attr, time=time_range)
+        if not plugs.locked(node, attr) \
+           and not plugs.connected(node, attr):
+            try:
+                cmds.setAttr(full, 0)
+            except Exception:
+                pass
 
 
 # ── single-key helper ──
 
 def _set_key(node, attr, t, v):
     """Set one keyframe, handling locked and connected attributes."""
-    full = '{}.{}'.format(node, attr)
-    locked = cmds.getAttr(full, lock=True)
-    if locked:
+    if plugs.locked(node, attr):
         try:
             cmds.setKeyframe(node, at=attr, t=t)
         except Exception:
             pass
         return
-    connected = cmds.connectionInfo(full, isDestination=True)
     try:
-        if connected:
+        if plugs.connected(node, attr):
             cmds.setKeyframe(node, at=attr, t=t)
             cmds.keyframe(node, at=attr, e=True, t=(t, t), vc=float(v))
         else:
@@ -77,26 +153,172 @@ def _set_key(node, attr, t, v):
         print('!! key failed {}.{} @ {}: {}'.format(node, attr, t, e))
 
 
+# ── whole-curve helper ──
+
+def _anim_curve(node, attr):
+    """Return the animCurve driving *node.attr* directly, or None."""
+    curves = cmds.listConnections('{}.{}'.format(node, attr), s=True,
+                                  d=False, type='animCurve') or []
+    return curves[0] if curves else None
+
+
+def _curve_block(node, attr, times):
+    """Return ``(curve, first, last)`` key indices of *times* on the
+    animCurve driving *node.attr*, or None if they aren't one
+    contiguous block on a directly connected curve."""
+    curve = _anim_curve(node, attr)
+    if not curve:
+        return None
+    return _index_block(curve, times)
+
+
+def _index_block(curve, times):
+    """``(curve, first, last)`` if *times* are one contiguous key block."""
+    idx = cmds.keyframe(curve, q=True, indexValue=True,
+                        t=(times[0], times[-1]))
+    if idx and len(idx) == len(times) and idx[-1] - idx[0] == len(idx) - 1:
+        return curve, idx[0], idx[-1]
+    return None
+
+
+_FPS = {'game': 15, 'film': 24, 'pal': 25, 'ntsc': 30,
+        'show': 48, 'palf': 50, 'ntscf': 60}
+_CM_PER_UNIT = {'mm': 0.1, 'cm': 1.0, 'm': 100.0, 'km': 100000.0,
+                'in': 2.54, 'ft': 30.48, 'yd': 91.44, 'mi': 160934.4}
+_units = {}   # per-pass cache of scene units, reset by begin_pass()
+
+
+def _slope_scale(attr):
+    """Factor turning a value-per-frame slope into tangent units
+    (internal value units per second) for *attr*."""
+    if not _units:
+        unit = cmds.currentUnit(q=True, time=True)
+        fps = _FPS.get(unit)
+        if fps is None:
+            try:
+                fps = float(unit.replace('fps', ''))
+            except ValueError:
+                fps = 24.0
+        _units['fps'] = fps
+        _units['deg'] = cmds.currentUnit(q=True, angle=True) == 'deg'
+        _units['cm'] = _CM_PER_UNIT.get(cmds.currentUnit(q=True, linear=True), 1.0)
+    scale = _units['fps']
+    if attr.startswith('rotate') and _units['deg']:
+        scale *= math.pi / 180.0
+    elif attr.startswith('translate'):
+        scale *= _units['cm']
+    return scale
+
+
+def _write_slopes(curve, first, last, attr, slopes):
+    """Give keys ``first..last`` of *curve* fixed tangents with *slopes*
+    (value units per frame), written as one block per tangent attr."""
+    scale = _slope_scale(attr)
+    xs, ys = [], []
+    for m in slopes:
+        y = m * scale
+        n = math.hypot(1.0, y)
+        xs.append(1.0 / n)
+        ys.append(y / n)
+    cmds.keyTangent(curve, index=(first, last), itt='fixed', ott='fixed')
+    rng = '[{}:{}]'.format(first, last)
+    for plug, data in (('kix', xs), ('kiy', ys), ('kox', xs), ('koy', ys)):
+        cmds.setAttr('{}.{}{}'.format(curve, plug, rng), *data)
+
+
+def _key_curve(node, attr, times, values, tangent='spline',
+               infinity='constant', slopes=None):
+    """Key one whole curve in a handful of calls.
+
+    One ``setKeyframe`` creates every key (with spline tangents) at
+    *times*, then the matching ``keyTimeValue`` block of the animCurve
+    is written with a single ``setAttr``.  Infinity (and, for
+    ``tangent='fixed'``, the analytic *slopes*) is set in the same
+    pass, so no separate finalize loop is needed.  Falls back to
+    per-key ``keyframe -e`` edits if the keys don't form one
+    contiguous index block (e.g. the plug is driven through a blend).
+    """
+    full = '{}.{}'.format(node, attr)
+    times = list(times)
+    if plugs.locked(node, attr):
+        try:
+            cmds.setKeyframe(node, at=attr, t=times)
+        except Exception:
+            pass
+        return
+    creation_tangent = 'spline' if tangent == 'fixed' else tangent
+    try:
+        cmds.setKeyframe(node, at=attr, t=times,
+                         itt=creation_tangent, ott=creation_tangent)
+        block = _curve_block(node, attr, times)
+        if block:
+            curve, first, last = block
+            flat = []
+            for t, v in zip(times, values):
+                flat.extend((t, float(v)))
+            cmds.setAttr('{}.ktv[{}:{}]'.format(curve, first, last), *flat)
+            if tangent == 'fixed' and slopes:
+                _write_slopes(curve, first, last, attr, slopes)
+            cmds.setInfinity(curve, poi=infinity, pri=infinity)
+        else:
+            for t, v in zip(times, values):
+                cmds.keyframe(node, at=attr, e=True, t=(t, t), vc=float(v))
+            cmds.setInfinity(node, at=attr, poi=infinity, pri=infinity)
+    except Exception as e:
+        print('!! curve key failed {}: {}'.format(full, e))
+
+
+def _key_group(items):
+    """Key curves that share key times and tangent type in one pass.
+
+    *items*: ``[(node, CurvePlan), ...]`` on unlocked plugs.  One
+    ``setKeyframe`` creates the keys on every plug and one
+    ``listConnections`` finds their animCurves; each curve then gets its
+    values in one ``ktv`` write, and infinity is set once per type.
+    Curves that don't end up as a contiguous key block on a directly
+    connected animCurve go through :func:`_key_curve`.
+    """
+    first = items[0][1]
+    times = list(first.times)
+    creation_tangent = 'spline' if first.tangent == 'fixed' else first.tangent
+    full = ['{}.{}'.format(node, c.attr) for node, c in items]
+    cmds.setKeyframe(full, t=times, itt=creation_tangent, ott=creation_tangent)
+    conns = cmds.listConnections(full, s=True, d=False, type='animCurve',
+                                 connections=True) or []
+    curve_of = dict(zip(conns[0::2], conns[1::2]))
+    infinity = {}   # infinity type -> [animCurve, ...]
+    for (node, c), plug in zip(items, full):
+        block = _index_block(curve_of[plug], times) if plug in curve_of else None
+        if block is None:
+            _key_curve(node, c.attr, c.times, c.values, c.tangent,
+                       c.infinity, c.slopes)
+            continue
+        curve, lo, hi = block
+        flat = []
+        for t, v in zip(times, c.values):
+            flat.extend((t, float(v)))
+        cmds.setAttr('{}.ktv[{}:{}]'.format(curve, lo, hi), *flat)
+        if c.tangent == 'fixed' and c.slopes:
+            _write_slopes(curve, lo, hi, c.attr, c.slopes)
+        infinity.setdefault(c.infinity, []).append(curve)
+    for inf, curves in infinity.items():
+        cmds.setInfinity(curves, poi=inf, pri=inf)
+
+
 # ── FKIK blend keying ──
 
-def _key_fkik(layers):
-    """Set and key FKIKBlend attributes required by each enabled layer.
+def _key_fkik(fkik, start, end):
+    """Set and key the FKIKBlend values in *fkik* (``{ctrl: value}``).
 
     Keyed at start and end of the playback range so the blend holds
     for the entire cycle.  Also sets the attribute value immediately
     so the correct controls are visible during generation.
     """
-    start, end = timeline_range()
-    merged = {}
-    for layer in layers:
-        if not layer.enabled:
-            continue
-        merged.update(layer.fkik_state())
-    for ctrl_name, value in merged.items():
+    for ctrl_name, value in fkik.items():
         node = resolver.resolve(ctrl_name)
-        if not node or not cmds.objExists(node):
+        if not node or not plugs.node_exists(node):
             continue
-        if not cmds.attributeQuery('FKIKBlend', node=node, exists=True):
+        if not plugs.exists(node, 'FKIKBlend'):
             continue
         full = '{}.FKIKBlend'.format(node)
         try:
@@ -109,30 +331,87 @@ def _key_fkik(layers):
 
 # ── batch keying ──
 
-def _key_all(channels):
-    """Set keyframes for every channel (no undo-chunk management).
+def _curve_node(curve):
+    """Scene node for a CurvePlan: the planned node if it still exists,
+    otherwise resolve the control name now."""
+    if curve.node and plugs.node_exists(curve.node):
+        return curve.node
+    return resolver.resolve(curve.ctrl)
 
-    Each channel gets one extra key before and after the timeline range
-    to fake a looping curve.  If *frame_offset* is set, all keys shift.
+
+def _key_curves(curves, only=None):
+    """Write the keys of a list of CurvePlans (no undo-chunk management).
+
+    If *only* is given, curves whose ``(ctrl, attr)`` is not in it are
+    skipped.  How keys are written depends on ``KEY_BACKEND``.
     """
     keyed = []   # (node, attr) pairs for post-processing
-    for ch in channels:
-        node = resolver.resolve(ch.ctrl)
+    groups = {}  # (times, tangent) -> [(node, curve), ...] for _key_group
+    for curve in curves:
+        if only is not None and (curve.ctrl, curve.attr) not in only:
+            continue
+        node = _curve_node(curve)
         if not node:
             continue
-        if not cmds.attributeQuery(ch.attr, node=node, exists=True):
+        if not plugs.exists(node, curve.attr):
             continue
-        values = ch.extended_evaluate()
-        times = frame_times(ch.extended_normalized_times())
-        for t, v in zip(times, values):
-            _set_key(node, ch.attr, t + ch.frame_offset, v)
-        keyed.append((node, ch.attr))
+        if KEY_BACKEND != 'per_key' and curve.times \
+                and not plugs.locked(node, curve.attr):
+            key = (tuple(curve.times), curve.tangent)
+            groups.setdefault(key, []).append((node, curve))
+            keyed.append((node, curve.attr))
+            continue
+        if KEY_BACKEND == 'per_key':
+            for t, v in zip(curve.times, curve.values):
+                _set_key(node, curve.attr, t, v)
+            if curve.tangent == 'fixed' and curve.slopes:
+                block = _curve_block(node, curve.attr, curve.times)
+                if block:
+                    _write_slopes(block[0], block[1], block[2], curve.attr,
+                                  curve.slopes)
+                # fixed tangents must not be re-splined, so set the
+                # infinity _finalize_curves would have set here
+                try:
+                    cmds.setInfinity(node, at=curve.attr, poi=curve.infinity,
+                                     pri=curve.infinity)
+                except Exception:
+                    pass
+                continue
+        else:
+            _key_curve(node, curve.attr, curve.times, curve.values,
+                       curve.tangent, curve.infinity, curve.slopes)
+        keyed.append((node, curve.attr))
+    for items in groups.values():
+        if len(items) > 1:
+            try:
+                _key_group(items)
+                continue
+            except Exception as e:
+                print('!! grouped key failed, keying per curve: {}'.format(e))
+        for node, c in items:
+            _key_curve(node, c.attr, c.times, c.values, c.tangent,
+                       c.infinity, c.slopes)
+    if KEY_BACKEND == 'per_key':
+        _finalize_curves(keyed)
     return keyed
 
 
-def _finalize_curves(keyed):
-    """Set spline tangents and constant pre/post-infinity on all keyed curves."""
+def _key_all(channels):
+    """Set keyframes for every channel (no undo-chunk management).
+
+    Each channel gets one extra key before and after the timeline range
+    to fake a looping curve.  If *frame_offset* is set, all keys shift.
+    """
     start, end = timeline_range()
+    return _key_curves(plan.plan_channels(channels, start, end))
+
+
+def _finalize_curves(keyed):
+    """Set spline tangents and constant pre/post-infinity on all keyed curves.
+
+    Only needed by the ``'per_key'`` backend; ``_key_curve`` applies
+    both while keying.
+    """
     for node, attr in keyed:
         try:
             cmds.keyTangent(node, at=attr, itt='spline', ott='spline')
@@ -143,66 +422,174 @@ def _finalize_curves(keyed):
 
 def key_channels(channels):
     """Set keyframes for a list of Channel objects (with undo chunk)."""
-    resolver.clear()
+    begin_pass()
     cmds.undoInfo(openChunk=True, chunkName='AnimGenV2_key')
     try:
-        keyed = _key_all(channels)
-        _finalize_curves(keyed)
+        _key_all(channels)
     finally:
         cmds.undoInfo(closeChunk=True)
 
 
-# ── variation ──
+# ── incremental cache ──
 
-def _apply_variation(channels, variation_pct):
-    """Randomly perturb channel amplitudes / values by ±variation_pct %.
+_last_keys = {}      # (ctrl, attr) -> fingerprint of the keys last written
+_last_fkik = {}      # blend ctrl -> FKIKBlend value last keyed
+_last_plan = [None]  # KeyPlan of the last apply
 
-    Returns a new list of channels with modified copies; originals are
-    not mutated.
-    """
-    if variation_pct <= 0:
-        return channels
-    from ..core.channel import Channel as _Ch
-    from dataclasses import replace as _replace
-    factor = variation_pct / 100.0
-    out = []
-    for ch in channels:
-        mult = 1.0 + random.uniform(-factor, factor)
-        if ch.values is not None:
-            new_vals = [v * mult for v in ch.values]
-            out.append(_replace(ch, values=new_vals))
-        else:
-            out.append(_replace(ch, amplitude=ch.amplitude * mult))
-    return out
 
+def last_plan():
+    """Return the :class:`plan.KeyPlan` written by the last apply (or None)."""
+    return _last_plan[0]
 
-# ── main entry point ──
 
-def generate(layers, clear=True, variation=0):
-    """Full generation pass -- clear keys then key all enabled layers.
+def invalidate_cache():
+    """Forget what was last keyed; the next generate re-keys everything.
 
-    *variation*: percentage (0-100) of random amplitude perturbation.
-    Everything runs inside a single undo chunk so one Ctrl-Z reverts it all.
+    Call whenever keys may have changed behind the engine's back
+    (Delete Animation, manual edits, undo, a different rig).
     """
-    channels = []
-    ctrls = set()
-    for layer in layers:
-        if not layer.enabled:
-            continue
-        channels.extend(layer.channels())
-        ctrls.update(layer.controls())
+    _last_keys.clear()
+    _last_fkik.clear()
 
-    resolver.clear()
+
+# ── apply ──
+
+def apply_plan(key_plan, incremental=False):
+    """Write a :class:`plan.KeyPlan` to the scene in one undo chunk.
+
+    *incremental*: diff against the keys written by the previous
+    apply and only clear / re-key curves whose keys changed (falls
+    back to a full pass when nothing is cached).
+
+    Returns the list of ``(ctrl, attr)`` pairs that were (re)keyed.
+    """
+    kp = key_plan
+    prints = kp.fingerprints()
+    begin_pass()
     cmds.undoInfo(openChunk=True, chunkName='AnimGenV2')
     try:
         saved = cmds.currentTime(q=True)
-        _key_fkik(layers)
-        if clear:
-            clear_keys(list(ctrls))
-        if variation > 0:
-            channels = _apply_variation(channels, variation)
-        keyed = _key_all(channels)
-        _finalize_curves(keyed)
+        if incremental and _last_keys:
+            changed = set(k for k in set(prints) | set(_last_keys)
+                          if prints.get(k) != _last_keys.get(k))
+            if kp.fkik != _last_fkik:
+                _key_fkik(kp.fkik, kp.start, kp.end)
+            if kp.clear and changed:
+                clear_plugs(sorted(changed), kp.clear_range())
+            _key_curves(kp.curves, only=changed)
+        else:
+            changed = set(prints)
+            _key_fkik(kp.fkik, kp.start, kp.end)
+            if kp.clear:
+                clear_plugs([(c, a) for c in kp.clear_ctrls
+                             for a in kp.clear_attrs], kp.clear_range())
+            _key_curves(kp.curves)
+
+        _last_keys.clear()
+        _last_keys.update(prints)
+        _last_fkik.clear()
+        _last_fkik.update(kp.fkik)
+        _last_plan[0] = kp
+        cmds.currentTime(saved)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return sorted(changed)
+
+
+def apply_plans(plans, clear_range=None):
+    """Write several KeyPlans (e.g. clip variants) in one undo chunk.
+
+    *clear_range*: if given, every plug of every plan is cleared over
+    it once up front (in one bulk call) instead of per plan.  Resets
+    the incremental cache.
+    """
+    begin_pass()
+    cmds.undoInfo(openChunk=True, chunkName='AnimGenV2_variants')
+    try:
+        saved = cmds.currentTime(q=True)
+        if clear_range is not None:
+            targets = set()
+            for kp in plans:
+                targets.update((c, a) for c in kp.clear_ctrls
+                               for a in kp.clear_attrs)
+            clear_plugs(sorted(targets), clear_range)
+        for kp in plans:
+            _key_fkik(kp.fkik, kp.start, kp.end)
+            _key_curves(kp.curves)
+        invalidate_cache()
         cmds.currentTime(saved)
     finally:
         cmds.undoInfo(closeChunk=True)
+
+
+# ── main entry point ──
+
+def generate(layers, clear=True, variation=0, incremental=False,
+             tolerance=None, rigs=None, seed=None):
+    """Full generation pass -- clear keys then key all enabled layers.
+
+    Builds a KeyPlan over the playback range and applies it.
+    *variation*: percentage (0-100) of random amplitude perturbation.
+    *seed*: makes the variation reproducible (``None`` = unseeded).
+    *incremental*: see :func:`apply_plan`.
+    *tolerance*: key reduction error bound (see ``plan.build``); the
+    per-channel counts are in ``last_plan().meta['reduction']``.
+    *rigs*: list of rig namespaces (``''`` = root namespace).  The
+    channels are evaluated once and every rig is keyed from that result
+    in the same pass; with *variation*, rig ``i`` is varied with
+    ``seed + i`` (see ``plan.build_rigs``).  Always a full pass.
+    Everything runs inside a single undo chunk so one Ctrl-Z reverts it all.
+
+    Returns the list of ``(ctrl, attr)`` pairs that were (re)keyed.
+    """
+    start, end = timeline_range()
+    if rigs:
+        kp = plan.build_rigs(layers, start, end, rigs, variation=variation,
+                             seed=seed, clear=clear, tolerance=tolerance)
+        changed = apply_plan(kp)
+        # the namespaced fingerprints must not become the baseline of
+        # the next (single-rig) incremental pass
+        invalidate_cache()
+        return changed
+    kp = plan.build(layers, start, end, variation=variation, clear=clear,
+                    tolerance=tolerance, seed=seed)
+    return apply_plan(kp, incremental=incremental)
+
+
+def generate_variants(layers, count, variation, seed=0, name='variant',
+                      start=None, buffer=None, tolerance=None):
+    """Key *count* seeded variants of one cycle into consecutive clips.
+
+    Clip ranges come from ``clip_setter.clips.layout_clips()`` (one
+    clip per variant, each as long as the playback range), variant
+    ``i`` uses seed ``seed + i``.  Channels are evaluated once and all
+    variants are keyed in one pass / undo chunk.
+
+    Returns the clip layout, ready for the Clip Setter exporters.
+    """
+    from clip_setter import clips
+
+    if start is None:
+        start = clips.DEFAULT_START
+    if buffer is None:
+        buffer = clips.DEFAULT_BUFFER
+    t0, t1 = timeline_range()
+    frames = int(round(t1 - t0))
+    layout = clips.layout_clips(
+        [{'name': '{}_{:02d}'.format(name, i + 1), 'frames': frames,
+          'loop': True, 'category': 'variant'} for i in range(count)],
+        buffer=buffer, start=start)
+    plans = plan.build_variants(layers, layout, variation, seed, tolerance)
+    half = buffer / 2.0
+    apply_plans(plans, (layout[0]['start'] - half,
+                        clips.timeline_end(layout) + half))
+    return layout
+
+
+def find_rigs(ctrl='RootX_M'):
+    """Namespaces of every rig in the scene that has *ctrl*.
+
+    The root namespace is returned as ``''``.
+    """
+    found = cmds.ls(ctrl, '*:' + ctrl, '*:*:' + ctrl, type='transform') or []
+    return sorted(set(n.rpartition(':')[0] for n in found))
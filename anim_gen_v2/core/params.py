@@ -0,0 +1,102 @@
+"""ParamModel -- UI parameter state owned in Python, updated by events.
+
+The window's slider / field callbacks push each change into the model
+(``model.set(key, value)``) instead of the window re-reading every
+control through ``cmds`` before a generate.  UI keys are routed to
+layer params by prefix, exactly as the window names them::
+
+    model = ParamModel([('r_', run_primary), ('s_', sidestep_primary),
+                        ('', walk_primary), ('', walk_secondary),
+                        ('', walk_arms)])
+    model.set('r_stride_front', 12.0)   # -> run_primary._params['stride_front']
+
+Which layers changed is left to the layer fingerprints
+(``plan.changed_layers``), so the model keeps no dirty flags of its own.
+Pure Python (no Maya), so the parameter state can be driven and
+checked without a UI.
+"""
+
+
+class ParamModel:
+    """Routes UI keys to layer params."""
+
+    def __init__(self, routes):
+        """*routes*: ``[(prefix, layer), ...]``, first match wins.
+
+        A key matches a route when it starts with *prefix* and the rest
+        is one of the layer's ``DEFAULTS`` keys.
+        """
+        self._routes = list(routes)
+        self._lookup = {}       # ui key -> (layer, param) or None
+        self._listeners = []
+
+    # ── routing ──
+
+    def route(self, key):
+        """Return ``(layer, param)`` for UI *key*, or ``None``."""
+        if key in self._lookup:
+            return self._lookup[key]
+        found = None
+        for prefix, layer in self._routes:
+            if not key.startswith(prefix):
+                continue
+            param = key[len(prefix):]
+            if param in getattr(layer, 'DEFAULTS', {}):
+                found = (layer, param)
+                break
+        self._lookup[key] = found
+        return found
+
+    def keys(self):
+        """Every routable UI key (prefix + param) in route order."""
+        out = []
+        for prefix, layer in self._routes:
+            for param in getattr(layer, 'DEFAULTS', {}):
+                key = prefix + param
+                if key not in out and self.route(key) == (layer, param):
+                    out.append(key)
+        return out
+
+    # ── values ──
+
+    def get(self, key, default=None):
+        r = self.route(key)
+        if r is None:
+            return default
+        layer, param = r
+        return layer._params.get(param, default)
+
+    def set(self, key, value):
+        """Store *value* for UI *key*; returns True if it changed.
+
+        Unroutable keys are ignored.  Listeners are called with
+        ``(key, value)`` for real changes only.
+        """
+        r = self.route(key)
+        if r is None:
+            return False
+        layer, param = r
+        if layer._params.get(param) == value:
+            return False
+        layer._params[param] = value
+        for fn in self._listeners:
+            fn(key, value)
+        return True
+
+    def update(self, values):
+        """``set()`` every ``{key: value}``; returns the changed keys."""
+        return [k for k, v in values.items() if self.set(k, v)]
+
+    def values(self):
+        """``{ui key: value}`` for every routable key."""
+        return {k: self.get(k) for k in self.keys()}
+
+    # ── listeners ──
+
+    def add_listener(self, fn):
+        """Call ``fn(key, value)`` after every changing :meth:`set`."""
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
@@ -39,6 +39,24 @@ def evaluate(wave, t, frequency=1.0, phase=0.0):
     return 0.0
 
 
+def derivative(wave, t, frequency=1.0, phase=0.0):
+    """Analytic d/dt of :func:`evaluate` at normalised time *t*.
+
+    Units are "raw value per normalised cycle"; divide by the cycle
+    length in frames to get a per-frame slope.
+    """
+    wv = wave.value
+    if wv == 'constant':
+        return 0.0
+    w = 2.0 * math.pi * frequency
+    angle = w * t + 2.0 * math.pi * phase
+    if wv == 'cosine':
+        return -w * math.sin(angle)
+    if wv == 'sine':
+        return w * math.cos(angle)
+    return 0.0
+
+
 def sample(wave, n_points, frequency=1.0, phase=0.0):
     """Sample *wave* at *n_points* evenly spaced over [0, 1].
 
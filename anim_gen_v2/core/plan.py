@@ -0,0 +1,470 @@
+"""KeyPlan -- headless, serialisable description of one generate pass.
+
+``build()`` turns Layer objects into a :class:`KeyPlan` without touching
+Maya: every curve's key times / values, tangents and infinity, the
+FKIKBlend keys and the clear ranges.  ``engine.apply_plan()`` writes a
+finished plan to the scene in one batched pass.  Plans can be built in
+a plain Python process, saved as JSON, diffed and applied later.
+
+Usage::
+
+    from anim_gen_v2.core import plan
+    kp = plan.build([WalkPrimary(), WalkArms()], start=1, end=25)
+    kp.save('/tmp/walk.json')
+    plan.KeyPlan.load('/tmp/walk.json').diff(kp)   # -> []
+"""
+
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+from . import evaluator, reduce
+
+PLAN_VERSION = 1
+
+# Compact binary plan files: magic, uint32 header length, JSON header
+# (the plan minus key data), then all times and all values as
+# little-endian float64.
+BINARY_EXT = '.agkp'
+_BIN_MAGIC = b'AGKP'
+
+CLEAR_ATTRS = ['translateX', 'translateY', 'translateZ',
+               'rotateX', 'rotateY', 'rotateZ', 'Roll']
+
+
+@dataclass
+class CurvePlan:
+    """Keys for one ``ctrl.attr`` curve.
+
+    *node* is the resolved scene node when the plan was built against a
+    scene; ``None`` means "resolve *ctrl* when applying".  With
+    ``tangent='fixed'``, *slopes* holds one value-per-frame slope per key.
+    """
+
+    ctrl: str
+    attr: str
+    times: List[float]
+    values: List[float]
+    label: str = ''
+    node: Optional[str] = None
+    tangent: str = 'spline'
+    infinity: str = 'constant'
+    slopes: Optional[List[float]] = None
+
+    def fingerprint(self):
+        """Hashable summary of the keys (rounded to absorb float noise)."""
+        return (tuple(round(t, 4) for t in self.times),
+                tuple(round(v, 6) for v in self.values),
+                tuple(round(m, 6) for m in self.slopes or ()),
+                self.tangent, self.infinity)
+
+
+@dataclass
+class KeyPlan:
+    """Everything one generate pass writes to the scene."""
+
+    start: float
+    end: float
+    curves: List[CurvePlan] = field(default_factory=list)
+    fkik: Dict[str, float] = field(default_factory=dict)
+    clear_ctrls: List[str] = field(default_factory=list)
+    clear_attrs: List[str] = field(default_factory=lambda: list(CLEAR_ATTRS))
+    clear: bool = True
+    meta: Dict[str, object] = field(default_factory=dict)
+
+    # ── queries ──
+
+    def clear_range(self):
+        """Range cleared before keying: one span beyond each side."""
+        span = self.end - self.start
+        return (self.start - span, self.end + span)
+
+    def retimed(self, start, end):
+        """Copy of the plan with every key time mapped onto ``[start, end]``.
+
+        Lets a plan built for one playback range be applied to another
+        (frame offsets and fixed-tangent slopes scale with the range).
+        """
+        span = self.end - self.start
+        scale = (end - start) / span if span else 1.0
+        curves = [replace(c, times=[start + (t - self.start) * scale
+                                    for t in c.times],
+                          slopes=([m / scale for m in c.slopes]
+                                  if c.slopes and scale else c.slopes))
+                  for c in self.curves]
+        return replace(self, start=start, end=end, curves=curves)
+
+    def namespaced(self, namespace):
+        """Copy of the plan retargeted to the rig in *namespace*.
+
+        Every ctrl name (curves, FKIK, clear list) gets the ``ns:``
+        prefix; resolved nodes are dropped so they re-resolve in the
+        target rig.  An empty namespace returns the plan itself.
+        """
+        ns = (namespace or '').strip(':')
+        if not ns:
+            return self
+        pre = ns + ':'
+        return replace(
+            self,
+            curves=[replace(c, ctrl=pre + c.ctrl, node=None)
+                    for c in self.curves],
+            fkik={pre + k: v for k, v in self.fkik.items()},
+            clear_ctrls=[pre + c for c in self.clear_ctrls],
+            meta=dict(self.meta, namespace=ns))
+
+    def key_count(self):
+        """Total number of keys across all curves."""
+        return sum(len(c.times) for c in self.curves)
+
+    def fingerprints(self):
+        """Return ``{(ctrl, attr): fingerprint}`` for every curve."""
+        prints = {}
+        for c in self.curves:
+            key = (c.ctrl, c.attr)
+            prints[key] = prints.get(key, ()) + (c.fingerprint(),)
+        return prints
+
+    def diff(self, other):
+        """Sorted ``(ctrl, attr)`` pairs whose keys differ from *other*.
+
+        Curves present in only one of the two plans count as changed.
+        """
+        a = self.fingerprints()
+        b = other.fingerprints() if other is not None else {}
+        return sorted(k for k in set(a) | set(b) if a.get(k) != b.get(k))
+
+    # ── serialisation ──
+
+    def to_dict(self):
+        return {
+            'version': PLAN_VERSION,
+            'start': self.start,
+            'end': self.end,
+            'curves': [vars(c).copy() for c in self.curves],
+            'fkik': dict(self.fkik),
+            'clear_ctrls': list(self.clear_ctrls),
+            'clear_attrs': list(self.clear_attrs),
+            'clear': self.clear,
+            'meta': dict(self.meta),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            start=data['start'],
+            end=data['end'],
+            curves=[CurvePlan(**c) for c in data.get('curves', [])],
+            fkik=dict(data.get('fkik', {})),
+            clear_ctrls=list(data.get('clear_ctrls', [])),
+            clear_attrs=list(data.get('clear_attrs', CLEAR_ATTRS)),
+            clear=data.get('clear', True),
+            meta=dict(data.get('meta', {})),
+        )
+
+    def save(self, filepath):
+        """Write the plan (creating dirs as needed).
+
+        Files ending in ``BINARY_EXT`` get the compact binary key table,
+        anything else is written as JSON.
+        """
+        d = os.path.dirname(filepath)
+        if d and not os.path.isdir(d):
+            os.makedirs(d)
+        if filepath.lower().endswith(BINARY_EXT):
+            self._save_binary(filepath)
+            return
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, filepath):
+        """Read a plan written by :meth:`save` (JSON or binary)."""
+        if filepath.lower().endswith(BINARY_EXT):
+            return cls._load_binary(filepath)
+        with open(filepath, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    def _save_binary(self, filepath):
+        data = self.to_dict()
+        times, values = array('d'), array('d')
+        for c in data['curves']:
+            # header keeps only the per-curve key count
+            c['count'] = len(c['times'])
+            times.extend(c.pop('times'))
+            values.extend(c.pop('values'))
+        if sys.byteorder != 'little':
+            times.byteswap()
+            values.byteswap()
+        header = json.dumps(data).encode('utf-8')
+        with open(filepath, 'wb') as f:
+            f.write(_BIN_MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            times.tofile(f)
+            values.tofile(f)
+
+    @classmethod
+    def _load_binary(cls, filepath):
+        with open(filepath, 'rb') as f:
+            if f.read(4) != _BIN_MAGIC:
+                raise ValueError('Not a KeyPlan file: {}'.format(filepath))
+            (size,) = struct.unpack('<I', f.read(4))
+            data = json.loads(f.read(size).decode('utf-8'))
+            total = sum(c['count'] for c in data['curves'])
+            times, values = array('d'), array('d')
+            times.fromfile(f, total)
+            values.fromfile(f, total)
+        if sys.byteorder != 'little':
+            times.byteswap()
+            values.byteswap()
+        pos = 0
+        for c in data['curves']:
+            n = c.pop('count')
+            c['times'] = times[pos:pos + n].tolist()
+            c['values'] = values[pos:pos + n].tolist()
+            pos += n
+        return cls.from_dict(data)
+
+
+# ── variation ──
+
+def apply_variation(channels, variation_pct, rng=None):
+    """Randomly perturb channel amplitudes / values by ±variation_pct %.
+
+    *rng*: a ``random.Random`` to draw from (default: the global
+    ``random`` module).  Returns a new list of channels with modified
+    copies; originals are not mutated.
+    """
+    if variation_pct <= 0:
+        return channels
+    rng = rng or random
+    factor = variation_pct / 100.0
+    out = []
+    for ch in channels:
+        mult = 1.0 + rng.uniform(-factor, factor)
+        if ch.values is not None:
+            new_vals = [v * mult for v in ch.values]
+            out.append(replace(ch, values=new_vals))
+        else:
+            out.append(replace(ch, amplitude=ch.amplitude * mult))
+    return out
+
+
+def vary_curves(curves, channels, variation_pct, rng=None):
+    """:func:`apply_variation` applied to already evaluated *curves*.
+
+    *curves* and *channels* are parallel.  Amplitude scaling is linear
+    around the channel offset, so this equals evaluating the varied
+    channels (same draws from *rng*) without re-evaluating anything.
+    """
+    if variation_pct <= 0:
+        return curves
+    rng = rng or random
+    factor = variation_pct / 100.0
+    out = []
+    for c, ch in zip(curves, channels):
+        mult = 1.0 + rng.uniform(-factor, factor)
+        base = 0.0 if ch.values is not None else ch.offset
+        out.append(replace(
+            c, values=[base + (v - base) * mult for v in c.values],
+            slopes=[m * mult for m in c.slopes] if c.slopes else c.slopes))
+    return out
+
+
+# ── planning ──
+
+def merged_fkik(layers):
+    """Merge ``fkik_state()`` of every enabled layer (later layers win)."""
+    merged = {}
+    for layer in layers:
+        if layer.enabled:
+            merged.update(layer.fkik_state())
+    return merged
+
+
+def plan_channels(channels, start, end, resolve=None):
+    """Evaluate *channels* into a list of :class:`CurvePlan`.
+
+    *resolve*: optional ``name -> node`` callable (e.g.
+    ``resolver.resolve``) used to fill in :attr:`CurvePlan.node`.
+    """
+    curves = []
+    table = evaluator.evaluate(channels, start, end)
+    for ch, times, values in table.iter_channels():
+        node = resolve(ch.ctrl) if resolve is not None else None
+        curves.append(CurvePlan(ch.ctrl, ch.attr, times, values,
+                                label=ch.label, node=node))
+    return curves
+
+
+# Evaluated curves of the last build, per layer fingerprint.  Layer
+# output depends only on its class and params, so an unchanged layer
+# reuses its curves instead of being re-evaluated.
+_layer_cache = {}   # _layer_key(layer) -> (fingerprint, start, end, curves)
+
+
+def _layer_key(layer):
+    """Cache slot of *layer*: its class and name, so every v1
+    ``GeneratorLayer`` (one class, one name per generator) and every
+    layer sharing a class keeps its own entry."""
+    return (type(layer).__name__, layer.name)
+
+
+def changed_layers(layers, start, end):
+    """Enabled *layers* whose curves must be re-evaluated for ``[start, end]``."""
+    out = []
+    for layer in layers:
+        if not layer.enabled:
+            continue
+        hit = _layer_cache.get(_layer_key(layer))
+        if hit is None or hit[:3] != (layer.fingerprint(), start, end):
+            out.append(layer)
+    return out
+
+
+def clear_layer_cache():
+    """Forget every cached layer evaluation."""
+    _layer_cache.clear()
+
+
+def _layer_curves(layers, start, end, resolve):
+    """Curves for the enabled *layers*, evaluating only changed ones.
+
+    Returns ``(curves, channels, reused_layer_names)``.
+    """
+    changed = set(id(layer) for layer in changed_layers(layers, start, end))
+    curves, channels, reused = [], [], []
+    for layer in layers:
+        if not layer.enabled:
+            continue
+        key = _layer_key(layer)
+        chs = layer.channels()
+        if id(layer) in changed:
+            fresh = plan_channels(chs, start, end)
+            _layer_cache[key] = (layer.fingerprint(), start, end, fresh)
+        else:
+            reused.append(layer.name)
+        # copies: reduction and node resolution edit curves in place
+        for c in _layer_cache[key][3]:
+            curves.append(replace(c, times=list(c.times),
+                                  values=list(c.values),
+                                  node=resolve(c.ctrl) if resolve else None))
+        channels.extend(chs)
+    return curves, channels, reused
+
+
+def build(layers, start, end, variation=0, clear=True, resolve=None,
+          tolerance=None, seed=None):
+    """Build a :class:`KeyPlan` for the enabled *layers* over ``[start, end]``.
+
+    *seed*: makes *variation* reproducible (``random.Random(seed)``);
+    ``None`` draws from the global ``random`` module.  Without
+    *variation*, layers whose params are unchanged since the last
+    build reuse their evaluated curves (``meta['reused']``).
+    *tolerance*: if set, wave channels are reduced to the fewest keys
+    (with analytic fixed tangents) that stay within *tolerance* of the
+    wave; per-channel before/after counts go to ``meta['reduction']``.
+    Pure Python -- no Maya calls unless *resolve* makes them.
+    """
+    return _build(layers, start, end, variation, clear, resolve,
+                  tolerance, seed)[0]
+
+
+def build_rigs(layers, start, end, namespaces, variation=0, seed=None,
+               clear=True, tolerance=None):
+    """One :class:`KeyPlan` keying the same cycle on every rig in *namespaces*.
+
+    Channels are evaluated (and reduced) once; each rig gets a
+    namespaced copy of the curves.  With *variation*, rig ``i`` is
+    perturbed with ``random.Random(seed + i)`` so the crowd doesn't
+    move in lockstep and the same seed reproduces the same crowd
+    (``seed=None`` draws unseeded).
+    """
+    shared, channels = _build(layers, start, end, 0, clear, None, tolerance)
+    plans = []
+    for i, ns in enumerate(namespaces):
+        kp = shared
+        if variation > 0:
+            rng = random.Random(seed + i) if seed is not None \
+                else random.Random()
+            kp = replace(shared, curves=vary_curves(shared.curves, channels,
+                                                    variation, rng))
+        plans.append(kp.namespaced(ns))
+    merged = KeyPlan(
+        start=start,
+        end=end,
+        curves=[c for kp in plans for c in kp.curves],
+        fkik={k: v for kp in plans for k, v in kp.fkik.items()},
+        clear_ctrls=[c for kp in plans for c in kp.clear_ctrls],
+        clear=clear,
+        meta=dict(shared.meta, variation=variation, seed=seed,
+                  rigs=[(ns or '').strip(':') for ns in namespaces]))
+    return merged
+
+
+def build_variants(layers, layout, variation, seed=0, tolerance=None):
+    """One :class:`KeyPlan` per clip of *layout*, each a seeded variant.
+
+    *layout* is a ``clip_setter.clips.layout_clips()`` list.  Channels
+    are evaluated once; clip ``i`` gets the curves varied with seed
+    ``seed + i`` (identical to ``build(..., seed=seed + i)``) and
+    retimed onto its ``start`` / ``end``.  Plans have ``clear=False``;
+    the caller clears the whole layout range once.
+    """
+    if not layout:
+        return []
+    first = layout[0]
+    shared, channels = _build(layers, first['start'], first['end'], 0,
+                              False, None, tolerance)
+    plans = []
+    for i, clip in enumerate(layout):
+        kp = replace(shared, curves=vary_curves(
+            shared.curves, channels, variation, random.Random(seed + i)))
+        kp = kp.retimed(clip['start'], clip['end'])
+        kp.meta = dict(shared.meta, clip=clip['name'], variation=variation,
+                       seed=seed + i)
+        plans.append(kp)
+    return plans
+
+
+def _build(layers, start, end, variation=0, clear=True, resolve=None,
+           tolerance=None, seed=None):
+    """:func:`build`, also returning the channels behind the curves."""
+    ctrls = set()
+    for layer in layers:
+        if layer.enabled:
+            ctrls.update(layer.controls())
+    reused = []
+    if variation > 0:
+        channels = []
+        for layer in layers:
+            if layer.enabled:
+                channels.extend(layer.channels())
+        rng = random.Random(seed) if seed is not None else None
+        channels = apply_variation(channels, variation, rng)
+        curves = plan_channels(channels, start, end, resolve)
+    else:
+        curves, channels, reused = _layer_curves(layers, start, end, resolve)
+    meta = {'layers': [layer.name for layer in layers if layer.enabled],
+            'variation': variation,
+            'seed': seed,
+            'reused': reused}
+    if tolerance:
+        meta['tolerance'] = tolerance
+        meta['reduction'] = reduce.reduce_curves(curves, channels,
+                                                 start, end, tolerance)
+    return KeyPlan(
+        start=start,
+        end=end,
+        curves=curves,
+        fkik=merged_fkik(layers),
+        clear_ctrls=sorted(ctrls),
+        clear=clear,
+        meta=meta,
+    ), channels
@@ -0,0 +1,112 @@
+"""Per-pass cache of plug capabilities (exists / locked / connected / keyable).
+
+One generate probes the same ``node.attr`` pairs many times (clear,
+FKIK, keying).  Each capability is queried from Maya at most once per
+pass; call ``clear()`` at the start of every pass.  ``stats()`` reports
+hit / miss counts so the saving can be measured.
+"""
+
+import maya.cmds as cmds
+
+_caps = {}      # (node, attr) -> {capability: bool}
+_nodes = {}     # node -> exists
+_stats = {'hits': 0, 'misses': 0}
+
+
+def clear():
+    """Drop all cached capabilities and zero the counters."""
+    _caps.clear()
+    _nodes.clear()
+    _stats['hits'] = 0
+    _stats['misses'] = 0
+
+
+def stats():
+    """Return ``{'hits', 'misses'}`` for the current pass."""
+    return dict(_stats)
+
+
+def report():
+    """One-line summary of the current pass's hit / miss counts."""
+    total = _stats['hits'] + _stats['misses']
+    pct = 100.0 * _stats['hits'] / total if total else 0.0
+    return '// AnimGenV2 plug cache: {} hits, {} misses ({:.0f}% saved)'.format(
+        _stats['hits'], _stats['misses'], pct)
+
+
+def forget(node, attr=None):
+    """Invalidate one plug (or every plug of *node* when *attr* is None)."""
+    if attr is not None:
+        _caps.pop((node, attr), None)
+        return
+    _nodes.pop(node, None)
+    for key in [k for k in _caps if k[0] == node]:
+        del _caps[key]
+
+
+def prime(node, attr, **caps):
+    """Store capabilities already known from a bulk query.
+
+    ``prime(node, 'rotateX', exists=True, locked=False)`` -- later
+    lookups of those capabilities hit the cache.
+    """
+    _nodes[node] = True
+    _caps.setdefault((node, attr), {}).update(caps)
+
+
+# ── queries ──
+
+def _query(node, attr, cap):
+    full = '{}.{}'.format(node, attr)
+    if cap == 'exists':
+        return bool(cmds.attributeQuery(attr, node=node, exists=True))
+    try:
+        if cap == 'locked':
+            return bool(cmds.getAttr(full, lock=True))
+        if cap == 'keyable':
+            return bool(cmds.getAttr(full, keyable=True))
+        if cap == 'connected':
+            return bool(cmds.connectionInfo(full, isDestination=True))
+    except Exception:
+        return False
+    raise ValueError('unknown plug capability: {}'.format(cap))
+
+
+def _get(node, attr, cap):
+    entry = _caps.setdefault((node, attr), {})
+    if cap in entry:
+        _stats['hits'] += 1
+        return entry[cap]
+    _stats['misses'] += 1
+    entry[cap] = _query(node, attr, cap)
+    return entry[cap]
+
+
+def node_exists(node):
+    """Cached ``cmds.objExists(node)``."""
+    if node in _nodes:
+        _stats['hits'] += 1
+        return _nodes[node]
+    _stats['misses'] += 1
+    _nodes[node] = bool(node) and bool(cmds.objExists(node))
+    return _nodes[node]
+
+
+def exists(node, attr):
+    """Cached ``attributeQuery(attr, node=node, exists=True)``."""
+    return _get(node, attr, 'exists')
+
+
+def locked(node, attr):
+    """Cached ``getAttr(node.attr, lock=True)``."""
+    return _get(node, attr, 'locked')
+
+
+def connected(node, attr):
+    """Cached ``connectionInfo(node.attr, isDestination=True)``."""
+    return _get(node, attr, 'connected')
+
+
+def keyable(node, attr):
+    """Cached ``getAttr(node.attr, keyable=True)``."""
+    return _get(node, attr, 'keyable')
@@ -4,7 +4,10 @@ import json
 import os
 import datetime
 
-import maya.cmds as cmds
+try:
+    import maya.cmds as cmds
+except ImportError:   # plain Python process (batch planning)
+    cmds = None
 
 
 # ── paths ──
@@ -15,9 +18,14 @@ def _repo_preset_dir(cycle_type='walk'):
     return os.path.join(pkg, 'presets', cycle_type)
 
 
-def _project_preset_dir(cycle_type='walk'):
-    """Return the current Maya project's preset folder, or None."""
-    ws = cmds.workspace(q=True, rd=True)
+def _project_preset_dir(cycle_type='walk', project_root=None):
+    """Return the Maya project's preset folder, or None.
+
+    *project_root* overrides the current workspace (needed outside Maya).
+    """
+    ws = project_root
+    if ws is None and cmds is not None:
+        ws = cmds.workspace(q=True, rd=True)
     if not ws:
         return None
     return os.path.join(ws, 'data', 'anim_presets', cycle_type)
@@ -40,12 +48,19 @@ def load(filepath):
         return json.load(f)
 
 
+def variation_settings(data):
+    """Return ``(percent, seed)`` stored in preset *data* (``(0, 0)`` if none)."""
+    v = data.get('variation') or {}
+    return float(v.get('percent', 0)), int(v.get('seed', 0))
+
+
 # ── discovery ──
 
-def list_presets(cycle_type='walk'):
+def list_presets(cycle_type='walk', project_root=None):
     """Return a list of ``{'name', 'path', 'source'}`` dicts.
 
     Sources: ``'library'`` (repo-tracked) and ``'project'``.
+    *project_root* overrides the current Maya workspace.
     """
     found = []
     repo_dir = _repo_preset_dir(cycle_type)
@@ -57,7 +72,7 @@ def list_presets(cycle_type='walk'):
                     'path': os.path.join(repo_dir, fn),
                     'source': 'library',
                 })
-    proj_dir = _project_preset_dir(cycle_type)
+    proj_dir = _project_preset_dir(cycle_type, project_root)
     if proj_dir and os.path.isdir(proj_dir):
         for fn in sorted(os.listdir(proj_dir)):
             if fn.lower().endswith('.json'):
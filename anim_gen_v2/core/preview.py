@@ -0,0 +1,302 @@
+"""Live preview -- drive the rig from the current plan without keying.
+
+``start(layers)`` builds a KeyPlan once, resolves every curve to an
+``MPlug`` and registers a ``timeChanged`` callback that evaluates each
+curve at the current frame in Python and writes the value straight to
+the plug.  Nothing is keyed and nothing enters the undo queue, so
+scrubbing and slider tweaks cost one interpolation plus one plug write
+per curve.
+
+Existing animCurves on the previewed plugs are disconnected for the
+duration (outside the undo queue) and reconnected by ``stop()``.
+Like a real generate, the preview also sets the plan's FKIKBlend
+values and zeroes the cleared plugs it has no curve for; unkeyed plugs
+it writes get their original value back on ``stop()``.
+``commit()`` stops the preview and bakes real keys through
+``engine.generate()``.
+
+Spline curves are sampled with Catmull-Rom tangents, which match
+Maya's spline tangents on the evenly spaced generated keys closely
+enough to preview; reduced ``'fixed'`` curves use their exact slopes.
+"""
+
+import bisect
+import time
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+
+from . import engine, plan, resolver
+from .reduce import hermite
+
+# Callback ids survive importlib.reload() so a reload can remove them.
+_callback_ids = globals().get('_callback_ids', [])
+
+_tracks = []        # [(MPlug, kind, times, values, slopes), ...]
+_originals = {}     # plug name -> (MPlug, kind, value), None if detached
+_detached = [None]  # MDGModifier holding the animCurve disconnects
+_plan = [None]      # KeyPlan being previewed
+_stats = {'pushes': 0, 'last_ms': 0.0, 'total_ms': 0.0}
+
+
+# ── curve sampling ──
+
+def spline_slopes(times, values):
+    """Catmull-Rom style slope per key (value units per frame)."""
+    n = len(times)
+    if n < 2:
+        return [0.0] * n
+    slopes = []
+    for i in range(n):
+        a = max(i - 1, 0)
+        b = min(i + 1, n - 1)
+        dt = times[b] - times[a]
+        slopes.append((values[b] - values[a]) / dt if dt else 0.0)
+    return slopes
+
+
+def sample(times, values, slopes, t):
+    """Value of a Hermite curve through the keys at frame *t*.
+
+    Outside the keyed range the end values hold (constant infinity).
+    """
+    if t <= times[0]:
+        return values[0]
+    if t >= times[-1]:
+        return values[-1]
+    i = bisect.bisect_right(times, t)
+    return hermite(times[i - 1], values[i - 1], slopes[i - 1],
+                   times[i], values[i], slopes[i], t)
+
+
+# ── plug resolution ──
+
+def _plug_kind(plug):
+    attr = plug.attribute()
+    if attr.hasFn(om.MFn.kUnitAttribute):
+        unit = om.MFnUnitAttribute(attr).unitType()
+        if unit == om.MFnUnitAttribute.kAngle:
+            return 'angle'
+        if unit == om.MFnUnitAttribute.kDistance:
+            return 'distance'
+    return 'double'
+
+
+def _find_plug(ctrl, attr, node=None):
+    if not node or not cmds.objExists(node):
+        node = resolver.resolve(ctrl)
+    if not node:
+        return None
+    sel = om.MSelectionList()
+    try:
+        sel.add('{}.{}'.format(node, attr))
+        return sel.getPlug(0)
+    except (RuntimeError, TypeError):
+        return None
+
+
+def _claim(plug, mod):
+    """Free *plug* for previewing: queue its animCurve disconnect on *mod*
+    or remember its static value for :func:`stop`.  False if something
+    other than an animCurve drives it (constraint, expression)."""
+    if plug.isLocked:
+        return False
+    name = plug.name()
+    src = plug.source()
+    if not src.isNull:
+        if not src.node().hasFn(om.MFn.kAnimCurve):
+            return False
+        mod.disconnect(src, plug)
+        _originals.setdefault(name, None)
+    elif name not in _originals:
+        kind = _plug_kind(plug)
+        _originals[name] = (plug, kind, _read(plug, kind))
+    return True
+
+
+def _build_tracks(kp, mod):
+    """Resolve *kp* to plugs; queue animCurve disconnects on *mod*.
+
+    Besides one track per curve, FKIKBlend values and the cleared plugs
+    without a curve get constant tracks, as ``engine.apply_plan`` would
+    key / reset them.
+    """
+    tracks = []
+    keyed = set()
+    for c in kp.curves:
+        if not c.times:
+            continue
+        plug = _find_plug(c.ctrl, c.attr, c.node)
+        if plug is None or not _claim(plug, mod):
+            continue
+        keyed.add((c.ctrl, c.attr))
+        slopes = c.slopes if c.tangent == 'fixed' and c.slopes \
+            else spline_slopes(c.times, c.values)
+        tracks.append((plug, _plug_kind(plug), list(c.times),
+                       list(c.values), slopes))
+    const = [(ctrl, 'FKIKBlend', float(v)) for ctrl, v in kp.fkik.items()]
+    if kp.clear:
+        const += [(ctrl, attr, 0.0) for ctrl in kp.clear_ctrls
+                  for attr in kp.clear_attrs if (ctrl, attr) not in keyed]
+    for ctrl, attr, value in const:
+        plug = _find_plug(ctrl, attr)
+        if plug is None or not _claim(plug, mod):
+            continue
+        tracks.append((plug, _plug_kind(plug), [kp.start], [value], [0.0]))
+    return tracks
+
+
+# ── push ──
+
+def push(frame=None):
+    """Write every previewed curve's value at *frame* (default: current)."""
+    if not _tracks:
+        return
+    t0 = time.perf_counter()
+    if frame is None:
+        frame = om.MAnimControl.currentTime().asUnits(om.MTime.uiUnit())
+    angle_unit = om.MAngle.uiUnit()
+    dist_unit = om.MDistance.uiUnit()
+    for plug, kind, times, values, slopes in _tracks:
+        _write(plug, kind, sample(times, values, slopes, frame),
+               angle_unit, dist_unit)
+    ms = (time.perf_counter() - t0) * 1000.0
+    _stats['pushes'] += 1
+    _stats['last_ms'] = ms
+    _stats['total_ms'] += ms
+
+
+def _read(plug, kind):
+    if kind == 'angle':
+        return plug.asMAngle().asUnits(om.MAngle.uiUnit())
+    if kind == 'distance':
+        return plug.asMDistance().asUnits(om.MDistance.uiUnit())
+    return plug.asDouble()
+
+
+def _write(plug, kind, v, angle_unit, dist_unit):
+    try:
+        if kind == 'angle':
+            plug.setMAngle(om.MAngle(v, angle_unit))
+        elif kind == 'distance':
+            plug.setMDistance(om.MDistance(v, dist_unit))
+        else:
+            plug.setDouble(v)
+    except RuntimeError:
+        pass
+
+
+def _on_time_changed(*_):
+    push()
+
+
+def _on_scene_closing(*_):
+    # plugs are about to die with the scene; nothing to reconnect
+    _drop()
+
+
+# ── public API ──
+
+def is_active():
+    """True while a preview is driving the rig."""
+    return bool(_callback_ids)
+
+
+def start(layers, variation=0, tolerance=None, seed=None):
+    """Preview *layers* on the current timeline without keying.
+
+    Calling it again while active just refreshes the previewed plan
+    (see :func:`update`).
+    """
+    if is_active():
+        update(layers, variation, tolerance, seed)
+        return
+    _stats.update(pushes=0, last_ms=0.0, total_ms=0.0)
+    resolver.clear()
+    update(layers, variation, tolerance, seed)
+    _callback_ids.extend([
+        om.MEventMessage.addEventCallback('timeChanged', _on_time_changed),
+        om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeNew,
+                                     _on_scene_closing),
+        om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen,
+                                     _on_scene_closing),
+    ])
+
+
+def update(layers, variation=0, tolerance=None, seed=None):
+    """Rebuild the previewed plan from *layers* and push the current frame.
+
+    Cheap for slider tweaks: unchanged layers reuse their evaluated
+    curves (``plan.build``), and plugs already detached stay detached.
+    Pass the *variation* and *seed* :func:`commit` will key with so the
+    preview shows the same motion.
+    """
+    start_f, end_f = engine.timeline_range()
+    kp = plan.build(layers, start_f, end_f, variation=variation,
+                    resolve=resolver.resolve, tolerance=tolerance, seed=seed)
+    mod = _detached[0] or om.MDGModifier()
+    tracks = _build_tracks(kp, mod)
+    mod.doIt()
+    _detached[0] = mod
+    _plan[0] = kp
+    _tracks[:] = tracks
+    push()
+
+
+def stop():
+    """End the preview and reconnect the original animCurves."""
+    _remove_callbacks()
+    if _detached[0] is not None:
+        try:
+            _detached[0].undoIt()
+        except RuntimeError as e:
+            print('!! preview could not restore curves: {}'.format(e))
+    angle_unit, dist_unit = om.MAngle.uiUnit(), om.MDistance.uiUnit()
+    for saved in _originals.values():
+        if saved is not None:
+            plug, kind, value = saved
+            _write(plug, kind, value, angle_unit, dist_unit)
+    _drop()
+    # the rig now shows its keyed pose again
+    cmds.currentTime(cmds.currentTime(q=True), update=True)
+
+
+def commit(layers, variation=0, tolerance=None, **kwargs):
+    """Stop previewing and bake real keys through ``engine.generate()``.
+
+    Extra *kwargs* are passed on to ``engine.generate``.
+    """
+    stop()
+    engine.invalidate_cache()
+    return engine.generate(layers, variation=variation, tolerance=tolerance,
+                           **kwargs)
+
+
+def current_plan():
+    """The KeyPlan being previewed, or None."""
+    return _plan[0]
+
+
+def report():
+    """One-line summary of preview push timing."""
+    n = _stats['pushes']
+    avg = _stats['total_ms'] / n if n else 0.0
+    return '// AnimGenV2 preview: {} curves, {} pushes, {:.2f} ms avg, {:.2f} ms last'.format(
+        len(_tracks), n, avg, _stats['last_ms'])
+
+
+def _remove_callbacks():
+    for cb in _callback_ids:
+        try:
+            om.MMessage.removeCallback(cb)
+        except Exception:
+            pass
+    del _callback_ids[:]
+
+
+def _drop():
+    _remove_callbacks()
+    del _tracks[:]
+    _originals.clear()
+    _detached[0] = None
+    _plan[0] = None
@@ -0,0 +1,114 @@
+"""Error-bounded key reduction for wave-driven channels.
+
+``Channel.extended_evaluate()`` always emits ``n_points + 2`` spline
+keys (or one per ``sample_at`` entry).  For wave channels the intended
+shape is known analytically, so this stage keys fixed tangents taken
+from the wave derivative (``patterns.derivative``) and greedily inserts
+keys only where the resulting Hermite curve strays more than
+*tolerance* (value units: degrees / cm) from the wave.
+
+Explicit-``values`` channels have no analytic shape and are left as is.
+"""
+
+import bisect
+import math
+
+from .patterns import derivative as wave_deriv, evaluate as wave_eval
+
+# minimum check samples per wave cycle
+_DENSITY = 16
+
+
+def hermite(t0, v0, m0, t1, v1, m1, t):
+    h = t1 - t0
+    s = (t - t0) / h
+    s2 = s * s
+    s3 = s2 * s
+    return ((2 * s3 - 3 * s2 + 1) * v0 + (s3 - 2 * s2 + s) * h * m0
+            + (-2 * s3 + 3 * s2) * v1 + (s3 - s2) * h * m1)
+
+
+def reduce_channel(ch, start, end, tolerance):
+    """Return reduced ``(times, values, slopes)`` for *ch*, or ``None``.
+
+    Times are frames (including *frame_offset*), slopes are value units
+    per frame.  ``None`` means the channel can't be reduced (explicit
+    values) or reduction wouldn't save any keys.
+    """
+    span = end - start
+    if ch.values is not None or span <= 0 or tolerance <= 0:
+        return None
+    ext = ch.extended_normalized_times()
+    lo, hi = ext[0], ext[-1]
+    # candidate keys on whole frames (so reduced keys stay frame-aligned),
+    # topped up with sub-frame samples on short ranges
+    first = int(math.ceil(start + lo * span))
+    last = int(math.floor(start + hi * span))
+    grid = set(ext)
+    grid.update((f - start) / span for f in range(first, last + 1))
+    cycles = max(1.0, abs(ch.frequency) * (hi - lo))
+    n = int(math.ceil(_DENSITY * cycles))
+    if len(grid) < n:
+        grid.update(lo + (hi - lo) * i / n for i in range(n + 1))
+    grid = sorted(grid)
+
+    amp, off = ch.amplitude, ch.offset
+    vals = [wave_eval(ch.wave, t, ch.frequency, ch.phase) * amp + off
+            for t in grid]
+    slopes = [wave_deriv(ch.wave, t, ch.frequency, ch.phase) * amp
+              for t in grid]
+
+    # always keep the loop keys and the cycle boundaries
+    keys = sorted(set(grid.index(t) for t in (ext[0], ext[1], ext[-2], ext[-1])))
+    while len(keys) < len(ext):
+        worst, worst_i = tolerance, None
+        for a, b in zip(keys, keys[1:]):
+            ta, va, ma = grid[a], vals[a], slopes[a]
+            tb, vb, mb = grid[b], vals[b], slopes[b]
+            for i in range(a + 1, b):
+                err = abs(hermite(ta, va, ma, tb, vb, mb, grid[i]) - vals[i])
+                if err > worst:
+                    worst, worst_i = err, i
+        if worst_i is None:
+            break
+        bisect.insort(keys, worst_i)
+    if len(keys) >= len(ext):
+        return None
+
+    return ([start + grid[i] * span + ch.frame_offset for i in keys],
+            [vals[i] for i in keys],
+            [slopes[i] / span for i in keys])
+
+
+def reduce_curves(curves, channels, start, end, tolerance):
+    """Reduce each CurvePlan in place from its matching channel.
+
+    *curves* and *channels* are parallel lists (as returned by
+    ``plan.plan_channels``).  Reduced curves switch to ``'fixed'``
+    tangents with analytic *slopes*.  Returns one
+    ``{'ctrl', 'attr', 'label', 'before', 'after'}`` dict per channel.
+    """
+    stats = []
+    for curve, ch in zip(curves, channels):
+        before = len(curve.times)
+        reduced = reduce_channel(ch, start, end, tolerance)
+        if reduced is not None:
+            curve.times, curve.values, curve.slopes = reduced
+            curve.tangent = 'fixed'
+        stats.append({'ctrl': curve.ctrl, 'attr': curve.attr,
+                      'label': curve.label, 'before': before,
+                      'after': len(curve.times)})
+    return stats
+
+
+def report(stats):
+    """Format ``reduce_curves`` stats as Script Editor lines."""
+    lines = []
+    for s in stats:
+        lines.append('//   {:<28} {:>3} -> {:>3}'.format(
+            s['label'] or '{}.{}'.format(s['ctrl'], s['attr']),
+            s['before'], s['after']))
+    before = sum(s['before'] for s in stats)
+    after = sum(s['after'] for s in stats)
+    lines.append('// AnimGenV2 key reduction: {} -> {} keys'.format(before, after))
+    return '\n'.join(lines)
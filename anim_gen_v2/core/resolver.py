@@ -1,9 +1,32 @@
-"""Cached, case-insensitive Maya node resolution."""
+"""Cached, case-insensitive Maya node resolution.
 
+The scene map is built once and then kept up to date through
+node added / removed / renamed message callbacks, so ``clear()`` at the
+start of a generate only drops the per-name result cache.  Nodes are
+keyed the way ``cmds.ls`` names them (partial DAG paths when short
+names clash); renames and duplicates that shift those paths mark the
+map for a rescan instead of patching it.  A secondary
+index keyed on the normalised name (numbered suffix stripped, e.g.
+``fkspine1_m`` -> ``fkspine_m``) makes fuzzy misses O(1).
+"""
+
+import maya.api.OpenMaya as om
 import maya.cmds as cmds
 
 _cache = {}
 _scene_map = {}   # lower-case name -> actual scene node
+# normalised / short lower-case name -> {scene node: None}; dicts keep
+# insertion order, so the first node added wins a fuzzy lookup and a
+# removal is one pop instead of a rescan of the scene map
+_norm_map = {}
+_short_map = {}
+
+# Callback ids survive importlib.reload() (the module dict is reused)
+# so a reload can remove the previous registration.
+_callback_ids = globals().get('_callback_ids', [])
+_tracking = False   # True once callbacks keep _scene_map current
+_dirty = False      # a DAG path changed under the map; rebuild on next use
+_untrackable = False  # callback registration failed; rescan per clear()
 
 _ALIASES = {
     'fkscapula1_l': 'fkscapula_l',
@@ -13,14 +36,181 @@ _ALIASES = {
 }
 
 
-def clear():
-    """Clear the resolution cache (call at the start of each generate)."""
+def _normalize(low):
+    """Strip the '1' from numbered suffixes (``spine1_m`` -> ``spine_m``)."""
+    return low.replace('1_', '_')
+
+
+# ── scene map maintenance ──
+
+def _short(low):
+    return low.rpartition('|')[2]
+
+
+def _add(name):
+    low = name.lower()
+    _scene_map[low] = name
+    _norm_map.setdefault(_normalize(low), {})[name] = None
+    _short_map.setdefault(_short(low), {})[name] = None
+
+
+def _discard(index, key, name):
+    nodes = index.get(key)
+    if nodes is not None:
+        nodes.pop(name, None)
+        if not nodes:
+            del index[key]
+
+
+def _remove(name):
+    low = name.lower()
+    if _scene_map.get(low) == name:
+        del _scene_map[low]
+    _discard(_norm_map, _normalize(low), name)
+    _discard(_short_map, _short(low), name)
+
+
+def rebuild():
+    """Rebuild the scene map from a full ``cmds.ls`` scan."""
+    global _dirty
+    _dirty = False
     _cache.clear()
     _scene_map.clear()
+    _norm_map.clear()
+    _short_map.clear()
     all_nodes = set((cmds.ls(type='transform') or [])
                     + (cmds.ls(type='joint') or []))
-    for n in all_nodes:
-        _scene_map[n.lower()] = n
+    for n in sorted(all_nodes):
+        _add(n)
+
+
+def _node_name(mobj):
+    """The name ``cmds.ls`` reports: the partial DAG path for DAG nodes."""
+    if mobj.hasFn(om.MFn.kDagNode):
+        try:
+            return om.MFnDagNode(mobj).partialPathName()
+        except RuntimeError:
+            pass
+    return om.MFnDependencyNode(mobj).name()
+
+
+def _mark_dirty():
+    global _dirty
+    _dirty = True
+    _cache.clear()
+
+
+def _short_taken(name):
+    """True when another mapped node already uses *name*'s short name."""
+    return any(n != name for n in _short_map.get(_short(name.lower()), ()))
+
+
+def _has_transform_child(mobj):
+    fn = om.MFnDagNode(mobj)
+    return any(fn.child(i).hasFn(om.MFn.kTransform)
+               for i in range(fn.childCount()))
+
+
+def _on_added(mobj, *_):
+    name = _node_name(mobj)
+    # a duplicate short name lengthens the other node's partial path too
+    if '|' in name or _short_taken(name):
+        _mark_dirty()
+        return
+    _add(name)
+    _cache.clear()
+
+
+def _on_removed(mobj, *_):
+    name = _node_name(mobj)
+    # a path-qualified node leaving may shorten its twin's partial path
+    if '|' in name:
+        _mark_dirty()
+        return
+    _remove(name)
+    _cache.clear()
+
+
+def _on_renamed(mobj, prev_name, *_):
+    if not mobj.hasFn(om.MFn.kTransform):
+        return
+    name = _node_name(mobj)
+    # renaming a parent changes its children's paths; duplicates change
+    # partial paths elsewhere -- cheaper to rescan than to patch
+    if '|' in name or (prev_name and prev_name.lower() not in _scene_map) \
+            or _short_taken(name) or _has_transform_child(mobj):
+        _mark_dirty()
+        return
+    if prev_name:
+        _remove(prev_name)
+    _add(name)
+    _cache.clear()
+
+
+def _on_scene_changed(*_):
+    # new / opened scene: drop everything, rebuild lazily on next use
+    _cache.clear()
+    _scene_map.clear()
+    _norm_map.clear()
+    _short_map.clear()
+
+
+def install_callbacks():
+    """Keep the scene map current through Maya message callbacks.
+
+    Safe to call repeatedly (and after a module reload): any previous
+    registration is removed first.
+    """
+    global _tracking, _untrackable
+    remove_callbacks()
+    try:
+        _callback_ids.extend([
+            om.MDGMessage.addNodeAddedCallback(_on_added, 'transform'),
+            om.MDGMessage.addNodeRemovedCallback(_on_removed, 'transform'),
+            om.MNodeMessage.addNameChangedCallback(om.MObject(), _on_renamed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew,
+                                         _on_scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen,
+                                         _on_scene_changed),
+        ])
+    except Exception as e:
+        print('!! resolver callbacks unavailable, rescanning per generate: '
+              '{}'.format(e))
+        remove_callbacks()
+        _untrackable = True
+        return
+    _tracking = True
+    _untrackable = False
+
+
+def remove_callbacks():
+    """Remove the message callbacks; ``clear()`` rescans again."""
+    global _tracking
+    for cb in _callback_ids:
+        try:
+            om.MMessage.removeCallback(cb)
+        except Exception:
+            pass
+    del _callback_ids[:]
+    _tracking = False
+
+
+# ── public API ──
+
+def clear():
+    """Clear the resolution cache (call at the start of each generate).
+
+    The scene map itself is only rescanned when callbacks aren't
+    tracking scene changes, the map was dropped by a scene change, or a
+    rename / duplicate name changed DAG paths under it.
+    """
+    _cache.clear()
+    if not _tracking:
+        if not _untrackable:
+            install_callbacks()
+        rebuild()
+    elif _dirty or not _scene_map:
+        rebuild()
 
 
 def resolve(name):
@@ -35,21 +225,19 @@ def resolve(name):
         return _cache[name]
 
     # Lazy-populate scene map if clear() hasn't been called yet
-    if not _scene_map:
-        all_nodes = set((cmds.ls(type='transform') or [])
-                        + (cmds.ls(type='joint') or []))
-        for n in all_nodes:
-            _scene_map[n.lower()] = n
+    if _dirty or not _scene_map:
+        clear()
 
     low = name.lower()
     candidates = [low]
 
-    alt = _ALIASES.get(low)
+    ns, sep, base = low.rpartition(':')
+    alt = _ALIASES.get(base)
     if alt:
-        candidates.append(alt)
+        candidates.append(ns + sep + alt)
 
     if low.endswith(('_l', '_r', '_m')):
-        no_one = low.replace('1_', '_')
+        no_one = _normalize(low)
         if no_one not in candidates:
             candidates.append(no_one)
 
@@ -58,12 +246,8 @@ def resolve(name):
             _cache[name] = _scene_map[c]
             return _cache[name]
 
-    # Fallback: strip '1' from numbered suffixes
-    search = low.replace('1_', '_')
-    for k, v in _scene_map.items():
-        if k.replace('1_', '_') == search:
-            _cache[name] = v
-            return v
-
-    _cache[name] = None
-    return None
+    # Fallback: strip '1' from numbered suffixes (indexed lookup)
+    nodes = _norm_map.get(_normalize(low))
+    found = next(iter(nodes)) if nodes else None
+    _cache[name] = found
+    return found
@@ -7,16 +7,38 @@ def range_amp_off(front, back):
 
 
 class Layer:
-    """Base class for animation generator layers."""
+    """Base class for animation generator layers.
+
+    Subclasses implement :meth:`build_channels`; :meth:`channels`
+    memoizes its result against :meth:`fingerprint`, so an unchanged
+    layer costs one params hash per generate.
+    """
 
     name = ''
 
     def __init__(self):
         self.enabled = True
         self._params = {}
+        self._compiled = None   # (fingerprint, [Channel, ...])
+
+    def fingerprint(self):
+        """Hashable snapshot of the params and enabled state.
+
+        ``_params`` is edited in place by the UI, so this is computed
+        from the current values on every call.
+        """
+        return (type(self).__name__, self.enabled,
+                tuple(sorted((k, repr(v)) for k, v in self._params.items())))
 
     def channels(self):
         """Return list of Channel objects for current parameter values."""
+        fp = self.fingerprint()
+        if self._compiled is None or self._compiled[0] != fp:
+            self._compiled = (fp, self.build_channels())
+        return list(self._compiled[1])
+
+    def build_channels(self):
+        """Build the Channel list from ``self._params`` (uncached)."""
         raise NotImplementedError
 
     def controls(self):
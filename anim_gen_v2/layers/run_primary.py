@@ -66,7 +66,7 @@ class RunPrimary(Layer):
 
     # ── channel generation ──
 
-    def channels(self):
+    def build_channels(self):
         p = self._params
         chs = []
         stride_amp, stride_off = range_amp_off(p['stride_back'],
@@ -55,7 +55,7 @@ class SidestepPrimary(Layer):
 
     # ── channel generation ──
 
-    def channels(self):
+    def build_channels(self):
         p = self._params
         chs = []
         d    = 1.0 if p.get('strafe_right', 1.0) >= 0.5 else -1.0
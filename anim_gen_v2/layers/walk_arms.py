@@ -143,5 +143,5 @@ class WalkArms(Layer):
                            label='{} Wrist Twist'.format(side)))
         return chs
 
-    def channels(self):
+    def build_channels(self):
         return self._arm_channels('R', 0.0) + self._arm_channels('L', 0.5)
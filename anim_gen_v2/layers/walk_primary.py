@@ -52,7 +52,7 @@ class WalkPrimary(Layer):
             'FKIKLeg_R': 10,
         }
 
-    def channels(self):
+    def build_channels(self):
         p = self._params
         chs = []
         stride_amp, stride_off = range_amp_off(p['stride_front'],
@@ -47,7 +47,7 @@ class WalkSecondary(Layer):
     def fkik_state(self):
         return {'FKIKSpine_M': 0}   # full FK
 
-    def channels(self):
+    def build_channels(self):
         p = self._params
         chs = []
         for part, ctrl in self._CTRL_MAP.items():
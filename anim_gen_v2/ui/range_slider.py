@@ -64,6 +64,7 @@ class RangeSlider(QtWidgets.QWidget):
 
     rangeChanged = QtCore.Signal(float, float)
     handleChanged = QtCore.Signal(str)   # 'low', 'high', or ''
+    released = QtCore.Signal()           # drag finished
 
     def __init__(self, parent=None, minimum=-60, maximum=60,
                  low=-5, high=5, color=None):
@@ -230,10 +231,13 @@ class RangeSlider(QtWidgets.QWidget):
         self.rangeChanged.emit(self.low, self.high)
 
     def mouseReleaseEvent(self, event):
+        was_dragging = self._dragging is not None
         self._dragging = None
         self._active = None
         self.handleChanged.emit('')
         self.update()
+        if was_dragging:
+            self.released.emit()
 
 
 # ────────────────────────────────────────────────────────────
@@ -244,6 +248,7 @@ class SingleSlider(QtWidgets.QWidget):
     """Single-handle slider with dark track, notches, and color tint."""
 
     valueChanged = QtCore.Signal(float)
+    released = QtCore.Signal()           # drag finished
 
     def __init__(self, parent=None, minimum=-60, maximum=60,
                  value=0, color=None, snap_int=False):
@@ -339,7 +344,9 @@ class SingleSlider(QtWidgets.QWidget):
             self._update_from_mouse(event.position().x())
 
     def mouseReleaseEvent(self, event):
-        self._dragging = False
+        if self._dragging:
+            self._dragging = False
+            self.released.emit()
 
     def _update_from_mouse(self, mx):
         v = self._x_to_val(mx)
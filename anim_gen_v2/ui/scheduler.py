@@ -0,0 +1,128 @@
+"""Latest-wins regeneration scheduler for slider-driven auto-update.
+
+Slider callbacks call :meth:`RegenScheduler.request` instead of
+generating directly.  Requests are coalesced and a single generate
+runs at idle time through ``maya.utils.executeDeferred``, never more
+often than ``min_interval`` seconds (a request arriving sooner waits
+out the rest on a single-shot ``QTimer``).
+
+Usage::
+
+    sched = RegenScheduler(lambda quality: window._generate(quality=quality))
+    sched.request('preview')   # while dragging
+    sched.request('final')     # on release
+    print(sched.report())
+"""
+
+import time
+
+import maya.utils as maya_utils
+from PySide6 import QtCore
+
+PREVIEW = 'preview'
+NORMAL = 'normal'
+FINAL = 'final'
+
+
+class RegenScheduler:
+    """Coalesce regenerate requests into one deferred run.
+
+    *callback* is called with the quality of the newest pending request
+    (``'preview'``, ``'normal'`` or ``'final'``).  A ``'final'`` request
+    is never downgraded by a later preview request queued before the
+    run, so a release always gets its full-quality pass.
+    """
+
+    def __init__(self, callback, min_interval=0.05, verbose=False):
+        self._callback = callback
+        self.min_interval = min_interval   # seconds between runs
+        self.verbose = verbose             # print one line per run
+        self._pending = None               # quality of the pending run
+        self._scheduled = False
+        self._depth = 0                    # requests folded into pending run
+        self._first_request = 0.0
+        self._last_run = 0.0
+        self.reset_stats()
+
+    # ── stats ──
+
+    def reset_stats(self):
+        """Zero the timing / queue counters."""
+        self.stats = {
+            'requests': 0,       # total request() calls
+            'runs': 0,           # generates actually executed
+            'coalesced': 0,      # requests folded into another run
+            'max_depth': 0,      # most requests folded into one run
+            'last_ms': 0.0,      # duration of the last generate
+            'total_ms': 0.0,     # summed generate time
+            'last_wait_ms': 0.0, # first request -> run start, last run
+            'max_wait_ms': 0.0,
+        }
+
+    @property
+    def queue_depth(self):
+        """Number of requests waiting on the pending run."""
+        return self._depth
+
+    def report(self):
+        """Return a one-line human readable summary of :attr:`stats`."""
+        s = self.stats
+        avg = s['total_ms'] / s['runs'] if s['runs'] else 0.0
+        return ('// AnimGenV2 scheduler: {requests} requests, {runs} runs, '
+                '{coalesced} coalesced (max depth {max_depth}), '
+                'avg {avg:.1f} ms, last {last_ms:.1f} ms, '
+                'max wait {max_wait_ms:.1f} ms'.format(avg=avg, **s))
+
+    # ── scheduling ──
+
+    def request(self, quality=NORMAL):
+        """Queue a regenerate; the newest request wins."""
+        self.stats['requests'] += 1
+        if self._pending is None:
+            self._first_request = time.perf_counter()
+        elif self._pending == FINAL and quality == PREVIEW:
+            quality = FINAL
+        self._pending = quality
+        self._depth += 1
+        if not self._scheduled:
+            self._scheduled = True
+            maya_utils.executeDeferred(self._run)
+
+    def cancel(self):
+        """Drop any pending request."""
+        self._pending = None
+        self._depth = 0
+
+    def _run(self):
+        self._scheduled = False
+        if self._pending is None:
+            return
+        now = time.perf_counter()
+        wait = self.min_interval - (now - self._last_run)
+        if wait > 0:
+            # too soon -- sleep out the rest on one timer; later
+            # requests keep folding into this one
+            self._scheduled = True
+            QtCore.QTimer.singleShot(int(wait * 1000.0) + 1, self._run)
+            return
+
+        quality, depth = self._pending, self._depth
+        self._pending = None
+        self._depth = 0
+        s = self.stats
+        wait_ms = (now - self._first_request) * 1000.0
+        s['runs'] += 1
+        s['coalesced'] += depth - 1
+        s['max_depth'] = max(s['max_depth'], depth)
+        s['last_wait_ms'] = wait_ms
+        s['max_wait_ms'] = max(s['max_wait_ms'], wait_ms)
+        try:
+            self._callback(quality)
+        finally:
+            self._last_run = time.perf_counter()
+            s['last_ms'] = (self._last_run - now) * 1000.0
+            s['total_ms'] += s['last_ms']
+            if self.verbose:
+                print('// AnimGenV2 regen [{}] {:.1f} ms, {} request(s), '
+                      'waited {:.1f} ms'.format(quality, s['last_ms'],
+                                                depth, wait_ms))
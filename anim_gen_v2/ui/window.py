@@ -8,11 +8,13 @@ Usage in Maya::
 
 import json
 import os
+import random
 
 import maya.cmds as cmds
 import ui_word_weighting
 
-from ..core import engine, presets
+from ..core import engine, presets, preview, reduce
+from ..core.params import ParamModel
 from ..layers.walk_primary import WalkPrimary
 from ..layers.run_primary import RunPrimary
 from ..layers.sidestep_primary import SidestepPrimary
@@ -20,6 +22,7 @@ from ..layers.walk_secondary import WalkSecondary
 from ..layers.walk_arms import WalkArms
 from .range_slider import (RangeSlider, SingleSlider,
                            embed_in_layout, embed_single_in_layout)
+from .scheduler import RegenScheduler, PREVIEW, NORMAL, FINAL
 
 import maya.OpenMayaUI as omui
 from shiboken6 import wrapInstance
@@ -71,12 +74,22 @@ class AnimGenWindow:
         self.sidestep_primary = SidestepPrimary()
         self.walk_secondary = WalkSecondary()
         self.walk_arms = WalkArms()
+        # slider callbacks write straight into the layers' params
+        self._model = ParamModel([('r_', self.run_primary),
+                                  ('s_', self.sidestep_primary),
+                                  ('', self.walk_primary),
+                                  ('', self.walk_secondary),
+                                  ('', self.walk_arms)])
         self._active_clip = 'walk'   # 'walk', 'run', or 'sidestep'
         self._fields = {}        # key -> floatField handle (cmds)
         self._range_sliders = {}  # (key_lo, key_hi) -> RangeSlider widget
         self._range_keys = {}     # key -> (RangeSlider, 'low'|'high')
         self._single_keys = {}   # key -> SingleSlider widget
         self._auto_update = False
+        # coalesces slider-driven regenerates into one idle-time pass;
+        # tune with win._scheduler.min_interval / .verbose
+        self._scheduler = RegenScheduler(self._scheduled_generate)
+        self._preview_drag = False   # cheap passes while dragging
         self._mute_cbs = {}      # section_name -> checkBox
         self._ranges = self._load_ranges()
         self._section_keys = {}  # section_name -> [keys]
@@ -156,6 +169,17 @@ class AnimGenWindow:
             attachControl=[(scroll, 'bottom', 0, bottom)],
             attachNone=[(bottom, 'top')])
 
+        # one sync at build time (sliders clamp to their ranges); from
+        # here on the callbacks keep the model current
+        self._model.update({k: self._get_val(k) for k in self._fields})
+
+        # undo / redo swap keys behind the engine's back; drop its
+        # fingerprints so the next auto-update re-keys everything.
+        # parent= kills both jobs when the window is deleted.
+        for event in ('Undo', 'Redo'):
+            cmds.scriptJob(event=[event, engine.invalidate_cache],
+                           parent=win)
+
         cmds.showWindow(win)
         ui_word_weighting.apply_deferred(WINDOW_NAME)
 
@@ -182,6 +206,8 @@ class AnimGenWindow:
         else:
             self._active_clip = 'walk'
         self._refresh_preset_list()
+        if preview.is_active():
+            self._update_preview()
 
     @staticmethod
     def _sel(ctrls):
@@ -246,16 +272,17 @@ class AnimGenWindow:
         def _slider_changed(v):
             cmds.floatField(fld, e=True, v=v)
             self._style_field_zero(fld)
-            if self._auto_update:
-                self._generate()
+            self._model.set(key, v)
+            self._request_generate(PREVIEW)
 
         def _field_changed(v):
             sl.setValue(v)
             self._style_field_zero(fld)
-            if self._auto_update:
-                self._generate()
+            self._model.set(key, v)
+            self._request_generate()
 
         sl.valueChanged.connect(_slider_changed)
+        sl.released.connect(lambda: self._request_generate(FINAL))
         cmds.floatField(fld, e=True, changeCommand=_field_changed)
         self._style_field_zero(fld)
         cmds.setParent('..')
@@ -305,22 +332,24 @@ class AnimGenWindow:
             cmds.floatField(f_hi, e=True, v=hi)
             self._style_field_zero(f_lo)
             self._style_field_zero(f_hi)
-            if self._auto_update:
-                self._generate()
+            self._model.set(key_lo, lo)
+            self._model.set(key_hi, hi)
+            self._request_generate(PREVIEW)
 
         def _lo_field_changed(val):
             sl.setLow(val)
             self._style_field_zero(f_lo)
-            if self._auto_update:
-                self._generate()
+            self._model.set(key_lo, val)
+            self._request_generate()
 
         def _hi_field_changed(val):
             sl.setHigh(val)
             self._style_field_zero(f_hi)
-            if self._auto_update:
-                self._generate()
+            self._model.set(key_hi, val)
+            self._request_generate()
 
         sl.rangeChanged.connect(_slider_changed)
+        sl.released.connect(lambda: self._request_generate(FINAL))
         cmds.floatField(f_lo, e=True, changeCommand=_lo_field_changed)
         cmds.floatField(f_hi, e=True, changeCommand=_hi_field_changed)
         self._style_field_zero(f_lo)
@@ -375,14 +404,19 @@ class AnimGenWindow:
                 sl.setLow(val)
             else:
                 sl.setHigh(val)
+            val = self._get_val(key)
             cmds.floatField(self._fields[key], e=True, v=val)
         elif key in self._single_keys:
             self._single_keys[key].setValue(val)
+            val = self._get_val(key)
             cmds.floatField(self._fields[key], e=True, v=val)
         else:
             cmds.floatSliderGrp(self._fields[key], e=True, v=val)
+            val = self._get_val(key)
         if key in self._fields:
             self._style_field_zero(self._fields[key])
+        # the controls clamp to their range; store what they show
+        self._model.set(key, val)
 
     def _set_field_enabled(self, key, enabled):
         if key in self._range_keys:
@@ -434,8 +468,7 @@ class AnimGenWindow:
         for k in keys:
             if k in self._fields:
                 self._set_val(k, 0)
-        if self._auto_update:
-            self._generate()
+        self._request_generate()
 
     def _slider_pair(self, label_a, key_a, def_a, label_b, key_b, def_b,
                      rng=None, color_a=None, color_b=None,
@@ -490,16 +523,17 @@ class AnimGenWindow:
 
         def _slider_changed(v):
             cmds.floatField(fld, e=True, v=round(v))
-            if self._auto_update:
-                self._generate()
+            self._model.set(key, v)
+            self._request_generate(PREVIEW)
 
         def _field_changed(v):
             v = round(v)
             sl.setValue(v)
-            if self._auto_update:
-                self._generate()
+            self._model.set(key, v)
+            self._request_generate()
 
         sl.valueChanged.connect(_slider_changed)
+        sl.released.connect(lambda: self._request_generate(FINAL))
         cmds.floatField(fld, e=True, changeCommand=_field_changed)
         cmds.setParent('..')
         self._fields[key] = fld
@@ -555,8 +589,7 @@ class AnimGenWindow:
                     self._set_val(key, val * scale)
             sl.setValue(1.0)
             cmds.floatField(fld, e=True, v=1.0)
-            if self._auto_update:
-                self._generate()
+            self._request_generate()
 
         sl.valueChanged.connect(_slider_changed)
         cmds.floatField(fld, e=True, changeCommand=_field_changed)
@@ -580,8 +613,7 @@ class AnimGenWindow:
                 if key in self._fields:
                     self._set_val(key, val)
                     self._set_field_enabled(key, True)
-        if self._auto_update:
-            self._generate()
+        self._request_generate()
 
     def _toggle_mute_category(self, sections, val):
         """Mute/unmute all sub-sections of a category at once."""
@@ -799,7 +831,7 @@ class AnimGenWindow:
         self._strafe_dir_cb = cmds.checkBox(
             label='Strafe Right', value=bool(d.get('strafe_right', 1.0) >= 0.5),
             annotation='Checked = strafe right, unchecked = strafe left',
-            changeCommand=lambda *_: self._generate() if self._auto_update else None)
+            changeCommand=lambda val: self._strafe_changed(val))
         cmds.setParent('..')
 
         # ── Legs ──
@@ -1037,12 +1069,13 @@ class AnimGenWindow:
         cmds.separator(height=10, style='in')
 
         # ── Main actions ──
-        cmds.rowLayout(numberOfColumns=4, columnWidth4=(200, 150, 150, 100),
+        cmds.rowLayout(numberOfColumns=6,
+                       columnWidth6=(180, 140, 140, 55, 85, 95),
                        adjustableColumn=1)
         cmds.button(label='Generate', height=36,
                     backgroundColor=(0.22, 0.55, 0.22),
                     annotation='Key all layers on the current timeline range using the slider values above',
-                    command=lambda *_: self._generate())
+                    command=lambda *_: self._generate(full=True, all_rigs=True))
         cmds.button(label='Delete Animation', height=36,
                     backgroundColor=(0.55, 0.22, 0.22),
                     annotation='Remove all keyframes set by this tool from every affected control',
@@ -1054,6 +1087,15 @@ class AnimGenWindow:
         cmds.checkBox(label='Auto', value=False,
                       annotation='Automatically regenerate the walk cycle whenever any slider changes',
                       changeCommand=lambda val: self._toggle_auto(val))
+        cmds.checkBox(label='Fast Drag', value=False,
+                      annotation='While Auto is on, skip variation during slider drags '
+                                 'and run one full regenerate on release',
+                      changeCommand=lambda val: self._toggle_preview_drag(val))
+        self._live_cb = cmds.checkBox(
+            label='Live Preview', value=False,
+            annotation='Drive the rig from the sliders without setting keys; '
+                       'scrub to preview, Generate bakes the keys',
+            changeCommand=lambda val: self._toggle_live_preview(val))
         cmds.setParent('..')
 
         # ── Variation ──
@@ -1083,6 +1125,45 @@ class AnimGenWindow:
         self._var_field = fld_var
         cmds.setParent('..')
 
+        # ── Variation seed / variants ──
+        cmds.rowLayout(numberOfColumns=6, adjustableColumn=6,
+                       columnWidth6=(80, 60, 50, 60, 40, 100))
+        cmds.text(label='Seed', width=80, align='right',
+                  annotation='Random seed for Variation -- same seed, same result')
+        self._seed_field = cmds.intField(v=0, min=0, width=60,
+                                         annotation='Variation seed (saved with presets)',
+                                         changeCommand=lambda *_: self._request_generate())
+        cmds.button(label='New', width=45, height=20,
+                    annotation='Pick a new random seed',
+                    command=lambda *_: self._new_seed())
+        cmds.text(label='Variants', width=60, align='right')
+        self._variant_count = cmds.intField(v=4, min=1, max=99, width=40,
+                                            annotation='Number of seeded variants to bake')
+        cmds.button(label='Bake Variants', height=20,
+                    annotation='Key seeded variants (seed, seed+1, ...) into consecutive '
+                               'Clip Setter clip ranges in one undo step',
+                    command=lambda *_: self._bake_variants())
+        cmds.setParent('..')
+
+        # ── Key reduction ──
+        cmds.rowLayout(numberOfColumns=4, adjustableColumn=3,
+                       columnWidth4=(80, 45, 100, 110))
+        cmds.text(label='Key Reduce', width=80, align='right',
+                  annotation='Reduce wave curves to the fewest keys within this '
+                             'error (deg / cm, 0 = off)')
+        self._tol_field = cmds.floatField(v=0, precision=3, width=45,
+                                          minValue=0, maxValue=10, step=0.01,
+                                          annotation='Maximum deviation from the exact wave '
+                                                     '(0 = key every point)',
+                                          changeCommand=lambda *_: self._request_generate())
+        cmds.text(label='  tolerance (0 = off)', align='left')
+        self._all_rigs_cb = cmds.checkBox(
+            label='All Rigs', value=False,
+            annotation='Generate keys the same cycle on every rig namespace in '
+                       'the scene (one evaluation, one undo); Variation is '
+                       'applied per rig')
+        cmds.setParent('..')
+
         # ── Presets ──
         cmds.separator(height=8, style='in')
         cmds.frameLayout(label='Presets', collapsable=True,
@@ -1164,25 +1245,9 @@ class AnimGenWindow:
     #  Callbacks
     # ──────────────────────────────────────────────
 
-    def _read_fields(self):
-        for key in self._fields:
-            val = self._get_val(key)
-            # Run primary keys are prefixed with 'r_'
-            if key.startswith('r_') and key[2:] in self.run_primary.DEFAULTS:
-                self.run_primary._params[key[2:]] = val
-            elif key.startswith('s_') and key[2:] in self.sidestep_primary.DEFAULTS:
-                self.sidestep_primary._params[key[2:]] = val
-            elif key in self.walk_primary.DEFAULTS:
-                self.walk_primary._params[key] = val
-            elif key in self.walk_secondary.DEFAULTS:
-                self.walk_secondary._params[key] = val
-            elif key in self.walk_arms.DEFAULTS:
-                self.walk_arms._params[key] = val
-        # Sidestep direction checkbox (not a float slider)
-        if hasattr(self, '_strafe_dir_cb'):
-            self.sidestep_primary._params['strafe_right'] = (
-                1.0 if cmds.checkBox(self._strafe_dir_cb, q=True, value=True)
-                else 0.0)
+    def _strafe_changed(self, val):
+        self._model.set('s_strafe_right', 1.0 if val else 0.0)
+        self._request_generate()
 
     def _layers(self):
         """Return the layer list for the active clip type."""
@@ -1194,17 +1259,71 @@ class AnimGenWindow:
         for layer in self._layers():
             all_ctrls.update(layer.controls())
             fkik_ctrls.update(layer.fkik_state().keys())
+        if preview.is_active():
+            preview.stop()
+            cmds.checkBox(self._live_cb, e=True, value=False)
+        engine.begin_pass()
         cmds.undoInfo(openChunk=True, chunkName='AnimGenV2_delete')
         try:
             engine.clear_keys(list(all_ctrls))
             engine.clear_keys(list(fkik_ctrls), attrs=['FKIKBlend'])
         finally:
             cmds.undoInfo(closeChunk=True)
+        engine.invalidate_cache()
 
-    def _generate(self):
-        self._read_fields()
-        variation = self._var_slider.value() if hasattr(self, '_var_slider') else 0
-        engine.generate(self._layers(), variation=variation)
+    def _generate(self, full=False, quick=False, all_rigs=False):
+        if full and preview.is_active():
+            self._commit_preview()
+            return
+        self._generate_keys(full, quick, all_rigs)
+
+    def _generate_keys(self, full=False, quick=False, all_rigs=False):
+        """Regenerate keys.  Auto-update passes only re-key changed curves;
+        *full* drops the engine cache first.
+        *quick* skips variation so drags only touch the edited curves.
+        *all_rigs* (the Generate button) keys every rig when "All Rigs"
+        is ticked; drag releases stay on the current rig.
+        Params come from ``self._model`` (kept current by the UI
+        callbacks), so no controls are polled here."""
+        variation = self._variation()
+        if quick:
+            variation = 0
+        if full:
+            engine.invalidate_cache()
+        tolerance = None
+        if hasattr(self, '_tol_field'):
+            tolerance = cmds.floatField(self._tol_field, q=True, v=True) or None
+        rigs = None
+        if full and all_rigs and hasattr(self, '_all_rigs_cb') \
+           and cmds.checkBox(self._all_rigs_cb, q=True, value=True):
+            rigs = engine.find_rigs()
+            print('// AnimGenV2: keying {} rigs: {}'.format(
+                len(rigs), ', '.join(r or ':' for r in rigs)))
+        engine.generate(self._layers(), variation=variation,
+                        incremental=self._auto_update, tolerance=tolerance,
+                        rigs=rigs, seed=self._seed())
+        kp = engine.last_plan()
+        if full and kp is not None and kp.meta.get('reduction'):
+            print(reduce.report(kp.meta['reduction']))
+
+    def _request_generate(self, quality=NORMAL):
+        """Queue an auto-update regenerate (or live preview refresh)."""
+        if self._auto_update or preview.is_active():
+            self._scheduler.request(quality)
+
+    def _scheduled_generate(self, quality):
+        """Scheduler callback -- runs one coalesced regenerate."""
+        if preview.is_active():
+            self._update_preview()
+            return
+        if not self._auto_update:
+            return
+        if self._preview_drag and quality == PREVIEW:
+            self._generate(quick=True)
+        elif self._preview_drag and quality == FINAL:
+            self._generate(full=True)
+        else:
+            self._generate()
 
     def _sel_all(self):
         all_ctrls = []
@@ -1214,15 +1333,81 @@ class AnimGenWindow:
 
     def _toggle_auto(self, val):
         self._auto_update = val
+        if not val:
+            self._scheduler.cancel()
+        # keys may have been edited while auto was off
+        engine.invalidate_cache()
         # Single and range sliders already fire callbacks that check
         # self._auto_update, so nothing extra is needed here.
 
+    def _toggle_live_preview(self, val):
+        """Start / stop driving the rig without keys."""
+        self._scheduler.cancel()
+        if val:
+            preview.start(self._layers(), variation=self._variation(),
+                          seed=self._seed())
+        else:
+            preview.stop()
+            print(preview.report())
+
+    def _update_preview(self):
+        """Refresh the live preview with the variation and seed a commit
+        would key."""
+        preview.update(self._layers(), variation=self._variation(),
+                       seed=self._seed())
+
+    def _commit_preview(self):
+        """Bake the previewed settings into real keys and leave preview."""
+        self._scheduler.cancel()
+        variation = self._variation()
+        tolerance = None
+        if hasattr(self, '_tol_field'):
+            tolerance = cmds.floatField(self._tol_field, q=True, v=True) or None
+        print(preview.report())
+        preview.commit(self._layers(), variation=variation,
+                       tolerance=tolerance, seed=self._seed())
+        if hasattr(self, '_live_cb'):
+            cmds.checkBox(self._live_cb, e=True, value=False)
+
+    def _variation(self):
+        return self._var_slider.value() if hasattr(self, '_var_slider') else 0
+
+    def _seed(self):
+        if not hasattr(self, '_seed_field'):
+            return None
+        return cmds.intField(self._seed_field, q=True, v=True)
+
+    def _new_seed(self):
+        cmds.intField(self._seed_field, e=True,
+                      v=random.randint(0, 99999))
+        self._request_generate()
+
+    def _bake_variants(self):
+        """Key N seeded variants into consecutive clip ranges."""
+        variation = self._var_slider.value()
+        if variation <= 0:
+            cmds.warning('Set Variation above 0 to bake variants.')
+            return
+        count = cmds.intField(self._variant_count, q=True, v=True)
+        tolerance = cmds.floatField(self._tol_field, q=True, v=True) or None
+        layout = engine.generate_variants(
+            self._layers(), count, variation, seed=self._seed(),
+            name=self._active_clip, tolerance=tolerance)
+        for c in layout:
+            print('//   {:20s}  {:4d} - {:4d}'.format(c['name'], c['start'], c['end']))
+        print('// AnimGenV2: baked {} variants (seed {}+)'.format(
+            len(layout), self._seed()))
+
+    def _toggle_preview_drag(self, val):
+        self._preview_drag = val
+
     def _all_params(self):
-        self._read_fields()
         return {
             'primary': self._active_primary.params(),
             'secondary': self.walk_secondary.params(),
             'arms': self.walk_arms.params(),
+            'variation': {'percent': self._var_slider.value(),
+                          'seed': self._seed() or 0},
         }
 
     # ── preset callbacks ──
@@ -1365,6 +1550,11 @@ class AnimGenWindow:
             self.walk_secondary.set_params(data['secondary'])
         if 'arms' in data:
             self.walk_arms.set_params(data['arms'])
+        if 'variation' in data:
+            pct, seed = presets.variation_settings(data)
+            self._var_slider.setValue(pct)
+            cmds.floatField(self._var_field, e=True, v=pct)
+            cmds.intField(self._seed_field, e=True, v=seed)
         self._refresh_fields()
 
     def _refresh_fields(self):
@@ -1,6 +1,37 @@
+import contextlib
 import json
 import maya.cmds as cmds
 
+from anim_gen_v2.core import engine, plan, plugs, resolver
+from anim_gen_v2.core.channel import Channel
+from anim_gen_v2.layers import Layer
+
+
+class GeneratorLayer(Layer):
+    """Presents a v1 generator to the anim_gen_v2 engine as one Layer.
+
+    The generator's plain attributes stand in for ``_params``, so an
+    unchanged generator reuses its evaluated curves like any v2 layer.
+    """
+
+    def __init__(self, generator):
+        super().__init__()
+        self.generator = generator
+        self.name = generator.WINDOW_TITLE
+
+    def fingerprint(self):
+        return (type(self.generator).__name__, self.enabled,
+                self.generator.settings_fingerprint())
+
+    def build_channels(self):
+        return self.generator.build_channels()
+
+    def controls(self):
+        return sorted(set(ch.ctrl for ch in self.channels()))
+
+    def fkik_state(self):
+        return self.generator.fkik_state()
+
 
 class AnimGeneratorBase:
     """Shared base class for all animation cycle generators."""
@@ -21,14 +52,35 @@ class AnimGeneratorBase:
     # ------------------------------------------------------------------ #
     #  Node resolution
     # ------------------------------------------------------------------ #
-    @staticmethod
-    def resolve_node(name):
+    # lower-case name / normalised name -> locator shape, built on the
+    # first resolver miss of a pass (see resolve_node)
+    _locators = None
+
+    @classmethod
+    def resolve_node(cls, name):
         """Case-insensitive node lookup with scapula alias support.
 
+        Shares the cached scene map of ``anim_gen_v2.core.resolver``, so a
+        lookup is a dict hit instead of a full ``cmds.ls`` scan.  Names
+        it doesn't know fall back to the scene's locator shapes (one scan
+        per pass, see :meth:`begin_generate`).
+
         Returns the actual scene node name if found, else ``None``.
         """
-        if not name:
-            return None
+        node = resolver.resolve(name)
+        if node is None and name:
+            node = cls._resolve_locator(name)
+        return node
+
+    @classmethod
+    def _resolve_locator(cls, name):
+        if AnimGeneratorBase._locators is None:
+            by_name, by_norm = {}, {}
+            for n in cmds.ls(type="locator") or []:
+                by_name[n.lower()] = n
+                by_norm.setdefault(n.lower().replace('1_', '_'), n)
+            AnimGeneratorBase._locators = (by_name, by_norm)
+        by_name, by_norm = AnimGeneratorBase._locators
         name_lower = name.lower()
         aliases = {
             'fkscapula1_l': 'fkscapula_l',
@@ -36,27 +88,33 @@ class AnimGeneratorBase:
             'fkscapula1_r': 'fkscapula_r',
             'fkscapula_r':  'fkscapula1_r',
         }
-        candidates = [name_lower, aliases.get(name_lower, name_lower)]
-        if name_lower.endswith(('_l', '_r', '_m')):
-            base_no_one = name_lower.replace('1_', '_')
-            if base_no_one not in candidates:
-                candidates.append(base_no_one)
-
-        all_nodes = (cmds.ls(type="transform") or []) + \
-                    (cmds.ls(type="joint") or []) + \
-                    (cmds.ls(type="locator") or [])
-        lower_map = {n.lower(): n for n in all_nodes}
-        for c in candidates:
-            if c in lower_map:
-                return lower_map[c]
-
-        # General fallback: match ignoring '1' in numbered suffixes
-        # e.g. FKSpine1_M <-> FKSpine_M, FKScapula1_L <-> FKScapula_L
-        search = name_lower.replace('1_', '_')
-        for n in all_nodes:
-            if n.lower().replace('1_', '_') == search:
-                return n
-        return None
+        for c in (name_lower, aliases.get(name_lower, name_lower)):
+            if c in by_name:
+                return by_name[c]
+        return by_norm.get(name_lower.replace('1_', '_'))
+
+    @staticmethod
+    def begin_generate():
+        """Invalidate per-pass lookups (start of a generate pass).
+
+        The resolver's scene map is kept: its callbacks keep it current.
+        """
+        AnimGeneratorBase._locators = None
+        plugs.clear()
+
+    @contextlib.contextmanager
+    def generate_pass(self, chunk_name=None):
+        """Wrap one generate: fresh caches, a single undo chunk, and the
+        playhead restored once at the end."""
+        self.begin_generate()
+        original_time = cmds.currentTime(query=True)
+        cmds.undoInfo(openChunk=True,
+                      chunkName=chunk_name or type(self).__name__)
+        try:
+            yield
+        finally:
+            cmds.undoInfo(closeChunk=True)
+            cmds.currentTime(original_time, edit=True)
 
     # backward-compat alias
     def resolve_node_case_insensitive(self, name):
@@ -83,54 +141,103 @@ class AnimGeneratorBase:
         three_quarter = start + 3 * (end - start) / 4.0
         self.frames = [start, quarter, mid, three_quarter, end]
 
+    # ------------------------------------------------------------------ #
+    #  anim_gen_v2 engine
+    # ------------------------------------------------------------------ #
+    # normalised key positions of the classic 3- and 5-point timings
+    HALVES = (0.0, 0.5, 1.0)
+    QUARTERS = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+    @staticmethod
+    def cycle_channel(ctrl, attr, times, values, label=''):
+        """Channel keying *values* at normalised *times* of the cycle.
+
+        *times* run from 0 (playback start) to 1 (playback end); the
+        engine adds the wrapped loop keys on either side.
+        """
+        return Channel(ctrl, attr, sample_at=[float(t) for t in times],
+                       values=[float(v) for v in values], label=label)
+
+    def build_channels(self):
+        """Return the cycle as a list of anim_gen_v2 Channels."""
+        raise NotImplementedError
+
+    def fkik_state(self):
+        """``{blend_ctrl: value}`` held over the cycle (see ``Layer``)."""
+        return {}
+
+    def clear_targets(self, channels):
+        """``(ctrl, attr)`` pairs cleared before keying *channels*.
+
+        Defaults to the keyed plugs plus the FKIK blends.
+        """
+        targets = [(ch.ctrl, ch.attr) for ch in channels]
+        targets += [(ctrl, 'FKIKBlend') for ctrl in self.fkik_state()]
+        return targets
+
+    def settings_fingerprint(self):
+        """Hashable snapshot of the generator's plain attributes."""
+        return tuple(sorted(
+            (k, repr(v)) for k, v in vars(self).items()
+            if isinstance(v, (bool, int, float, str, list, tuple, dict))))
+
+    def layer(self):
+        """The generator as an anim_gen_v2 Layer (one per generator)."""
+        if getattr(self, '_layer', None) is None:
+            self._layer = GeneratorLayer(self)
+        return self._layer
+
+    def key_cycle(self):
+        """Clear and key :meth:`build_channels` through the v2 engine.
+
+        Keys land in bulk with the looping extra key on each side and
+        constant infinity.  Run inside :meth:`generate_pass`.  Returns
+        the applied ``KeyPlan``.
+        """
+        layer = self.layer()
+        start, end = self.timeline_range()
+        kp = plan.build([layer], start, end, clear=False)
+        engine.begin_pass()
+        engine.clear_plugs(self.clear_targets(layer.channels()))
+        engine.apply_plans([kp])
+        return kp
+
     # ------------------------------------------------------------------ #
     #  Keyframing
     # ------------------------------------------------------------------ #
     def set_key(self, obj, attr, time, value):
         """Set a keyframe, resolving nodes case-insensitively.
 
+        Keys are written at *time* directly; the playhead is never moved
+        (wrap a generate in :meth:`generate_pass` for one undo chunk).
         Handles missing nodes/attrs, locked attrs, and connected attrs
         gracefully without raising.
         """
-        if not cmds.objExists(obj):
+        if not plugs.node_exists(obj):
             resolved = self.resolve_node(obj)
             if resolved:
                 obj = resolved
             else:
                 print(f"?? Skipping key: {obj}.{attr} (not found)")
                 return
-        if not cmds.attributeQuery(attr, node=obj, exists=True):
+        if not plugs.exists(obj, attr):
             print(f"?? Skipping key: {obj}.{attr} (attr not found)")
             return
 
         full_attr = f"{obj}.{attr}"
-        try:
-            locked = cmds.getAttr(full_attr, lock=True)
-        except Exception:
-            locked = False
-
-        cmds.currentTime(time, edit=True)
-
-        if locked:
+        if plugs.locked(obj, attr):
             try:
                 cmds.setKeyframe(obj, at=attr, t=time)
             except Exception as e:
                 print(f"!! Could not key locked {full_attr}: {e}")
             return
 
-        connected = False
         try:
-            connected = cmds.connectionInfo(full_attr, isDestination=True)
-        except Exception:
-            pass
-
-        try:
-            if connected:
+            if plugs.connected(obj, attr):
                 cmds.setKeyframe(obj, at=attr, t=time)
                 cmds.keyframe(obj, at=attr, e=True, t=(time, time), vc=float(value))
             else:
-                cmds.setAttr(full_attr, float(value))
-                cmds.setKeyframe(obj, at=attr, t=time)
+                cmds.setKeyframe(obj, at=attr, t=time, v=float(value))
         except Exception as e:
             print(f"!! set_key failed on {full_attr} @ {time}: {e}")
 
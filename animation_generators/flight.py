@@ -85,219 +85,152 @@ class FlightGenerator(AnimGeneratorBase):
         self.pole_off_z = 0.0; self.pole_base_z = 0.0; self.pole_mid_z = 0.0
 
     # ------------------------------------------------------------------ #
-    #  Keying
+    #  Channels (keyed through the anim_gen_v2 engine)
     # ------------------------------------------------------------------ #
-    def clear_keys(self):
-        s, e = self.timeline_range()
-        for node, attrs in [
-            (self.ik_arm_l, ["translateZ", "rotateX", "rotateY", "translateX", "translateY"]),
-            (self.ik_arm_r, ["translateZ", "rotateX", "rotateY", "translateX", "translateY"]),
-            (self.fkik_l,   ["FKIKBlend"]),
-            (self.fkik_r,   ["FKIKBlend"]),
-            (self.spine, ["rotateZ"]),
-            (self.chest, ["rotateZ"]),
-            (self.neck,  ["rotateZ"]),
-            (self.head,  ["rotateZ"]),
-            (self.root,  ["translateY"]),
-            (self.leg_l, ["translateX", "translateY", "translateZ", "rotateX"]),
-            (self.leg_r, ["translateX", "translateY", "translateZ", "rotateX"]),
-            (self.root,  ["translateX", "rotateZ"]),
-            (self.scap_l, ["rotateY", "rotateZ", "rotateX"]),
-            (self.scap_r, ["rotateY", "rotateZ", "rotateX"]),
-            (self.pole_l, ["translateX", "translateY", "translateZ"]),
-            (self.pole_r, ["translateX", "translateY", "translateZ"]),
-        ]:
-            resolved = self.resolve_node(node) or node
-            for a in attrs:
-                self.cut_attr_keys_in_range(resolved, a, s, e, reset_to_zero=True)
-
-    def key_arms(self):
-        start, quarter, _, three_quarter, end = self.frames
+    # key positions: start / quarter / three-quarter / end
+    FLAP = (0.0, 0.25, 0.75, 1.0)
+    THIRDS = (0.0, 1.0 / 3.0, 2.0 / 3.0, 1.0)
+
+    def arm_channels(self):
+        ch = self.cycle_channel
+        down = float(self.ik_arms_down)
+        up = float(self.ik_arms_up)
+        rot_x = float(self.arm_rotateX_value)
+        chs = []
         for node in [self.ik_arm_l, self.ik_arm_r]:
-            self.set_key(node, "translateZ", start,         0.0)
-            self.set_key(node, "translateZ", quarter,       float(self.ik_arms_down))
-            self.set_key(node, "translateZ", three_quarter, float(self.ik_arms_up))
-            self.set_key(node, "translateZ", end,           0.0)
-        for node in [self.ik_arm_l, self.ik_arm_r]:
-            val = float(self.arm_rotateX_value)
-            self.set_key(node, "rotateX", start, val)
-            self.set_key(node, "rotateX", end,   val)
-
-    def key_hand_flap(self):
-        start, quarter, mid, three_quarter, end = self.frames
-        pairs = [(self.ik_arm_l, +1.0), (self.ik_arm_r, -1.0)]
-        for node, sgn in pairs:
-            self.set_key(node, "rotateY", start,         0.0)
-            self.set_key(node, "rotateY", quarter,       sgn * float(self.hand_flap_down))
-            self.set_key(node, "rotateY", three_quarter, sgn * float(self.hand_flap_up))
-            self.set_key(node, "rotateY", end,           0.0)
-
-    def key_hand_positioning(self):
-        start, quarter, mid, three_quarter, end = self.frames
+            chs.append(ch(node, "translateZ", self.FLAP, [0.0, down, up, 0.0]))
+            chs.append(ch(node, "rotateX", (0.0, 1.0), [rot_x, rot_x]))
+        return chs
+
+    def hand_flap_channels(self):
+        down = float(self.hand_flap_down)
+        up = float(self.hand_flap_up)
+        return [self.cycle_channel(node, "rotateY", self.FLAP,
+                                   [0.0, sgn * down, sgn * up, 0.0])
+                for node, sgn in [(self.ik_arm_l, +1.0), (self.ik_arm_r, -1.0)]]
+
+    def hand_positioning_channels(self):
+        ch = self.cycle_channel
         baseX = float(self.hands_base_x)
         qX    = float(self.hands_x_q)
         mX    = float(self.hands_x_mid)
         q3X   = float(self.hands_x_3q)
-        for node, sgn in [(self.ik_arm_l, +1.0), (self.ik_arm_r, -1.0)]:
-            self.set_key(node, "translateX", start,         sgn * baseX)
-            self.set_key(node, "translateX", quarter,       sgn * (baseX + qX))
-            self.set_key(node, "translateX", mid,           sgn * (baseX + mX))
-            self.set_key(node, "translateX", three_quarter, sgn * (baseX + q3X))
-            self.set_key(node, "translateX", end,           sgn * baseX)
-
         baseY = float(self.hands_base_y)
         flapY = float(self.hands_flap)
+        chs = []
+        for node, sgn in [(self.ik_arm_l, +1.0), (self.ik_arm_r, -1.0)]:
+            chs.append(ch(node, "translateX", self.QUARTERS,
+                          [sgn * baseX, sgn * (baseX + qX), sgn * (baseX + mX),
+                           sgn * (baseX + q3X), sgn * baseX]))
         for node in [self.ik_arm_l, self.ik_arm_r]:
-            self.set_key(node, "translateY", start,         baseY)
-            self.set_key(node, "translateY", quarter,       baseY + flapY)
-            self.set_key(node, "translateY", three_quarter, baseY)
-            self.set_key(node, "translateY", end,           baseY)
-
-    def key_stretch_bend_posture(self):
-        start, _, _, _, end = self.frames
-        third       = start + (end - start) / 3.0
-        two_thirds  = start + 2.0 * (end - start) / 3.0
+            chs.append(ch(node, "translateY", self.FLAP,
+                          [baseY, baseY + flapY, baseY, baseY]))
+        return chs
 
+    def stretch_bend_posture_channels(self):
         def do(node, off, v1, v2):
-            self.set_key(node, "rotateZ", start,      float(off))
-            self.set_key(node, "rotateZ", third,      float(off) + float(v1))
-            self.set_key(node, "rotateZ", two_thirds, float(off) + float(v2))
-            self.set_key(node, "rotateZ", end,        float(off))
-
-        do(self.spine, self.spine_off, self.spine_1_3, self.spine_2_3)
-        do(self.chest, self.chest_off, self.chest_1_3, self.chest_2_3)
-        do(self.neck,  self.neck_off,  self.neck_1_3,  self.neck_2_3)
-        do(self.head,  self.head_off,  self.head_1_3,  self.head_2_3)
-
-    def key_root_movement(self):
-        start, quarter, mid, three_quarter, end = self.frames
+            off = float(off)
+            return self.cycle_channel(node, "rotateZ", self.THIRDS,
+                                      [off, off + float(v1), off + float(v2), off])
+
+        return [do(self.spine, self.spine_off, self.spine_1_3, self.spine_2_3),
+                do(self.chest, self.chest_off, self.chest_1_3, self.chest_2_3),
+                do(self.neck,  self.neck_off,  self.neck_1_3,  self.neck_2_3),
+                do(self.head,  self.head_off,  self.head_1_3,  self.head_2_3)]
+
+    def root_movement_channels(self):
+        ch = self.cycle_channel
         baseZ = float(self.root_updown_base)
         midZ  = float(self.root_updown_mid)
-        self.set_key(self.root, "translateX", start,         baseZ)
-        self.set_key(self.root, "translateX", quarter,       midZ)
-        self.set_key(self.root, "translateX", three_quarter, -midZ)
-        self.set_key(self.root, "translateX", end,           baseZ)
-
         off = float(self.root_bf_off)
         q = float(self.root_bf_q)
         m = float(self.root_bf_mid)
         q3 = float(self.root_bf_3q)
-        self.set_key(self.root, "translateY", start,         off)
-        self.set_key(self.root, "translateY", quarter,       off + q)
-        self.set_key(self.root, "translateY", mid,           off + m)
-        self.set_key(self.root, "translateY", three_quarter, off + q3)
-        self.set_key(self.root, "translateY", end,           off)
-
         baseRX = float(self.root_backforth_base)
         midRX  = float(self.root_backforth_mid)
-        self.set_key(self.root, "rotateZ", start,         baseRX)
-        self.set_key(self.root, "rotateZ", quarter,       midRX)
-        self.set_key(self.root, "rotateZ", three_quarter, -midRX)
-        self.set_key(self.root, "rotateZ", end,           baseRX)
-
-    def key_legs(self):
-        start, quarter, mid, three_quarter, end = self.frames
-
+        return [
+            ch(self.root, "translateX", self.FLAP, [baseZ, midZ, -midZ, baseZ]),
+            ch(self.root, "translateY", self.QUARTERS,
+               [off, off + q, off + m, off + q3, off]),
+            ch(self.root, "rotateZ", self.FLAP, [baseRX, midRX, -midRX, baseRX]),
+        ]
+
+    def leg_channels(self):
+        ch = self.cycle_channel
         bx = float(self.leg_tx_base); qx = float(self.leg_tx_q); mx = float(self.leg_tx_mid); q3x = float(self.leg_tx_3q)
-        for node, sgn in [(self.leg_l, +1.0), (self.leg_r, -1.0)]:
-            self.set_key(node, "translateX", start,         sgn * bx)
-            self.set_key(node, "translateX", quarter,       sgn * (bx + qx))
-            self.set_key(node, "translateX", mid,           sgn * (bx + mx))
-            self.set_key(node, "translateX", three_quarter, sgn * (bx + q3x))
-            self.set_key(node, "translateX", end,           sgn * bx)
-
         by = float(self.leg_ty_base); qy = float(self.leg_ty_q); my = float(self.leg_ty_mid); q3y = float(self.leg_ty_3q)
-        for node in [self.leg_l, self.leg_r]:
-            self.set_key(node, "translateY", start,         by)
-            self.set_key(node, "translateY", quarter,       by + qy)
-            self.set_key(node, "translateY", mid,           by + my)
-            self.set_key(node, "translateY", three_quarter, by + q3y)
-            self.set_key(node, "translateY", end,           by)
-
         bz = float(self.leg_tz_base); qz = float(self.leg_tz_q); mz = float(self.leg_tz_mid); q3z = float(self.leg_tz_3q)
-        for node in [self.leg_l, self.leg_r]:
-            self.set_key(node, "translateZ", start,         bz)
-            self.set_key(node, "translateZ", quarter,       bz + qz)
-            self.set_key(node, "translateZ", mid,           bz + mz)
-            self.set_key(node, "translateZ", three_quarter, bz + q3z)
-            self.set_key(node, "translateZ", end,           bz)
-
         roff = float(self.leg_rx_off); rq = float(self.leg_rx_q); rm = float(self.leg_rx_mid); r3 = float(self.leg_rx_3q)
+        chs = []
+        for node, sgn in [(self.leg_l, +1.0), (self.leg_r, -1.0)]:
+            chs.append(ch(node, "translateX", self.QUARTERS,
+                          [sgn * bx, sgn * (bx + qx), sgn * (bx + mx),
+                           sgn * (bx + q3x), sgn * bx]))
         for node in [self.leg_l, self.leg_r]:
-            self.set_key(node, "rotateX", start,         roff)
-            self.set_key(node, "rotateX", quarter,       roff + rq)
-            self.set_key(node, "rotateX", mid,           roff + rm)
-            self.set_key(node, "rotateX", three_quarter, roff + r3)
-            self.set_key(node, "rotateX", end,           roff)
-
-    def key_scapula(self):
-        start, quarter, mid, three_quarter, end = self.frames
+            chs.append(ch(node, "translateY", self.QUARTERS,
+                          [by, by + qy, by + my, by + q3y, by]))
+            chs.append(ch(node, "translateZ", self.QUARTERS,
+                          [bz, bz + qz, bz + mz, bz + q3z, bz]))
+            chs.append(ch(node, "rotateX", self.QUARTERS,
+                          [roff, roff + rq, roff + rm, roff + r3, roff]))
+        return chs
+
+    def scapula_channels(self):
+        ch = self.cycle_channel
         rz_off = float(self.scap_rz_off)
         rz_b   = float(self.scap_flap_base)
         rz_m   = float(self.scap_flap_mid)
         rx_off = float(self.scap_rx_off); rx_b = float(self.scap_rx_base); rx_m = float(self.scap_rx_mid)
         ry_off = float(self.scap_ry_off); ry_b = float(self.scap_ry_base); ry_m = float(self.scap_ry_mid)
-
+        chs = []
         for node in [self.scap_l, self.scap_r]:
-            self.set_key(node, "rotateY", start,         rz_off)
-            self.set_key(node, "rotateY", quarter,       rz_off + rz_b)
-            self.set_key(node, "rotateY", three_quarter, rz_off + rz_m)
-            self.set_key(node, "rotateY", end,           rz_off)
-            self.set_key(node, "rotateZ", start,         ry_off)
-            self.set_key(node, "rotateZ", quarter,       ry_off + ry_b)
-            self.set_key(node, "rotateZ", three_quarter, ry_off + ry_m)
-            self.set_key(node, "rotateZ", end,           ry_off)
-            self.set_key(node, "rotateX", start,         rx_off)
-            self.set_key(node, "rotateX", quarter,       rx_off + rx_b)
-            self.set_key(node, "rotateX", three_quarter, rx_off + rx_m)
-            self.set_key(node, "rotateX", end,           rx_off)
-
-    def key_elbow_poles(self):
-        start, quarter, mid, three_quarter, end = self.frames
+            chs.append(ch(node, "rotateY", self.FLAP,
+                          [rz_off, rz_off + rz_b, rz_off + rz_m, rz_off]))
+            chs.append(ch(node, "rotateZ", self.FLAP,
+                          [ry_off, ry_off + ry_b, ry_off + ry_m, ry_off]))
+            chs.append(ch(node, "rotateX", self.FLAP,
+                          [rx_off, rx_off + rx_b, rx_off + rx_m, rx_off]))
+        return chs
+
+    def elbow_pole_channels(self):
+        ch = self.cycle_channel
         offX = float(self.pole_off_x); baseX = float(self.pole_base_x); midX = float(self.pole_mid_x)
         offY = float(self.pole_off_y); baseY = float(self.pole_base_y); midY = float(self.pole_mid_y)
         offZ = float(self.pole_off_z); baseZ = float(self.pole_base_z); midZ = float(self.pole_mid_z)
-
+        chs = []
         for node, sgn in [(self.pole_l, +1.0), (self.pole_r, -1.0)]:
-            self.set_key(node, "translateX", start,         sgn * offX)
-            self.set_key(node, "translateX", quarter,       sgn * (offX + baseX))
-            self.set_key(node, "translateX", three_quarter, sgn * (offX + midX))
-            self.set_key(node, "translateX", end,           sgn * offX)
-            self.set_key(node, "translateY", start,         offY)
-            self.set_key(node, "translateY", quarter,       offY + baseY)
-            self.set_key(node, "translateY", three_quarter, offY + midY)
-            self.set_key(node, "translateY", end,           offY)
-            self.set_key(node, "translateZ", start,         offZ)
-            self.set_key(node, "translateZ", quarter,       offZ + baseZ)
-            self.set_key(node, "translateZ", three_quarter, offZ + midZ)
-            self.set_key(node, "translateZ", end,           offZ)
-
-    def key_fkik_blend(self):
-        start, _, _, _, end = self.frames
+            chs.append(ch(node, "translateX", self.FLAP,
+                          [sgn * offX, sgn * (offX + baseX), sgn * (offX + midX), sgn * offX]))
+            chs.append(ch(node, "translateY", self.FLAP,
+                          [offY, offY + baseY, offY + midY, offY]))
+            chs.append(ch(node, "translateZ", self.FLAP,
+                          [offZ, offZ + baseZ, offZ + midZ, offZ]))
+        return chs
+
+    def build_channels(self):
+        return (self.arm_channels()
+                + self.hand_flap_channels()
+                + self.hand_positioning_channels()
+                + self.root_movement_channels()
+                + self.stretch_bend_posture_channels()
+                + self.leg_channels()
+                + self.scapula_channels()
+                + self.elbow_pole_channels())
+
+    def fkik_state(self):
         val = float(self.fkik_blend_value)
-        for node in [self.fkik_l, self.fkik_r]:
-            self.set_key(node, "FKIKBlend", start, val)
-            self.set_key(node, "FKIKBlend", end,   val)
+        return {self.fkik_l: val, self.fkik_r: val}
 
     def generate(self):
-        self.clear_keys()
-        self.compute_frames()
-        self.key_arms()
-        self.key_hand_flap()
-        self.key_hand_positioning()
-        self.key_root_movement()
-        self.key_stretch_bend_posture()
-        self.key_legs()
-        self.key_scapula()
-        self.key_elbow_poles()
-        self.key_fkik_blend()
-        self.print_settings()
-        try:
-            cmds.inViewMessage(
-                amg='[FlightGenerator] Keys set.',
-                pos='midCenter', fade=True)
-        except Exception:
-            pass
+        with self.generate_pass():
+            self.key_cycle()
+            self.print_settings()
+            try:
+                cmds.inViewMessage(
+                    amg='[FlightGenerator] Keys set.',
+                    pos='midCenter', fade=True)
+            except Exception:
+                pass
 
     # ------------------------------------------------------------------ #
     #  Settings I/O
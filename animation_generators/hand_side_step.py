@@ -41,9 +41,10 @@ class HandSideStepGenerator(AnimGeneratorBase):
     def _dir(self):
         return -1 if self.mirror else 1
 
-    def clear_keys(self):
-        attrs = ['translateX', 'translateY', 'rotateX', 'rotateY', 'rotateZ',
-                 'stretchy', 'FKIKBlend']
+    CLEAR_ATTRS = ['translateX', 'translateY', 'rotateX', 'rotateY', 'rotateZ',
+                   'stretchy', 'FKIKBlend']
+
+    def clear_targets(self, channels):
         controls = [
             self.root, self.hand_r, self.hand_l,
             self.hip, self.spine, self.chest, self.neck, self.head,
@@ -52,67 +53,50 @@ class HandSideStepGenerator(AnimGeneratorBase):
             self.fk_hip_r, self.fk_hip_l, self.fk_knee_r, self.fk_knee_l,
             self.fk_foot_r, self.fk_foot_l, self.fk_toe_r, self.fk_toe_l,
         ]
-        self.clear_keys_on(controls, attrs)
+        targets = super().clear_targets(channels)
+        targets += [(c, a) for c in controls for a in self.CLEAR_ATTRS]
+        return list(dict.fromkeys(targets))
 
-    # ---------- keying ----------
-    def set_leg_fkik_blend_keys(self):
-        start, end = self.frames[0], self.frames[4]
-        for ctrl in (self.fkik_leg_l, self.fkik_leg_r):
-            self.set_key(ctrl, 'FKIKBlend', start, self.leg_fkik_blend)
-            self.set_key(ctrl, 'FKIKBlend', end, self.leg_fkik_blend)
+    # ---------- channels ----------
+    def fkik_state(self):
+        return {self.fkik_leg_l: self.leg_fkik_blend,
+                self.fkik_leg_r: self.leg_fkik_blend}
 
-    def set_leg_fk_pose_keys(self):
-        start, end = self.frames[0], self.frames[4]
+    def leg_fk_pose_channels(self):
         pairs = [
             (self.fk_hip_l, self.fk_hip_r, self.fk_hip_ry),
             (self.fk_knee_l, self.fk_knee_r, self.fk_knee_ry),
             (self.fk_foot_l, self.fk_foot_r, self.fk_foot_ry),
             (self.fk_toe_l, self.fk_toe_r, self.fk_toe_ry),
         ]
-        for L, R, v in pairs:
-            self.set_key(L, 'rotateY', start, v); self.set_key(R, 'rotateY', start, v)
-            self.set_key(L, 'rotateY', end, v); self.set_key(R, 'rotateY', end, v)
+        return [self.cycle_channel(node, 'rotateY', (0.0, 1.0), [v, v])
+                for L, R, v in pairs for node in (L, R)]
 
-    def set_stretch_keys(self):
+    def stretch_channels(self):
         if not self.stretch_arms:
-            return
-        start, end = self.frames[0], self.frames[4]
-        for arm in (self.hand_l, self.hand_r):
-            self.set_key(arm, 'stretchy', start, 10)
-            self.set_key(arm, 'stretchy', end, 10)
+            return []
+        return [self.cycle_channel(arm, 'stretchy', (0.0, 1.0), [10, 10])
+                for arm in (self.hand_l, self.hand_r)]
 
-    def set_hand_keys(self):
-        start, quarter, mid, three_quarter, end = self.frames
+    def hand_channels(self):
+        ch = self.cycle_channel
         d = self._dir()
         step_x = d * self.step_width
         base_y = self.ground_height; lift_y = self.ground_height + self.step_height
         first = self.hand_r if self.mirror else self.hand_l
         second = self.hand_l if self.mirror else self.hand_r
-
-        hr = (self.resolve_node(self.hand_r) or self.hand_r).lower()
-        hl = (self.resolve_node(self.hand_l) or self.hand_l).lower()
-        offR = abs(self.step_narrowness); offL = -abs(self.step_narrowness)
-
-        def x_with_narrow(node, base):
-            ln = (self.resolve_node(node) or node).lower()
-            return base + (offR if ln == hr else offL if ln == hl else 0.0)
-
-        self.set_key(first, 'translateX', start, x_with_narrow(first, 0))
-        self.set_key(first, 'translateY', start, base_y)
-        self.set_key(first, 'translateY', quarter, lift_y)
-        self.set_key(first, 'translateX', mid, x_with_narrow(first, step_x))
-        self.set_key(first, 'translateY', mid, base_y)
-        self.set_key(first, 'translateX', end, x_with_narrow(first, 0))
-        self.set_key(first, 'translateY', end, base_y)
-
-        self.set_key(second, 'translateX', start, x_with_narrow(second, 0))
-        self.set_key(second, 'translateY', start, base_y)
-        self.set_key(second, 'translateX', mid, x_with_narrow(second, 0))
-        self.set_key(second, 'translateY', mid, base_y)
-        self.set_key(second, 'translateY', three_quarter, lift_y)
-        self.set_key(second, 'translateX', three_quarter, x_with_narrow(second, step_x * 0.5))
-        self.set_key(second, 'translateX', end, x_with_narrow(second, 0))
-        self.set_key(second, 'translateY', end, base_y)
+        narrow = {self.hand_r: abs(self.step_narrowness),
+                  self.hand_l: -abs(self.step_narrowness)}
+        nf = narrow.get(first, 0.0); ns = narrow.get(second, 0.0)
+        return [
+            ch(first, 'translateX', self.HALVES, [nf, nf + step_x, nf]),
+            ch(first, 'translateY', (0.0, 0.25, 0.5, 1.0),
+               [base_y, lift_y, base_y, base_y]),
+            ch(second, 'translateX', (0.0, 0.5, 0.75, 1.0),
+               [ns, ns, ns + step_x * 0.5, ns]),
+            ch(second, 'translateY', (0.0, 0.5, 0.75, 1.0),
+               [base_y, base_y, lift_y, base_y]),
+        ]
 
     def clamp_hands_to_ground(self):
         for hand in (self.hand_l, self.hand_r):
@@ -125,62 +109,52 @@ class HandSideStepGenerator(AnimGeneratorBase):
                 if v < self.ground_height:
                     cmds.keyframe(node, at='translateY', e=True, t=(t, t), vc=self.ground_height)
 
-    def set_root_keys(self):
-        start, quarter, mid, three_quarter, end = self.frames
+    def root_channels(self):
+        ch = self.cycle_channel
         d = self._dir(); off = self.root_offset_y
-        self.set_key(self.root, 'translateZ', start, 0)
-        self.set_key(self.root, 'translateZ', mid, d * (self.step_width * 0.5))
-        self.set_key(self.root, 'translateZ', end, 0)
-        self.set_key(self.root, 'rotateY', start, 0)
-        self.set_key(self.root, 'rotateY', quarter, d * self.root_tilt)
-        self.set_key(self.root, 'rotateY', mid, 0)
-        self.set_key(self.root, 'rotateY', three_quarter, -d * self.root_tilt)
-        self.set_key(self.root, 'rotateY', end, 0)
-        for t, v in [(start, off), (quarter, off + self.root_bounce), (mid, off),
-                     (three_quarter, off + self.root_bounce), (end, off)]:
-            self.set_key(self.root, 'translateX', t, v)
-
-    def set_scapula_keys(self):
-        start, mid, end = self.frames[0], self.frames[2], self.frames[4]
+        tilt = d * self.root_tilt; bounce = off + self.root_bounce
+        return [
+            ch(self.root, 'translateZ', self.HALVES, [0, d * (self.step_width * 0.5), 0]),
+            ch(self.root, 'rotateY', self.QUARTERS, [0, tilt, 0, -tilt, 0]),
+            ch(self.root, 'translateX', self.QUARTERS, [off, bounce, off, bounce, off]),
+        ]
+
+    def scapula_channels(self):
+        ch = self.cycle_channel
         d = self._dir(); s = self.scapula_swing * d
         addZ = abs(float(self.down_scapula_z))
         addY = abs(float(self.bent_scapula_y))
         addX = abs(float(self.twist_scapula_x))
+        chs = []
         for node, sign in [(self.scapula_l, +1), (self.scapula_r, -1)]:
-            self.set_key(node, 'rotateZ', start, sign * s + addZ)
-            self.set_key(node, 'rotateZ', mid, -sign * s + addZ)
-            self.set_key(node, 'rotateZ', end, sign * s + addZ)
-            for t in (start, mid, end):
-                self.set_key(node, 'rotateY', t, addY)
-                self.set_key(node, 'rotateX', t, addX)
-
-    def set_sidewhip_keys(self):
-        start, quarter, mid, three_quarter, end = self.frames
+            chs.append(ch(node, 'rotateZ', self.HALVES,
+                          [sign * s + addZ, -sign * s + addZ, sign * s + addZ]))
+            chs.append(ch(node, 'rotateY', self.HALVES, [addY] * 3))
+            chs.append(ch(node, 'rotateX', self.HALVES, [addX] * 3))
+        return chs
+
+    def sidewhip_channels(self):
         d = self._dir()
         # HipSwinger stays world-aligned: rotateY unchanged
-        a = d * self.hip_sway
-        self.set_key(self.hip, 'rotateY', start, 0)
-        self.set_key(self.hip, 'rotateY', quarter, a)
-        self.set_key(self.hip, 'rotateY', mid, 0)
-        self.set_key(self.hip, 'rotateY', three_quarter, -a)
-        self.set_key(self.hip, 'rotateY', end, 0)
         # Spine/chest/neck/head FK: sway = lateral lean = rotateY
-        for ctrl, amount in [(self.spine, self.spine_sway),
+        chs = []
+        for ctrl, amount in [(self.hip, self.hip_sway), (self.spine, self.spine_sway),
                              (self.chest, self.chest_sway), (self.neck, self.neck_sway),
                              (self.head, self.head_sway)]:
             a = d * amount
-            self.set_key(ctrl, 'rotateY', start, 0)
-            self.set_key(ctrl, 'rotateY', quarter, a)
-            self.set_key(ctrl, 'rotateY', mid, 0)
-            self.set_key(ctrl, 'rotateY', three_quarter, -a)
-            self.set_key(ctrl, 'rotateY', end, 0)
+            chs.append(self.cycle_channel(ctrl, 'rotateY', self.QUARTERS,
+                                          [0, a, 0, -a, 0]))
+        return chs
+
+    def build_channels(self):
+        return (self.leg_fk_pose_channels() + self.hand_channels()
+                + self.root_channels() + self.scapula_channels()
+                + self.sidewhip_channels() + self.stretch_channels())
 
     def generate(self):
-        self.clear_keys(); self.compute_frames()
-        self.set_leg_fkik_blend_keys(); self.set_leg_fk_pose_keys()
-        self.set_hand_keys(); self.set_root_keys()
-        self.set_scapula_keys(); self.set_sidewhip_keys()
-        self.clamp_hands_to_ground(); self.set_stretch_keys()
+        with self.generate_pass():
+            self.key_cycle()
+            self.clamp_hands_to_ground()
 
     # ---------- settings ----------
     def _get_settings_dict(self):
@@ -53,8 +53,7 @@ class HandWalkCycleTool(AnimGeneratorBase):
         self.chest_params = {'swing_rz': 6.0, 'rock_ry': 4.0, 'sway_rx': 4.0, 'offsetY': 0.0}
         self.legs_fk_params = {'fkik_blend': 0.0, 'hip_ry': 0.0, 'knee_ry': 0.0, 'foot_ry': 0.0, 'toe_ry': 0.0}
         self.fkik_nodes = {'right': 'FKIKLeg_R', 'left': 'FKIKLeg_L'}
-        self.frames_stride_halved = []
-        self.quarter = 0; self.three_quarter = 0
+        self.spine_ctrl = None
 
     # ---------- helpers ----------
     @staticmethod
@@ -64,250 +63,170 @@ class HandWalkCycleTool(AnimGeneratorBase):
                 return n
         return None
 
-    def compute_frame_data(self):
-        start, end = self.timeline_range()
-        mid = (start + end) / 2.0
-        self.quarter = (start + mid) / 2.0
-        self.three_quarter = (mid + end) / 2.0
-        self.frames_stride_halved = [
-            (start,  self.stride / 2.0, -self.stride / 2.0),
-            (mid,   -self.stride / 2.0,  self.stride / 2.0),
-            (end,    self.stride / 2.0, -self.stride / 2.0),
-        ]
-
-    def apply_keyframe_pattern(self, obj_attr, values_per_frame):
-        obj, attr = obj_attr
-        for (t, *_), v in zip(self.frames_stride_halved, values_per_frame):
-            self.set_key(obj, attr, t, v)
-
     # ---------- clear ----------
-    def clear_keys(self):
-        start, end = self.timeline_range()
-        trs_attrs = ['translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ', 'stretchy']
-        controls = []
-        controls += [n for n in self.stride_limbs.values() if cmds.objExists(n)]
-        controls += [n for n in self.feet.values() if cmds.objExists(n)]
-        controls += [n for n in [self.root_ctrl, self.hip_ctrl] if cmds.objExists(n)]
-        controls += [n for n in self.scapula_ctrls.values() if cmds.objExists(n)]
-        controls += [n for n in self.head_ctrls.values() if cmds.objExists(n)]
-        controls += [n for n in self.elbow_ctrls.values() if cmds.objExists(n)]
-        spine = self.resolve_first_existing(self.spine_ctrl_candidates)
-        if spine:
-            controls.append(spine)
-        if cmds.objExists(self.chest_ctrl):
-            controls.append(self.chest_ctrl)
-        fk_leg_nodes = ['FKHip_R', 'FKHip_L', 'FKKnee_R', 'FKKnee_L',
-                        'FKFoot_R', 'FKFoot_L', 'FKToe_R', 'FKToe_L']
-        controls += [n for n in fk_leg_nodes if cmds.objExists(n)]
-        for ctrl in controls:
-            for attr in trs_attrs:
-                if cmds.attributeQuery(attr, node=ctrl, exists=True):
-                    try:
-                        if not cmds.getAttr(f"{ctrl}.{attr}", lock=True):
-                            cmds.setAttr(f"{ctrl}.{attr}", 0)
-                        cmds.cutKey(ctrl, at=attr, time=(start, end))
-                    except Exception:
-                        pass
-        for node in self.fkik_nodes.values():
-            if node and cmds.objExists(node) and cmds.attributeQuery('FKIKBlend', node=node, exists=True):
-                try:
-                    cmds.cutKey(node, at='FKIKBlend', time=(start, end))
-                except Exception:
-                    pass
+    CLEAR_ATTRS = ['translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ', 'stretchy']
+    FK_LEG_NODES = ['FKHip_R', 'FKHip_L', 'FKKnee_R', 'FKKnee_L',
+                    'FKFoot_R', 'FKFoot_L', 'FKToe_R', 'FKToe_L']
 
-    # ---------- keying ----------
-    def set_stride_keys(self):
+    def clear_targets(self, channels):
+        controls = []
+        controls += list(self.stride_limbs.values())
+        controls += list(self.feet.values())
+        controls += [self.root_ctrl, self.hip_ctrl]
+        controls += list(self.scapula_ctrls.values())
+        controls += list(self.head_ctrls.values())
+        controls += list(self.elbow_ctrls.values())
+        if self.spine_ctrl:
+            controls.append(self.spine_ctrl)
+        controls.append(self.chest_ctrl)
+        controls += self.FK_LEG_NODES
+        targets = super().clear_targets(channels)
+        targets += [(c, a) for c in controls if c for a in self.CLEAR_ATTRS]
+        return list(dict.fromkeys(targets))
+
+    # ---------- channels ----------
+    def stride_channels(self):
+        ch = self.cycle_channel
         r = self.stride_limbs['right']; l = self.stride_limbs['left']
-        start, mid, end = [f[0] for f in self.frames_stride_halved]
-        q = self.quarter; tq = self.three_quarter
-        rz = [f[1] for f in self.frames_stride_halved]
-        lz = [f[2] for f in self.frames_stride_halved]
-        for (t, vr, vl) in zip([start, mid, end], rz, lz):
-            self.set_key(r, 'translateZ', t, vr + self.hand_offsets['offset_z'])
-            self.set_key(l, 'translateZ', t, vl + self.hand_offsets['offset_z'])
+        half = self.stride / 2.0; oz = self.hand_offsets['offset_z']
         base = float(self.stride_width); ox = float(self.hand_offsets['offset_x'])
-        self.set_key(r, 'translateX', start, base); self.set_key(r, 'translateX', q, base + ox)
-        self.set_key(r, 'translateX', mid, base); self.set_key(r, 'translateX', end, base)
-        self.set_key(l, 'translateX', start, -base); self.set_key(l, 'translateX', mid, -base)
-        self.set_key(l, 'translateX', tq, -base - ox); self.set_key(l, 'translateX', end, -base)
         gh = float(self.groundHeight); oy = float(self.hand_offsets['offset_y'])
-        self.set_key(r, 'translateY', start, gh); self.set_key(r, 'translateY', q, oy)
-        self.set_key(r, 'translateY', mid, gh); self.set_key(r, 'translateY', tq, gh)
-        self.set_key(r, 'translateY', end, gh)
-        self.set_key(l, 'translateY', start, gh); self.set_key(l, 'translateY', q, gh)
-        self.set_key(l, 'translateY', mid, gh); self.set_key(l, 'translateY', tq, oy)
-        self.set_key(l, 'translateY', end, gh)
-        for t in [start, mid, end]:
-            self.set_key(r, 'rotateY', t, self.hand_offsets['rotation_y'])
-            self.set_key(l, 'rotateY', t, -self.hand_offsets['rotation_y'])
-
-    def set_arm_stretch_keys(self):
-        start, end = self.timeline_range()
+        ry = self.hand_offsets['rotation_y']
+        return [
+            ch(r, 'translateZ', self.HALVES, [half + oz, -half + oz, half + oz]),
+            ch(l, 'translateZ', self.HALVES, [-half + oz, half + oz, -half + oz]),
+            ch(r, 'translateX', (0.0, 0.25, 0.5, 1.0), [base, base + ox, base, base]),
+            ch(l, 'translateX', (0.0, 0.5, 0.75, 1.0), [-base, -base, -base - ox, -base]),
+            ch(r, 'translateY', self.QUARTERS, [gh, oy, gh, gh, gh]),
+            ch(l, 'translateY', self.QUARTERS, [gh, gh, gh, oy, gh]),
+            ch(r, 'rotateY', self.HALVES, [ry] * 3),
+            ch(l, 'rotateY', self.HALVES, [-ry] * 3),
+        ]
+
+    def arm_stretch_channels(self):
         val = float(self.stretch_arms)
-        for node in self.stride_limbs.values():
-            if node and cmds.objExists(node) and cmds.attributeQuery('stretchy', node=node, exists=True):
-                self.set_key(node, 'stretchy', start, val)
-                self.set_key(node, 'stretchy', end, val)
+        return [self.cycle_channel(node, 'stretchy', (0.0, 1.0), [val, val])
+                for node in self.stride_limbs.values() if node]
+
+    def root_values(self):
+        """``{attr: [value per QUARTERS key]}`` of the root bounce / rock.
 
-    def set_root_keys(self):
+        Shared by the root channels and the feet that follow the root.
+        """
+        p = self.root_params
+        bz = p.get('bounce_z', 0.0); oz = p['offset_z']
+        return {
+            'translateX': [s * p['bounce'] + p['offset_y'] for s in (1, -1, 1, -1, 1)],
+            'rotateZ': [s * p['rock'] + p['offset_rx'] for s in (1, -1, 1, -1, 1)],
+            'translateY': [oz, oz + bz, oz, oz + bz, oz],
+        }
+
+    def root_channels(self):
+        ch = self.cycle_channel
         root = self.root_ctrl
-        start, mid, end = [f[0] for f in self.frames_stride_halved]
-        q = self.quarter; tq = self.three_quarter
         p = self.root_params
-        for attr, amp, off in [('translateX', p['bounce'], p['offset_y']),
-                               ('rotateZ', p['rock'], p['offset_rx'])]:
-            for t, sign in zip([start, q, mid, tq, end], [1, -1, 1, -1, 1]):
-                self.set_key(root, attr, t, sign * amp + off)
-        self.set_key(root, 'rotateY', start, p['sway'])
-        self.set_key(root, 'rotateY', mid, -p['sway'])
-        self.set_key(root, 'rotateY', end, p['sway'])
+        chs = [ch(root, attr, self.QUARTERS, vals)
+               for attr, vals in self.root_values().items()]
+        chs.append(ch(root, 'rotateY', self.HALVES, self.pattern_thirds(p['sway'])))
         for attr, amp in [('translateZ', p['shift_x']), ('rotateX', p['swing_z'])]:
-            self.set_key(root, attr, start, amp)
-            self.set_key(root, attr, mid, -amp)
-            self.set_key(root, attr, end, amp)
-        bz = p.get('bounce_z', 0.0); oz = p['offset_z']
-        self.set_key(root, 'translateY', start, oz)
-        self.set_key(root, 'translateY', q, oz + bz)
-        self.set_key(root, 'translateY', mid, oz)
-        self.set_key(root, 'translateY', tq, oz + bz)
-        self.set_key(root, 'translateY', end, oz)
-
-    def set_spine_chest_keys(self):
-        start, mid, end = [f[0] for f in self.frames_stride_halved]
-        t3 = [start, mid, end]
-        t5 = [start, self.quarter, mid, self.three_quarter, end]
-        def apply_joint(ctrl, p):
-            if not ctrl:
-                return
-            rz = self.pattern_thirds(p['swing_rz'])
-            rx = self.pattern_thirds(p['sway_rx'])
-            ry = self.pattern_fifths(p['rock_ry'])
+            chs.append(ch(root, attr, self.HALVES, self.pattern_thirds(amp)))
+        return chs
+
+    def spine_chest_channels(self):
+        ch = self.cycle_channel
+
+        def joint(ctrl, p):
             offY = float(p.get('offsetY', 0.0))
-            for t, v in zip(t3, rz):
-                self.set_key(ctrl, 'rotateZ', t, v)
-            for t, v in zip(t5, ry):
-                self.set_key(ctrl, 'rotateY', t, v + offY)
-            for t, v in zip(t3, rx):
-                self.set_key(ctrl, 'rotateX', t, v)
-        spine = self.resolve_first_existing(self.spine_ctrl_candidates)
-        chest = self.chest_ctrl if cmds.objExists(self.chest_ctrl) else None
-        apply_joint(spine, self.spine_params)
-        apply_joint(chest, self.chest_params)
-
-    def set_hip_keys(self):
-        self.apply_keyframe_pattern((self.hip_ctrl, 'rotateZ'),
-                                    [self.hip_params['swing'], -self.hip_params['swing'], self.hip_params['swing']])
-        self.apply_keyframe_pattern((self.hip_ctrl, 'rotateY'),
-                                    [self.hip_params['sway'], -self.hip_params['sway'], self.hip_params['sway']])
-
-    def set_feet_follow_keys(self):
+            return [
+                ch(ctrl, 'rotateZ', self.HALVES, self.pattern_thirds(p['swing_rz'])),
+                ch(ctrl, 'rotateY', self.QUARTERS,
+                   [v + offY for v in self.pattern_fifths(p['rock_ry'])]),
+                ch(ctrl, 'rotateX', self.HALVES, self.pattern_thirds(p['sway_rx'])),
+            ]
+
+        chs = []
+        if self.spine_ctrl:
+            chs += joint(self.spine_ctrl, self.spine_params)
+        chs += joint(self.chest_ctrl, self.chest_params)
+        return chs
+
+    def hip_channels(self):
+        return [self.cycle_channel(self.hip_ctrl, 'rotateZ', self.HALVES,
+                                   self.pattern_thirds(self.hip_params['swing'])),
+                self.cycle_channel(self.hip_ctrl, 'rotateY', self.HALVES,
+                                   self.pattern_thirds(self.hip_params['sway']))]
+
+    def feet_follow_channels(self):
+        ch = self.cycle_channel
         right = self.feet['right']; left = self.feet['left']
-        start, mid, end = [f[0] for f in self.frames_stride_halved]
-        q = self.quarter; tq = self.three_quarter; times = [start, q, mid, tq, end]
         ff = self.feet_follow
         blend = float(ff['moveFeetWithRoot']); off_x = float(ff['offset_x'])
         off_y = float(ff['offset_y']); off_z = float(ff['offset_z'])
         rot_x = float(ff['rotate_x']); bounce = float(ff.get('bounce_y', 0.0))
         swing = float(ff.get('swing_x', 0.0)); back_f = float(ff.get('back_forth_z', 0.0))
 
-        def root_val(attr, t):
-            try:
-                return cmds.getAttr(f"{self.root_ctrl}.{attr}", time=t) if cmds.objExists(self.root_ctrl) else 0.0
-            except Exception:
-                return 0.0
-
-        def add_tx(t):
-            return swing if (t == start or t == end) else (-swing if t == mid else 0.0)
-        def add_ty(t):
-            return bounce if (t == q or t == tq) else 0.0
-        def add_tz(t):
-            return back_f if (t == q or t == tq) else 0.0
-
-        for t in times:
-            baseY = root_val('translateX', t) * blend + off_y
-            baseZ = root_val('translateY', t) * blend + off_z
-            baseRX = root_val('rotateZ', t) * blend + rot_x
-            ax = add_tx(t); ay = add_ty(t); az = add_tz(t)
-            self.set_key(right, 'translateX', t, off_x + ax)
-            self.set_key(right, 'translateY', t, baseY + ay)
-            self.set_key(right, 'translateZ', t, baseZ + az)
-            self.set_key(right, 'rotateX', t, baseRX)
-            self.set_key(left, 'translateX', t, -off_x + ax)
-            self.set_key(left, 'translateY', t, baseY + ay)
-            self.set_key(left, 'translateZ', t, baseZ + az)
-            self.set_key(left, 'rotateX', t, baseRX)
-
-    def set_scapula_keys(self):
-        times = [f[0] for f in self.frames_stride_halved]
+        # the feet follow the root keys at the same QUARTERS positions
+        root = self.root_values()
+        ax = [swing, 0.0, -swing, 0.0, swing]
+        ty = [v * blend + off_y + a for v, a in zip(root['translateX'], [0.0, bounce, 0.0, bounce, 0.0])]
+        tz = [v * blend + off_z + a for v, a in zip(root['translateY'], [0.0, back_f, 0.0, back_f, 0.0])]
+        rx = [v * blend + rot_x for v in root['rotateZ']]
+        chs = []
+        for foot, side_x in [(right, off_x), (left, -off_x)]:
+            chs.append(ch(foot, 'translateX', self.QUARTERS, [side_x + a for a in ax]))
+            chs.append(ch(foot, 'translateY', self.QUARTERS, ty))
+            chs.append(ch(foot, 'translateZ', self.QUARTERS, tz))
+            chs.append(ch(foot, 'rotateX', self.QUARTERS, rx))
+        return chs
+
+    def scapula_channels(self):
+        ch = self.cycle_channel
         sp = self.scapula_params
         offY = float(sp.get('offsetY', 0.0)); offX = float(sp.get('offsetX', 0.0))
         offZ = float(sp.get('offsetZ', 0.0))
+        chs = []
         for side in ['left', 'right']:
             ctrl = self.scapula_ctrls[side]; sign = 1 if side == 'left' else -1
-            y_vals = [sign * sp['rotateY'], -sign * sp['rotateY'], sign * sp['rotateY']]
-            x_vals = [sp['rotateX'], -sp['rotateX'], sp['rotateX']]
-            z_vals = [sign * sp['rotateZ'], -sign * sp['rotateZ'], sign * sp['rotateZ']]
-            for t, y, x, z in zip(times, y_vals, x_vals, z_vals):
-                self.set_key(ctrl, 'rotateY', t, y + offY)
-                self.set_key(ctrl, 'rotateX', t, x + offX)
-                self.set_key(ctrl, 'rotateZ', t, z + offZ)
-
-    def set_head_and_neck_keys(self):
-        start, mid, end = [f[0] for f in self.frames_stride_halved]
-        t3 = [start, mid, end]; t5 = [start, self.quarter, mid, self.three_quarter, end]
-        def apply_joint(ctrl, p):
-            rz = self.pattern_thirds(p['counter_rotateZ'])
-            rx = self.pattern_thirds(p['counter_rotateX'])
-            ry = self.pattern_fifths(p['counter_rotateY'])
+            chs.append(ch(ctrl, 'rotateY', self.HALVES,
+                          [v + offY for v in self.pattern_thirds(sign * sp['rotateY'])]))
+            chs.append(ch(ctrl, 'rotateX', self.HALVES,
+                          [v + offX for v in self.pattern_thirds(sp['rotateX'])]))
+            chs.append(ch(ctrl, 'rotateZ', self.HALVES,
+                          [v + offZ for v in self.pattern_thirds(sign * sp['rotateZ'])]))
+        return chs
+
+    def head_and_neck_channels(self):
+        ch = self.cycle_channel
+
+        def joint(ctrl, p):
             offY = float(p.get('offsetY', 0.0))
-            for t, v in zip(t3, rz):
-                self.set_key(ctrl, 'rotateZ', t, v)
-            for t, v in zip(t3, rx):
-                self.set_key(ctrl, 'rotateX', t, v)
-            for t, v in zip(t5, ry):
-                self.set_key(ctrl, 'rotateY', t, v + offY)
-            tx = self.pattern_fifths(p['bounce_tx']); ty = self.pattern_fifths(p['bob_ty'])
-            tz = self.pattern_thirds(p['sway_tz'])
-            for t, v in zip(t5, tx):
-                self.set_key(ctrl, 'translateX', t, v)
-            for t, v in zip(t5, ty):
-                self.set_key(ctrl, 'translateY', t, v)
-            for t, v in zip(t3, tz):
-                self.set_key(ctrl, 'translateZ', t, v)
-        if cmds.objExists(self.head_ctrls['neck']):
-            apply_joint(self.head_ctrls['neck'], self.neck_params)
-        if cmds.objExists(self.head_ctrls['head']):
-            apply_joint(self.head_ctrls['head'], self.head_params)
-
-    def set_legs_fk_keys_and_blend(self):
-        start, end = self.timeline_range()
+            return [
+                ch(ctrl, 'rotateZ', self.HALVES, self.pattern_thirds(p['counter_rotateZ'])),
+                ch(ctrl, 'rotateX', self.HALVES, self.pattern_thirds(p['counter_rotateX'])),
+                ch(ctrl, 'rotateY', self.QUARTERS,
+                   [v + offY for v in self.pattern_fifths(p['counter_rotateY'])]),
+                ch(ctrl, 'translateX', self.QUARTERS, self.pattern_fifths(p['bounce_tx'])),
+                ch(ctrl, 'translateY', self.QUARTERS, self.pattern_fifths(p['bob_ty'])),
+                ch(ctrl, 'translateZ', self.HALVES, self.pattern_thirds(p['sway_tz'])),
+            ]
+
+        return (joint(self.head_ctrls['neck'], self.neck_params)
+                + joint(self.head_ctrls['head'], self.head_params))
+
+    def fkik_state(self):
         blend = max(0.0, min(10.0, float(self.legs_fk_params['fkik_blend'])))
-        for side in ['right', 'left']:
-            node = self.fkik_nodes.get(side)
-            if node and cmds.objExists(node) and cmds.attributeQuery('FKIKBlend', node=node, exists=True):
-                for t in (start, end):
-                    try:
-                        self.set_key(node, 'FKIKBlend', t, blend)
-                    except Exception:
-                        pass
+        return {node: blend for node in self.fkik_nodes.values() if node}
+
+    def legs_fk_channels(self):
         pairs = [('FKHip_R', 'FKHip_L', self.legs_fk_params['hip_ry']),
                  ('FKKnee_R', 'FKKnee_L', self.legs_fk_params['knee_ry']),
                  ('FKFoot_R', 'FKFoot_L', self.legs_fk_params['foot_ry']),
                  ('FKToe_R', 'FKToe_L', self.legs_fk_params['toe_ry'])]
-        for r_n, l_n, val in pairs:
-            for node in (r_n, l_n):
-                if cmds.objExists(node) and cmds.attributeQuery('rotateY', node=node, exists=True):
-                    for t in (start, end):
-                        try:
-                            self.set_key(node, 'rotateY', t, float(val))
-                        except Exception:
-                            pass
-
-    def set_elbow_pole_keys(self):
-        if not self.frames_stride_halved:
-            return
-        start, mid, end = [f[0] for f in self.frames_stride_halved]
-        q = self.quarter; tq = self.three_quarter; times = [start, q, mid, tq, end]
+        return [self.cycle_channel(node, 'rotateY', (0.0, 1.0), [val, val])
+                for r_n, l_n, val in pairs for node in (r_n, l_n)]
+
+    def elbow_pole_channels(self):
+        ch = self.cycle_channel
         r_ctrl = self.elbow_ctrls.get('right'); l_ctrl = self.elbow_ctrls.get('left')
         out = float(self.elbow_params.get('out', 0.0))
         up = float(self.elbow_params.get('up', 0.0))
@@ -321,16 +240,21 @@ class HandWalkCycleTool(AnimGeneratorBase):
         lx = [l_off['x'], l_off['x'], l_off['x'], l_off['x'] - out, l_off['x']]
         ly = [l_off['y'], l_off['y'], l_off['y'], l_off['y'] + up, l_off['y']]
         lz = [l_off['z'], l_off['z'], l_off['z'], l_off['z'] + fwd, l_off['z']]
-        if r_ctrl and cmds.objExists(r_ctrl):
-            for t, vx, vy, vz in zip(times, rx, ry, rz):
-                self.set_key(r_ctrl, 'translateX', t, vx)
-                self.set_key(r_ctrl, 'translateY', t, vy)
-                self.set_key(r_ctrl, 'translateZ', t, vz)
-        if l_ctrl and cmds.objExists(l_ctrl):
-            for t, vx, vy, vz in zip(times, lx, ly, lz):
-                self.set_key(l_ctrl, 'translateX', t, vx)
-                self.set_key(l_ctrl, 'translateY', t, vy)
-                self.set_key(l_ctrl, 'translateZ', t, vz)
+        chs = []
+        for ctrl, vx, vy, vz in [(r_ctrl, rx, ry, rz), (l_ctrl, lx, ly, lz)]:
+            if not ctrl:
+                continue
+            chs.append(ch(ctrl, 'translateX', self.QUARTERS, vx))
+            chs.append(ch(ctrl, 'translateY', self.QUARTERS, vy))
+            chs.append(ch(ctrl, 'translateZ', self.QUARTERS, vz))
+        return chs
+
+    def build_channels(self):
+        return (self.stride_channels() + self.root_channels()
+                + self.spine_chest_channels() + self.hip_channels()
+                + self.feet_follow_channels() + self.scapula_channels()
+                + self.head_and_neck_channels() + self.legs_fk_channels()
+                + self.elbow_pole_channels() + self.arm_stretch_channels())
 
     def clamp_hands_ty_two_stage_ground(self):
         start, end = self.timeline_range()
@@ -369,17 +293,12 @@ class HandWalkCycleTool(AnimGeneratorBase):
     # ---------- generate ----------
     def create_walk_cycle(self, *args):
         self._read_ui()
-        original_time = cmds.currentTime(query=True)
-        self.clear_keys(); self.compute_frame_data()
-        self.set_stride_keys(); self.set_root_keys()
-        self.set_spine_chest_keys(); self.set_hip_keys()
-        self.set_feet_follow_keys(); self.set_scapula_keys()
-        self.set_head_and_neck_keys(); self.set_legs_fk_keys_and_blend()
-        self.set_elbow_pole_keys(); self.set_arm_stretch_keys()
-        if self.clamp_hands_to_ground:
-            self.clamp_hands_ty_two_stage_ground()
-        self.stretch_arms = cmds.floatSlider(self.stretch_slider, q=True, value=True)
-        cmds.currentTime(original_time, edit=True)
+        self.spine_ctrl = self.resolve_first_existing(self.spine_ctrl_candidates)
+        with self.generate_pass():
+            self.key_cycle()
+            if self.clamp_hands_to_ground:
+                self.clamp_hands_ty_two_stage_ground()
+            self.stretch_arms = cmds.floatSlider(self.stretch_slider, q=True, value=True)
 
     def _read_ui(self):
         self.stride = cmds.floatField(self.stride_field, q=True, v=True)
@@ -50,14 +50,16 @@ class RunCycleGenerator(AnimGeneratorBase):
 
     # ---------- resolver ----------
     def resolve(self, name):
-        all_nodes = cmds.ls(type='transform')
+        node = self.resolve_node(name)   # shared cached scene map
         name_lower = name.lower()
-        for node in all_nodes:
-            if node.lower() == name_lower:
-                return node
+        # exact matches win, then the explicit aliases, then fuzzy ones
+        if node and node.rpartition('|')[2].lower() == name_lower:
+            return node
         alias = self.alias_map.get(name_lower)
         if alias and cmds.objExists(alias):
             return alias
+        if node:
+            return node
         m = re.match(r"^(.+?)(?:1)?(_[A-Za-z0-9]+)$", name)
         if m:
             base, suffix = m.group(1), m.group(2)
@@ -239,20 +241,21 @@ class RunCycleGenerator(AnimGeneratorBase):
 
     # ---------- generate ----------
     def generate(self):
-        self.clear_keys(); self.compute_frames()
-        self.root_ctrl = self.resolve(self.root_ctrl)
-        self.leg_r = self.resolve(self.leg_r); self.leg_l = self.resolve(self.leg_l)
-        self.chest_ctrl = self.resolve(self.chest_ctrl)
-        self.hip_ctrl = self.resolve(self.hip_ctrl)
-        self.head_ctrl = self.resolve(self.head_ctrl)
-        self.neck_ctrl = self.resolve(self.neck_ctrl)
-        self.spine_ctrl = self.resolve(self.spine_ctrl)
-        for k in self.arm_ctrls:
-            self.arm_ctrls[k] = self.resolve(self.arm_ctrls[k])
-        self.set_root_keys(); self.set_leg_keys()
-        self.set_chest_keys(); self.set_spine_keys()
-        self.set_hip_keys(); self.set_arm_keys()
-        self.set_head_keys(); self.set_neck_keys()
+        with self.generate_pass():
+            self.clear_keys(); self.compute_frames()
+            self.root_ctrl = self.resolve(self.root_ctrl)
+            self.leg_r = self.resolve(self.leg_r); self.leg_l = self.resolve(self.leg_l)
+            self.chest_ctrl = self.resolve(self.chest_ctrl)
+            self.hip_ctrl = self.resolve(self.hip_ctrl)
+            self.head_ctrl = self.resolve(self.head_ctrl)
+            self.neck_ctrl = self.resolve(self.neck_ctrl)
+            self.spine_ctrl = self.resolve(self.spine_ctrl)
+            for k in self.arm_ctrls:
+                self.arm_ctrls[k] = self.resolve(self.arm_ctrls[k])
+            self.set_root_keys(); self.set_leg_keys()
+            self.set_chest_keys(); self.set_spine_keys()
+            self.set_hip_keys(); self.set_arm_keys()
+            self.set_head_keys(); self.set_neck_keys()
 
     # ---------- settings ----------
     def _sanitize_json(self, text):
@@ -132,10 +132,11 @@ class SideStepGenerator(AnimGeneratorBase):
             self.set_key(ctrl, 'rotateY', end, 0)
 
     def generate(self):
-        self.clear_keys(); self.compute_frames()
-        self.set_leg_keys(); self.set_root_keys()
-        self.set_scapula_keys(); self.set_shoulder_elbow_keys()
-        self.set_sidewhip_keys()
+        with self.generate_pass():
+            self.clear_keys(); self.compute_frames()
+            self.set_leg_keys(); self.set_root_keys()
+            self.set_scapula_keys(); self.set_shoulder_elbow_keys()
+            self.set_sidewhip_keys()
 
     def _get_settings_dict(self):
         return {k: getattr(self, k) for k in [
@@ -1,6 +1,12 @@
 import re
 import json
+from dataclasses import replace
+
 import maya.cmds as cmds
+from anim_gen_v2.core import chain
+from anim_gen_v2.core.channel import Channel
+from anim_gen_v2.core.patterns import Wave
+
 from .base import AnimGeneratorBase
 
 
@@ -9,6 +15,8 @@ class TailWiggleGenerator(AnimGeneratorBase):
     WINDOW_TITLE = "Tail Swing & Wiggle"
     CHAIN_INPUT = "twg_baseInput"
     ROWS_PARENT = "twg_rowsParent"
+    # chains longer than this get the compact falloff panel instead of rows
+    LONG_CHAIN = 12
 
     def __init__(self):
         super().__init__()
@@ -16,6 +24,14 @@ class TailWiggleGenerator(AnimGeneratorBase):
         self.mirror_y = False
         self.mirror_z = False
         self.node_rows = []
+        self.rows = []      # row values read from the UI by animate()
+        # compact (long chain) mode
+        self.chain = []
+        self.chain_profile = chain.DEFAULT_PROFILE
+        self.chain_axes = {attr: chain.ChainAxis() for attr in chain.AXES}
+        self.chain_axes['rotateY'] = chain.ChainAxis(amplitude=25.0, lag=0.05)
+        self.profile_ctrl = None
+        self.axis_fields = {}
 
     # ---------- chain detection ----------
     @staticmethod
@@ -27,23 +43,45 @@ class TailWiggleGenerator(AnimGeneratorBase):
         return m.group(1), int(m.group(2)), m.group(3)
 
     def find_chain(self, seed_name):
+        """Nodes ``<prefix><N><suffix>`` counting up from *seed_name*.
+
+        Matched against one ``ls`` of the seed's DAG hierarchy (and one
+        name-pattern ``ls`` if the chain isn't parented under the seed)
+        instead of one ``objExists`` probe per index.
+        """
         parsed = self.parse_base(seed_name)
         if not parsed:
             return []
         prefix, start_idx, suffix = parsed
-        found = []
-        i = start_idx
-        while True:
-            name = f"{prefix}{i}{suffix}"
-            if cmds.objExists(name):
-                found.append(name)
-                i += 1
-            else:
-                break
+        pattern = re.compile(r'^{}(\d+){}$'.format(re.escape(prefix), re.escape(suffix)))
+        found = self._chain_run(cmds.ls(seed_name, dag=True, type="transform") or [],
+                                pattern, start_idx)
+        if len(found) < 2:
+            found = self._chain_run(cmds.ls(f"{prefix}*{suffix}", type="transform") or [],
+                                    pattern, start_idx)
         if not found:
             cmds.warning("No nodes found from seed.")
         return found
 
+    @staticmethod
+    def _chain_run(names, pattern, start_idx):
+        """Consecutively numbered *names* matching *pattern* from *start_idx*."""
+        by_index = {}
+        for n in names:
+            m = pattern.match(n.rpartition("|")[2])
+            if m:
+                by_index.setdefault(int(m.group(1)), n)
+        found = []
+        i = start_idx
+        while i in by_index:
+            found.append(by_index[i])
+            i += 1
+        return found
+
+    def chain_nodes(self):
+        """Nodes being animated (compact chain or UI rows)."""
+        return list(self.chain) or [nr["name"] for nr in self.node_rows]
+
     # ---------- UI ----------
     def show(self):
         if cmds.window(self.WINDOW_NAME, exists=True):
@@ -100,14 +138,20 @@ class TailWiggleGenerator(AnimGeneratorBase):
             for c in cmds.layout(self.ROWS_PARENT, q=True, ca=True):
                 cmds.deleteUI(c)
         self.node_rows = []
+        self.chain = []
+        self.profile_ctrl = None
+        self.axis_fields = {}
 
     def populate_rows(self):
         self.clear_rows()
         seed = cmds.textField(self.CHAIN_INPUT, q=True, tx=True).strip()
-        chain = self.find_chain(seed)
-        if not chain:
+        nodes = self.find_chain(seed)
+        if not nodes:
+            return
+        if len(nodes) > self.LONG_CHAIN:
+            self.build_chain_panel(nodes)
             return
-        for node in chain:
+        for node in nodes:
             self.add_row(node, 0.0, 25.0, 0.0,
                          True, True, True, False, False, False,
                          off_x=0.0, off_y=0.0, off_z=0.0)
@@ -140,13 +184,55 @@ class TailWiggleGenerator(AnimGeneratorBase):
             "xSine": x_sine_cb, "ySine": y_sine_cb, "zSine": z_sine_cb,
         })
 
+    def build_chain_panel(self, nodes, profile=None, axes=None):
+        """Compact panel for a long chain: one falloff curve plus one
+        amplitude / offset / lag row per axis instead of a row per joint."""
+        self.chain = list(nodes)
+        if profile is not None:
+            self.chain_profile = profile
+        if axes:
+            self.chain_axes.update(axes)
+        col = cmds.columnLayout(adj=True, rs=4, parent=self.ROWS_PARENT)
+        cmds.text(l=f"{len(nodes)} joints: {nodes[0]} ... {nodes[-1]}", al="left")
+        cmds.text(l="Amplitude falloff (root -> tip):", al="left")
+        self.profile_ctrl = cmds.gradientControlNoAttr(h=90, asString=self.chain_profile)
+        cmds.rowLayout(nc=5, adj=1)
+        for lbl in ["Axis", "Amp", "Offset", "Lag/Joint", "Cycles"]:
+            cmds.text(l=lbl, al="left")
+        cmds.setParent("..")
+        self.axis_fields = {}
+        for attr, color in zip(chain.AXES, (self.COLOR_X, self.COLOR_Y, self.COLOR_Z)):
+            axis = self.chain_axes[attr]
+            cmds.rowLayout(nc=5, adj=1)
+            cmds.text(l=attr, al="left")
+            self.axis_fields[attr] = (
+                cmds.floatField(v=axis.amplitude, pre=2, minValue=-1e6, maxValue=1e6, bgc=color),
+                cmds.floatField(v=axis.offset, pre=2, minValue=-1e6, maxValue=1e6, bgc=color),
+                cmds.floatField(v=axis.lag, pre=3, minValue=-10, maxValue=10, bgc=color,
+                                ann="Phase delay per joint, in cycles"),
+                cmds.intField(v=axis.frequency, minValue=1, maxValue=32, bgc=color),
+            )
+            cmds.setParent("..")
+        cmds.setParent(col)
+
+    def read_chain_panel(self):
+        """Pull the compact panel's values into ``chain_profile`` / ``chain_axes``."""
+        if self.profile_ctrl:
+            self.chain_profile = cmds.gradientControlNoAttr(self.profile_ctrl, q=True, asString=True)
+        for attr, (amp, off, lag, freq) in self.axis_fields.items():
+            self.chain_axes[attr] = chain.ChainAxis(
+                amplitude=cmds.floatField(amp, q=True, v=True),
+                offset=cmds.floatField(off, q=True, v=True),
+                lag=cmds.floatField(lag, q=True, v=True),
+                frequency=cmds.intField(freq, q=True, v=True))
+
     def delete_row(self, row_layout):
         self.node_rows = [nr for nr in self.node_rows if nr["layout"] != row_layout]
         if cmds.layout(row_layout, q=True, ex=True):
             cmds.deleteUI(row_layout)
 
     def select_chain(self):
-        names = [nr["name"] for nr in self.node_rows]
+        names = self.chain_nodes()
         if names:
             cmds.select(names, r=True)
 
@@ -161,26 +247,36 @@ class TailWiggleGenerator(AnimGeneratorBase):
                 "y": cmds.checkBox(self.mirror_y_cb, q=True, v=True),
                 "z": cmds.checkBox(self.mirror_z_cb, q=True, v=True),
             },
-            "nodes": [],
+            "nodes": [self.row_values(nr) for nr in self.node_rows],
         }
-        for nr in self.node_rows:
-            data["nodes"].append({
-                "name": nr["name"],
-                "rotX": cmds.floatField(nr["xAmp"], q=True, v=True),
-                "rotY": cmds.floatField(nr["yAmp"], q=True, v=True),
-                "rotZ": cmds.floatField(nr["zAmp"], q=True, v=True),
-                "offX": cmds.floatField(nr["xOff"], q=True, v=True),
-                "offY": cmds.floatField(nr["yOff"], q=True, v=True),
-                "offZ": cmds.floatField(nr["zOff"], q=True, v=True),
-                "xHalves": cmds.checkBox(nr["xHalves"], q=True, v=True),
-                "yHalves": cmds.checkBox(nr["yHalves"], q=True, v=True),
-                "zHalves": cmds.checkBox(nr["zHalves"], q=True, v=True),
-                "xSine": cmds.checkBox(nr["xSine"], q=True, v=True),
-                "ySine": cmds.checkBox(nr["ySine"], q=True, v=True),
-                "zSine": cmds.checkBox(nr["zSine"], q=True, v=True),
-            })
+        if self.chain:
+            self.read_chain_panel()
+            data["chain"] = {
+                "nodes": list(self.chain),
+                "profile": self.chain_profile,
+                "axes": {attr: axis.to_dict() for attr, axis in self.chain_axes.items()},
+            }
         return data
 
+    @staticmethod
+    def row_values(nr):
+        """Current UI values of one chain row (the JSON ``nodes`` entry)."""
+        return {
+            "name": nr["name"],
+            "rotX": cmds.floatField(nr["xAmp"], q=True, v=True),
+            "rotY": cmds.floatField(nr["yAmp"], q=True, v=True),
+            "rotZ": cmds.floatField(nr["zAmp"], q=True, v=True),
+            "offX": cmds.floatField(nr["xOff"], q=True, v=True),
+            "offY": cmds.floatField(nr["yOff"], q=True, v=True),
+            "offZ": cmds.floatField(nr["zOff"], q=True, v=True),
+            "xHalves": cmds.checkBox(nr["xHalves"], q=True, v=True),
+            "yHalves": cmds.checkBox(nr["yHalves"], q=True, v=True),
+            "zHalves": cmds.checkBox(nr["zHalves"], q=True, v=True),
+            "xSine": cmds.checkBox(nr["xSine"], q=True, v=True),
+            "ySine": cmds.checkBox(nr["ySine"], q=True, v=True),
+            "zSine": cmds.checkBox(nr["zSine"], q=True, v=True),
+        }
+
     def save_settings_ui(self):
         txt = json.dumps(self.get_settings_dict(), indent=2)
         w = "TWG_SaveJSON"
@@ -244,6 +340,12 @@ class TailWiggleGenerator(AnimGeneratorBase):
                 cmds.checkBox(self.mirror_z_cb, e=True, v=bool(mir["z"]))
         except Exception:
             pass
+        long_chain = data.get("chain")
+        if isinstance(long_chain, dict) and long_chain.get("nodes"):
+            axes = {attr: chain.ChainAxis.from_dict(d)
+                    for attr, d in long_chain.get("axes", {}).items() if attr in chain.AXES}
+            self.build_chain_panel(long_chain["nodes"], long_chain.get("profile"), axes)
+            return
         for item in data.get("nodes", []):
             if not isinstance(item, dict):
                 continue
@@ -258,79 +360,70 @@ class TailWiggleGenerator(AnimGeneratorBase):
     # ---------- animation ----------
     def clear_keys_range(self):
         start, end = self.timeline_range()
-        attrs = ["rotateX", "rotateY", "rotateZ"]
-        for nr in self.node_rows:
-            n = nr["name"]
-            for a in attrs:
-                plug = f"{n}.{a}"
-                if cmds.objExists(plug):
-                    try:
-                        cmds.cutKey(plug, time=(start, end), option="keys")
-                    except Exception:
-                        pass
+        plugs = [f"{n}.{a}" for n in self.chain_nodes() for a in chain.AXES]
+        plugs = cmds.ls(plugs) if plugs else []
+        if plugs:
+            try:
+                cmds.cutKey(plugs, time=(start, end), option="keys")
+            except Exception:
+                pass
 
     def animate(self):
-        if not self.node_rows:
+        if not self.node_rows and not self.chain:
             cmds.warning("No nodes to animate. Scan chain first.")
             return
         start, end = self.timeline_range()
         if (end - start) <= 0:
             cmds.warning("Invalid timeline length.")
             return
-        self.clear_keys_range()
-
-        mx = -1.0 if cmds.checkBox(self.mirror_x_cb, q=True, v=True) else 1.0
-        my = -1.0 if cmds.checkBox(self.mirror_y_cb, q=True, v=True) else 1.0
-        mz = -1.0 if cmds.checkBox(self.mirror_z_cb, q=True, v=True) else 1.0
-
-        for row in self.node_rows:
+        self.mirror_x = cmds.checkBox(self.mirror_x_cb, q=True, v=True)
+        self.mirror_y = cmds.checkBox(self.mirror_y_cb, q=True, v=True)
+        self.mirror_z = cmds.checkBox(self.mirror_z_cb, q=True, v=True)
+        self.rows = [self.row_values(nr) for nr in self.node_rows]
+        self.read_chain_panel()
+        with self.generate_pass():
+            self.key_cycle()
+            cmds.inViewMessage(amg="Tail/Hair keys set.", pos="midCenter", fade=True)
+
+    def clear_targets(self, channels):
+        return [(n, a) for n in self.chain_nodes() for a in chain.AXES]
+
+    def build_channels(self):
+        mx = -1.0 if self.mirror_x else 1.0
+        my = -1.0 if self.mirror_y else 1.0
+        mz = -1.0 if self.mirror_z else 1.0
+        if self.chain:
+            mirror = dict(zip(chain.AXES, (mx, my, mz)))
+            axes = {attr: replace(axis, amplitude=mirror[attr] * axis.amplitude,
+                                  offset=mirror[attr] * axis.offset)
+                    for attr, axis in self.chain_axes.items()}
+            weights = chain.profile_weights(chain.parse_profile(self.chain_profile), len(self.chain))
+            return chain.chain_channels(self.chain, axes, weights)
+        chs = []
+        for row in self.rows:
             name = row["name"]
-            x_amp = cmds.floatField(row["xAmp"], q=True, v=True)
-            y_amp = cmds.floatField(row["yAmp"], q=True, v=True)
-            z_amp = cmds.floatField(row["zAmp"], q=True, v=True)
-            x_off = cmds.floatField(row["xOff"], q=True, v=True)
-            y_off = cmds.floatField(row["yOff"], q=True, v=True)
-            z_off = cmds.floatField(row["zOff"], q=True, v=True)
-            x_halves = cmds.checkBox(row["xHalves"], q=True, v=True)
-            y_halves = cmds.checkBox(row["yHalves"], q=True, v=True)
-            z_halves = cmds.checkBox(row["zHalves"], q=True, v=True)
-            x_sine = cmds.checkBox(row["xSine"], q=True, v=True)
-            y_sine = cmds.checkBox(row["ySine"], q=True, v=True)
-            z_sine = cmds.checkBox(row["zSine"], q=True, v=True)
-
-            self.key_axis(name, "rotateX", mx * x_amp, start, end, halves=x_halves, is_sine=x_sine, offset=mx * x_off)
-            self.key_axis(name, "rotateY", my * y_amp, start, end, halves=y_halves, is_sine=y_sine, offset=my * y_off)
-            self.key_axis(name, "rotateZ", mz * z_amp, start, end, halves=z_halves, is_sine=z_sine, offset=mz * z_off)
-
-        cmds.inViewMessage(amg="Tail/Hair keys set.", pos="midCenter", fade=True)
+            chs.append(self.axis_channel(name, "rotateX", mx * row["rotX"], halves=row["xHalves"],
+                                         is_sine=row["xSine"], offset=mx * row["offX"]))
+            chs.append(self.axis_channel(name, "rotateY", my * row["rotY"], halves=row["yHalves"],
+                                         is_sine=row["ySine"], offset=my * row["offY"]))
+            chs.append(self.axis_channel(name, "rotateZ", mz * row["rotZ"], halves=row["zHalves"],
+                                         is_sine=row["zSine"], offset=mz * row["offZ"]))
+        return chs
 
     @staticmethod
-    def key_axis(node, attr, amp, start, end, halves=True, is_sine=False, offset=0.0):
-        plug = f"{node}.{attr}"
-        if not cmds.objExists(plug):
-            return
-        length = float(end - start)
-        if length <= 0.0:
-            return
-        half = start + 0.5 * length
-        q1 = start + 0.25 * length
-        q3 = start + 0.75 * length
-        A = float(amp)
-
-        def sk(t, v):
-            val = v + offset
-            cmds.setKeyframe(plug, t=t, v=val)
+    def axis_channel(node, attr, amp, halves=True, is_sine=False, offset=0.0):
+        """Channel for one wiggle axis.
 
+        *halves*: ``A, -A, A`` at start / mid / end.  Otherwise keys on
+        the quarters, ``-A, A, -A, A, -A`` with *is_sine* and
+        ``0, A, 0, -A, 0`` without.  *offset* is added to every key.
+        """
+        A = float(amp)
         if halves:
-            sk(start, A)
-            sk(half, -abs(A) if A >= 0 else abs(A))
-            sk(end, A)
-        else:
-            if is_sine:
-                sk(start, -A); sk(q1, A); sk(half, -A); sk(q3, A); sk(end, -A)
-            else:
-                sk(start, 0.0); sk(q1, A); sk(half, 0.0); sk(q3, -A); sk(end, 0.0)
-
-        cmds.keyTangent(plug, e=True, itt='auto', ott='auto', time=(start, end))
-        cmds.keyTangent(plug, e=True, itt='flat', ott='flat', time=(start, start))
-        cmds.keyTangent(plug, e=True, itt='flat', ott='flat', time=(end, end))
+            return Channel(node, attr, Wave.COSINE, amplitude=A, offset=offset,
+                           frequency=1, n_points=3)
+        if is_sine:
+            return Channel(node, attr, Wave.COSINE, amplitude=-A, offset=offset,
+                           frequency=2, n_points=5)
+        return Channel(node, attr, Wave.SINE, amplitude=A, offset=offset,
+                       frequency=1, n_points=5)
@@ -213,13 +213,12 @@ class WalkCycleTool(AnimGeneratorBase):
     # ---------- generate ----------
     def create_walk_cycle(self, *args):
         self._read_ui()
-        original_time = cmds.currentTime(query=True)
-        self.clear_keys(); self.compute_frame_data()
-        self.set_leg_stretch_keys(); self.set_feet_keys()
-        self.set_foot_raise_keys(); self.set_hip_swinger_keys()
-        self.set_spine_keys(); self.set_root_keys()
-        self.set_right_arm_keys(); self.set_left_arm_keys()
-        cmds.currentTime(original_time, edit=True)
+        with self.generate_pass():
+            self.clear_keys(); self.compute_frame_data()
+            self.set_leg_stretch_keys(); self.set_feet_keys()
+            self.set_foot_raise_keys(); self.set_hip_swinger_keys()
+            self.set_spine_keys(); self.set_root_keys()
+            self.set_right_arm_keys(); self.set_left_arm_keys()
 
     def _read_ui(self):
         self.stride = cmds.floatField(self.stride_field, q=True, v=True)
@@ -7,9 +7,16 @@ Each clip is a dict with:
   - category:  grouping for UI/generation purposes
 
 The layout engine spaces clips sequentially on the timeline with
-configurable buffer frames between them.
+configurable buffer frames between them (:func:`layout_clips`), or with
+each buffer sized from the clips' measured key overshoot
+(:func:`pack_clips`).  Both return a :class:`ClipLayout` -- the same
+list of dicts, plus name and frame lookups.
 """
 
+import bisect
+import math
+import os
+
 
 # ── default clip set ──────────────────────────────────────────────
 
@@ -30,21 +37,77 @@ DEFAULT_CLIPS = [
 
 DEFAULT_BUFFER = 100    # frames between clips (must exceed worst-case extended key overshoot)
 DEFAULT_START = 100     # first clip starts at this frame (leave room for T-pose / rest at 0)
+PACK_MARGIN = 2         # packed layouts: frames kept clear around each separator key
 
 
-# ── layout engine ─────────────────────────────────────────────────
+# ── layout object ─────────────────────────────────────────────────
 
-def layout_clips(clips=None, buffer=DEFAULT_BUFFER, start=DEFAULT_START):
-    """Compute frame ranges for each clip.
+class ClipLayout(list):
+    """A laid-out clip list with name and frame lookups.
 
-    Returns a list of dicts, each with:
-      name, frames, loop, category, start, end
+    Still the plain list of clip dicts (``name, frames, loop, category,
+    start, end``) that every layout consumer indexes and iterates; on
+    top of that it keeps a name index and a start-sorted interval index.
+    Both are built on creation -- call :meth:`reindex` after editing the
+    list or a clip's range in place.
     """
-    if clips is None:
-        clips = DEFAULT_CLIPS
-    result = []
+
+    def __init__(self, clips=()):
+        super().__init__(clips)
+        self.reindex()
+
+    def reindex(self):
+        """Rebuild the name and interval indexes."""
+        self._by_name = {}
+        for clip in self:
+            self._by_name.setdefault(clip['name'], clip)
+        self._order = sorted(self, key=lambda c: (c['start'], c['end']))
+        self._starts = [c['start'] for c in self._order]
+        # _reach[i]: furthest end among the first i+1 clips by start, so a
+        # backwards scan can stop as soon as nothing earlier reaches a frame
+        self._reach = []
+        reach = None
+        for clip in self._order:
+            reach = clip['end'] if reach is None else max(reach, clip['end'])
+            self._reach.append(reach)
+
+    def by_name(self, name):
+        """Return the clip called *name*, or None."""
+        return self._by_name.get(name)
+
+    def clips_in(self, start, end):
+        """Clips overlapping the frame range ``[start, end]``, by start."""
+        i = bisect.bisect_right(self._starts, end)
+        found = []
+        while i > 0 and self._reach[i - 1] >= start:
+            i -= 1
+            if self._order[i]['end'] >= start:
+                found.append(self._order[i])
+        found.reverse()
+        return found
+
+    def clip_at(self, frame):
+        """Return the clip whose ``[start, end]`` contains *frame*, or None.
+
+        Frames in a buffer belong to no clip; if clips overlap, the one
+        that starts last wins.
+        """
+        found = self.clips_in(frame, frame)
+        return found[-1] if found else None
+
+    @property
+    def end(self):
+        """Last frame covered by any clip (0 for an empty layout)."""
+        return self._reach[-1] if self._reach else 0
+
+
+# ── layout engine ─────────────────────────────────────────────────
+
+def _place(clips, gaps, start):
+    """Lay *clips* out from *start* with ``gaps[i]`` frames after clip *i*."""
+    result = ClipLayout()
     frame = start
-    for clip in clips:
+    for clip, gap in zip(clips, gaps):
         end = frame + clip['frames']
         result.append({
             'name': clip['name'],
@@ -54,7 +117,75 @@ def layout_clips(clips=None, buffer=DEFAULT_BUFFER, start=DEFAULT_START):
             'start': frame,
             'end': end,
         })
-        frame = end + buffer
+        frame = end + gap
+    result.reindex()
+    return result
+
+
+def layout_clips(clips=None, buffer=DEFAULT_BUFFER, start=DEFAULT_START):
+    """Compute frame ranges for each clip.
+
+    Returns a :class:`ClipLayout` (a list of dicts), each with:
+      name, frames, loop, category, start, end
+    """
+    if clips is None:
+        clips = DEFAULT_CLIPS
+    return _place(clips, [buffer] * len(clips), start)
+
+
+def pack_clips(clips=None, overshoot=None, start=DEFAULT_START,
+               buffer=DEFAULT_BUFFER, margin=PACK_MARGIN):
+    """Like :func:`layout_clips`, with every buffer sized to its two clips.
+
+    *overshoot*: ``{name: (pre, post)}`` frames each clip's keys reach
+    before its start and after its end (see :func:`overshoot_from_times`).
+    The buffer between two clips is twice the larger of the facing
+    overshoots plus *margin*, so the bind-pose separator at its
+    midpoint clears both.  Next to a clip missing from *overshoot* the
+    uniform *buffer* is kept.
+    """
+    if clips is None:
+        clips = DEFAULT_CLIPS
+    overshoot = overshoot or {}
+    gaps = []
+    for clip, nxt in zip(clips, clips[1:]):
+        a, b = overshoot.get(clip['name']), overshoot.get(nxt['name'])
+        if a is None or b is None:
+            gaps.append(buffer)
+        else:
+            gaps.append(2 * (max(a[1], b[0]) + margin))
+    gaps.append(buffer)
+    return _place(clips, gaps, start)
+
+
+def overshoot_from_times(layout, times, reach=DEFAULT_BUFFER // 2, ignore=()):
+    """Measure how far keys run past each clip: ``{name: (pre, post)}``.
+
+    *times*: key times of the scene's animation (any order, repeats
+    allowed).  A key in the buffer between two clips belongs to the
+    nearer clip (one on the midpoint to both), and no clip looks more
+    than *reach* frames out.  Frames in *ignore* -- the bind-pose
+    separators -- are skipped.  Overshoots are whole frames, rounded up.
+    """
+    skip = set(ignore)
+    times = sorted(set(t for t in times if t not in skip))
+    order = sorted(layout, key=lambda c: (c['start'], c['end']))
+    result = {}
+    for i, clip in enumerate(order):
+        lo = clip['start'] - reach
+        if i > 0:
+            lo = max(lo, (order[i - 1]['end'] + clip['start']) / 2.0)
+        hi = clip['end'] + reach
+        if i + 1 < len(order):
+            hi = min(hi, (clip['end'] + order[i + 1]['start']) / 2.0)
+        pre = post = 0
+        first = bisect.bisect_left(times, lo)
+        if first < len(times) and times[first] < clip['start']:
+            pre = int(math.ceil(clip['start'] - times[first]))
+        last = bisect.bisect_right(times, hi) - 1
+        if last >= 0 and times[last] > clip['end']:
+            post = int(math.ceil(times[last] - clip['end']))
+        result[clip['name']] = (pre, post)
     return result
 
 
@@ -67,7 +198,14 @@ def timeline_end(layout):
 
 def clip_by_name(layout, name):
     """Find a clip in the layout by name.  Returns dict or None."""
+    if isinstance(layout, ClipLayout):
+        return layout.by_name(name)
     for c in layout:
         if c['name'] == name:
             return c
     return None
+
+
+def clip_path(output_dir, clip):
+    """Return the ``<output_dir>/<clip name>.fbx`` export path for *clip*."""
+    return os.path.join(output_dir, '{}.fbx'.format(clip['name']))
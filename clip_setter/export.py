@@ -1,15 +1,22 @@
 """Export logic -- Game Exporter clip application + direct FBX clip export.
 
-Two export paths:
+Export paths:
   1. apply_clips()    -- set animation clips directly on the Game Exporter node
   2. export_clips()   -- directly export each clip as a separate FBX
+  3. parallel.export_clips_parallel() -- the same, fanned out to headless
+     mayapy workers (see :mod:`.parallel`)
+  4. export_multitake() -- one FBX holding one animation take per clip
 """
 
+import json
 import os
 
 import maya.cmds as cmds
 import maya.mel as mel
 
+from . import manifest
+from .clips import DEFAULT_BUFFER, ClipLayout, clip_path, overshoot_from_times
+
 
 # ── Game Exporter node ────────────────────────────────────────────
 
@@ -107,54 +114,131 @@ def apply_clips(layout):
 
 # ── Direct FBX clip export ────────────────────────────────────────
 
-def export_clips(layout, output_dir, selection_only=True):
+# Settings shared by every clip; only the bake range changes per clip.
+FBX_SETTINGS = [
+    'FBXExportBakeComplexAnimation -v true',
+    'FBXExportBakeComplexStep -v 1',
+    'FBXExportSkins -v true',
+    'FBXExportShapes -v true',
+    'FBXExportConstraints -v false',
+    'FBXExportCameras -v false',
+    'FBXExportLights -v false',
+    'FBXExportSmoothingGroups -v true',
+    'FBXExportTangents -v true',
+    'FBXExportUpAxis y',
+    'FBXExportFileVersion -v FBX201800',
+    'FBXExportInAscii -v false',
+]
+
+
+def prepare_fbx_export():
+    """Load the FBX plugin and apply :data:`FBX_SETTINGS` in one MEL call."""
+    if not cmds.pluginInfo('fbxmaya', q=True, loaded=True):
+        cmds.loadPlugin('fbxmaya')
+    mel.eval(';'.join(FBX_SETTINGS))
+
+
+def export_clip(clip, output_dir, selection_only=True):
+    """Export one clip range to ``<clip name>.fbx``; returns the path.
+
+    Expects :func:`prepare_fbx_export` to have run in this session.
+    """
+    filepath = clip_path(output_dir, clip)
+    mel.eval('FBXExportBakeComplexStart -v {};FBXExportBakeComplexEnd -v {}'.format(
+        int(clip['start']), int(clip['end'])))
+    export_cmd = 'FBXExport -f "{}"'.format(filepath.replace('\\', '/'))
+    if selection_only:
+        export_cmd += ' -s'
+    mel.eval(export_cmd)
+    return filepath
+
+
+def export_clips(layout, output_dir, selection_only=True, incremental=False):
     """Export each clip as a separate FBX file.
 
     *output_dir* is the folder where ``<clip_name>.fbx`` files are written.
     If *selection_only* is True, only selected nodes are exported (typical
-    for exporting just the skeleton + mesh).
+    for exporting just the skeleton + mesh).  With *incremental*, clips
+    whose keys and settings match the export manifest are skipped (see
+    :mod:`.manifest`).
 
-    Returns a list of exported file paths.
+    Returns a list of exported file paths.  Runs in the live session;
+    see :mod:`.parallel` for exporting through background workers.
     """
     if not os.path.isdir(output_dir):
         os.makedirs(output_dir)
 
-    # Ensure FBX plugin is loaded
-    if not cmds.pluginInfo('fbxmaya', q=True, loaded=True):
-        cmds.loadPlugin('fbxmaya')
+    prepare_fbx_export()
 
-    exported = []
-    for clip in layout:
-        filepath = os.path.join(output_dir, '{}.fbx'.format(clip['name']))
-
-        # Configure FBX export settings
-        mel.eval('FBXExportBakeComplexAnimation -v true')
-        mel.eval('FBXExportBakeComplexStart -v {}'.format(int(clip['start'])))
-        mel.eval('FBXExportBakeComplexEnd -v {}'.format(int(clip['end'])))
-        mel.eval('FBXExportBakeComplexStep -v 1')
-        mel.eval('FBXExportSkins -v true')
-        mel.eval('FBXExportShapes -v true')
-        mel.eval('FBXExportConstraints -v false')
-        mel.eval('FBXExportCameras -v false')
-        mel.eval('FBXExportLights -v false')
-        mel.eval('FBXExportSmoothingGroups -v true')
-        mel.eval('FBXExportTangents -v true')
-        mel.eval('FBXExportUpAxis y')
-        mel.eval('FBXExportFileVersion -v FBX201800')
-        mel.eval('FBXExportInAscii -v false')
-
-        export_cmd = 'FBXExport -f "{}" -s'.format(filepath.replace('\\', '/'))
-        if not selection_only:
-            export_cmd = 'FBXExport -f "{}"'.format(filepath.replace('\\', '/'))
+    book = manifest.ExportManifest(output_dir)
+    todo = book.check(layout, selection_only)
+    if not incremental:
+        todo = list(layout)
+    elif len(todo) < len(layout):
+        print('// Unchanged since last export, skipped: {}'.format(
+            ', '.join(c['name'] for c in layout if c not in todo)))
 
-        mel.eval(export_cmd)
-        exported.append(filepath)
+    exported = []
+    for clip in todo:
+        exported.append(export_clip(clip, output_dir, selection_only))
+        book.record(clip['name'])
         print('// Exported: {} (frames {}-{})'.format(
             clip['name'], clip['start'], clip['end']))
+    book.save()
 
     return exported
 
 
+def _mel_string(text):
+    return '"{}"'.format(text.replace('\\', '/').replace('"', '\\"'))
+
+
+def export_multitake(layout, filepath, selection_only=True, per_clip=False):
+    """Export the whole *layout* as one FBX with one animation take per clip.
+
+    The skeleton, mesh and skin are written once; the bake covers the
+    first clip's start to the last clip's end and the FBX plugin splits
+    it into takes named after the clips (the unsplit take is dropped).
+    With *per_clip*, the separate ``<clip_name>.fbx`` files are also
+    written next to *filepath* (through :func:`export_clips`).
+
+    Returns the list of written paths, *filepath* first.
+    """
+    if not layout:
+        return []
+    folder = os.path.dirname(filepath)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    prepare_fbx_export()
+    start = min(int(c['start']) for c in layout)
+    end = max(int(c['end']) for c in layout)
+    takes = ['FBXExportSplitAnimationIntoTakes -c',
+             'FBXExportDeleteOriginalTakeOnSplitAnimation -v true',
+             'FBXExportBakeComplexStart -v {}'.format(start),
+             'FBXExportBakeComplexEnd -v {}'.format(end)]
+    for clip in layout:
+        takes.append('FBXExportSplitAnimationIntoTakes -v {} {} {}'.format(
+            _mel_string(clip['name']), int(clip['start']), int(clip['end'])))
+    mel.eval(';'.join(takes))
+    export_cmd = 'FBXExport -f {}'.format(_mel_string(filepath))
+    if selection_only:
+        export_cmd += ' -s'
+    try:
+        mel.eval(export_cmd)
+    finally:
+        # the take list is global FBX state: don't leak it into later exports
+        mel.eval('FBXExportSplitAnimationIntoTakes -c;'
+                 'FBXExportDeleteOriginalTakeOnSplitAnimation -v false')
+    print('// Exported {} takes (frames {}-{}) -> {}'.format(
+        len(layout), start, end, filepath))
+
+    written = [filepath]
+    if per_clip:
+        written += export_clips(layout, folder or '.', selection_only)
+    return written
+
+
 # ── Timeline setup ────────────────────────────────────────────────
 
 def setup_timeline(layout):
@@ -172,23 +256,128 @@ def setup_timeline(layout):
     print('// Timeline set: {} - {} ({} clips)'.format(start, end, len(layout)))
 
 
+def _time_curves():
+    """Every time-driven animCurve in the scene (no driven keys)."""
+    return cmds.ls(type=('animCurveTL', 'animCurveTA', 'animCurveTU')) or []
+
+
+def measure_overshoot(layout, buffer=DEFAULT_BUFFER):
+    """Return ``{clip name: (pre, post)}`` key overshoot in the scene.
+
+    Key times of every animCurve are read in one query and handed to
+    :func:`clips.overshoot_from_times`; the bind-pose separator frames
+    of *layout* (laid out with *buffer*) are ignored.
+    """
+    curves = _time_curves()
+    times = (cmds.keyframe(curves, q=True, timeChange=True) or []) if curves else []
+    return overshoot_from_times(layout, times, reach=buffer // 2,
+                                ignore=_separator_frames(layout, buffer))
+
+
+def move_clips(old_layout, new_layout, overshoot, buffer=DEFAULT_BUFFER):
+    """Move every clip's keys from *old_layout* to *new_layout*.
+
+    Each clip moves as one block, overshoot (``{name: (pre, post)}``)
+    included, with one ``keyframe -e`` over all animCurves.  The old
+    bind-pose separator keys are deleted first -- key them again for
+    the new layout.  Returns the number of clips that moved.
+    """
+    curves = _time_curves()
+    if not curves:
+        return 0
+    target = ClipLayout(new_layout)
+    moves = []
+    for clip in old_layout:
+        new = target.by_name(clip['name'])
+        if new is None or new['start'] == clip['start']:
+            continue
+        pre, post = overshoot.get(clip['name'], (0, 0))
+        moves.append((clip['start'] - pre, clip['end'] + post,
+                      new['start'] - clip['start']))
+    if not moves:
+        return 0
+    # blocks moving left go first-to-last and blocks moving right
+    # last-to-first, so none lands on keys that haven't moved yet
+    moves.sort()
+    moves = ([m for m in moves if m[2] < 0]
+             + [m for m in reversed(moves) if m[2] > 0])
+
+    cmds.undoInfo(openChunk=True, chunkName='ClipSetter_MoveClips')
+    try:
+        seps = _separator_frames(old_layout, buffer)
+        cmds.cutKey(curves, t=[(f, f) for f in seps], clear=True)
+        for lo, hi, delta in moves:
+            cmds.keyframe(curves, e=True, t=(lo, hi), relative=True,
+                          timeChange=delta, option='over')
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    print('// Moved {} clips ({} -> {} frames).'.format(
+        len(moves), old_layout[-1]['end'] if old_layout else 0,
+        new_layout[-1]['end'] if new_layout else 0))
+    return len(moves)
+
+
+PACK_INFO_KEY = 'clipSetterPack'
+
+
+def save_pack_state(overshoot, start=None, buffer=None):
+    """Record a packed layout in the scene's ``fileInfo``.
+
+    *overshoot* ``None`` clears the record (uniform buffers).  The state
+    is saved with the scene, so a reopened window or a reloaded file
+    lays the clips out where their keys are.
+    """
+    if overshoot is None:
+        if cmds.fileInfo(PACK_INFO_KEY, q=True):
+            cmds.fileInfo(remove=PACK_INFO_KEY)
+        return
+    data = {'start': start, 'buffer': buffer,
+            'overshoot': {name: list(v) for name, v in overshoot.items()}}
+    cmds.fileInfo(PACK_INFO_KEY, json.dumps(data, sort_keys=True))
+
+
+def load_pack_state():
+    """Return the ``{'start', 'buffer', 'overshoot'}`` saved by
+    :func:`save_pack_state`, or ``None`` when the timeline isn't packed."""
+    raw = cmds.fileInfo(PACK_INFO_KEY, q=True)
+    if not raw:
+        return None
+    raw = raw[0]
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        # fileInfo hands back quotes escaped
+        try:
+            data = json.loads(raw.encode('utf-8').decode('unicode_escape'))
+        except ValueError:
+            print('!! unreadable packed layout in fileInfo, ignoring it')
+            return None
+    data['overshoot'] = {name: tuple(v)
+                         for name, v in data.get('overshoot', {}).items()}
+    return data
+
+
 # ── Bind pose separators ──────────────────────────────────────────
 
+_ZERO_ATTRS = ('tx', 'ty', 'tz', 'rx', 'ry', 'rz',
+               'translateX', 'translateY', 'translateZ',
+               'rotateX', 'rotateY', 'rotateZ')
+_ONE_ATTRS = ('sx', 'sy', 'sz', 'scaleX', 'scaleY', 'scaleZ')
+
+
 def _default_value(node, attr):
     """Return the bind/default value for a channel.
 
     Transform channels: 0 for translate/rotate, 1 for scale.
     Custom attrs: query the default value set at creation time.
     """
-    if attr in ('sx', 'sy', 'sz', 'scaleX', 'scaleY', 'scaleZ'):
+    if attr in _ONE_ATTRS:
         return 1.0
-    if attr in ('tx', 'ty', 'tz', 'rx', 'ry', 'rz',
-                'translateX', 'translateY', 'translateZ',
-                'rotateX', 'rotateY', 'rotateZ'):
+    if attr in _ZERO_ATTRS:
         return 0.0
     # Custom / user-defined attr — query default
     try:
-        return cmds.addAttr('{}.{}'.format(node, attr), q=True, dv=True)
+        return cmds.addAttr('{}.{}'.format(node, attr), q=True, dv=True) or 0.0
     except (RuntimeError, ValueError):
         return 0.0
 
@@ -226,8 +415,9 @@ def _separator_frames(layout, buffer=60):
 def _gather_charset_channels(character_set):
     """Return a list of (node, attr) tuples for all keyable channels.
 
-    Uses nodesOnly query then gathers keyable/unlocked attrs per node.
-    This is more reliable than querying plug names from the character set.
+    Uses nodesOnly query then gathers keyable/unlocked attrs per node
+    (one ``listAttr`` each).  This is more reliable than querying plug
+    names from the character set.
     """
     nodes = cmds.character(character_set, q=True, nodesOnly=True) or []
     # Deduplicate while preserving order
@@ -238,28 +428,42 @@ def _gather_charset_channels(character_set):
         if short not in seen:
             seen.add(short)
             unique_nodes.append(short)
+    existing = set(cmds.ls(unique_nodes) or []) if unique_nodes else set()
 
     # Attrs that are keyable on transforms but irrelevant for animation
     _SKIP_ATTRS = {'visibility'}
 
     channels = []
     for node in unique_nodes:
-        if not cmds.objExists(node):
+        if node not in existing:
             continue
-        keyable = cmds.listAttr(node, keyable=True) or []
+        keyable = cmds.listAttr(node, keyable=True, unlocked=True) or []
         for attr in keyable:
             if attr in _SKIP_ATTRS:
                 continue
-            full = '{}.{}'.format(node, attr)
-            try:
-                if cmds.getAttr(full, lock=True):
-                    continue
-            except (ValueError, RuntimeError):
-                continue
             channels.append((node, attr))
     return channels
 
 
+def _key_separators_bulk(plugs, frames, values):
+    """Key every plug at *frames* to its value in a handful of calls.
+
+    One ``setKeyframe`` creates the keys on every plug (no ``-v``, so
+    nothing else gets keyed), one ``keyframe -e`` per distinct value
+    sets the values and one ``keyTangent`` makes them stepped.  Only the
+    keys at *frames* are touched; clip keys in between keep theirs.
+    """
+    ranges = [(f, f) for f in frames]
+    cmds.setKeyframe(plugs, t=frames)
+    by_value = {}
+    for plug, value in zip(plugs, values):
+        by_value.setdefault(value, []).append(plug)
+    for value, group in by_value.items():
+        cmds.keyframe(group, e=True, t=ranges, absolute=True,
+                      valueChange=value)
+    cmds.keyTangent(plugs, t=ranges, itt='stepnext', ott='step')
+
+
 def key_bind_pose_separators(layout, character_set, buffer=60):
     """Key every channel in *character_set* to its default value at separator frames.
 
@@ -288,37 +492,26 @@ def key_bind_pose_separators(layout, character_set, buffer=60):
         cmds.warning('No keyable channels found in character set.')
         return 0
 
-    # Disable autoKeyframe so Maya doesn't also key at the current time
-    auto_key_was_on = cmds.autoKeyframe(q=True, state=True)
-    cmds.autoKeyframe(state=False)
-    current_time = cmds.currentTime(q=True)
+    plugs = ['{}.{}'.format(node, attr) for node, attr in channels]
+    values = [float(_default_value(node, attr)) for node, attr in channels]
 
     cmds.undoInfo(openChunk=True, chunkName='ClipSetter_BindSeparators')
     key_count = 0
     try:
-        for frame in sep_frames:
-            for node, attr in channels:
-                val = _default_value(node, attr)
-                try:
-                    cmds.setKeyframe(node, at=attr, t=(frame,), v=val)
-                    cmds.keyTangent(node, at=attr, t=(frame, frame),
-                                    itt='stepnext', ott='step')
-                    key_count += 1
-                except Exception:
-                    pass
-
-        # Remove accidental keys at the current time (setKeyframe + v=
-        # can create side-effect keys at the current frame)
-        if current_time not in sep_frames:
-            for node, attr in channels:
+        try:
+            _key_separators_bulk(plugs, sep_frames, values)
+            key_count = len(plugs) * len(sep_frames)
+        except RuntimeError:
+            # a plug the bulk call can't key (e.g. driven by a constraint):
+            # key channel by channel so the others still get their walls
+            for plug, value in zip(plugs, values):
                 try:
-                    cmds.cutKey(node, at=attr,
-                                t=(current_time, current_time), clear=True)
-                except Exception:
-                    pass
+                    _key_separators_bulk([plug], sep_frames, [value])
+                    key_count += len(sep_frames)
+                except RuntimeError as e:
+                    print('!! separator keys failed {}: {}'.format(plug, e))
     finally:
         cmds.undoInfo(closeChunk=True)
-        cmds.autoKeyframe(state=auto_key_was_on)
 
     print('// Keyed {} bind-pose separators at {} frames across {} channels.'.format(
         key_count, len(sep_frames), len(channels)))
@@ -0,0 +1,105 @@
+"""Headless clip export worker -- runs inside ``mayapy``, one per pool slot.
+
+Started by :mod:`.parallel` with the path of a JSON job file::
+
+    mayapy -m clip_setter.export_worker JOB.json
+
+The job holds the saved scene, the output folder, the nodes to select
+and the clips to export (``{'name', 'start', 'end'}``).  The worker
+opens the scene once, applies the FBX settings once and exports its
+clips one after another.  Every result is printed as one line::
+
+    @@clip_setter {"event": "clip", "name": "walk", "ok": true, ...}
+
+so the launching session can stream them while Maya's own output
+passes through untouched.  ``--dry-run`` skips Maya entirely and writes
+a small placeholder file per clip -- a stand-in process for exercising
+the pool without mayapy.
+"""
+
+import json
+import os
+import sys
+import time
+import traceback
+
+from .clips import clip_path
+
+MARKER = '@@clip_setter '
+
+
+def emit(event, **data):
+    """Print one result line for the launching session."""
+    data['event'] = event
+    sys.stdout.write(MARKER + json.dumps(data) + '\n')
+    sys.stdout.flush()
+
+
+def _open_scene(job):
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    import maya.cmds as cmds
+
+    cmds.file(job['scene'], open=True, force=True, prompt=False)
+    if job.get('selection'):
+        cmds.select(job['selection'], replace=True, noExpand=True)
+    else:
+        cmds.select(clear=True)
+
+
+def _export_one(job, clip, dry_run):
+    if not dry_run:
+        from . import export
+        return export.export_clip(clip, job['output_dir'],
+                                  bool(job.get('selection')))
+    path = clip_path(job['output_dir'], clip)
+    with open(path, 'w') as f:
+        json.dump({'dry_run': True, 'clip': clip}, f)
+    return path
+
+
+def run(job, dry_run=False):
+    """Export every clip of *job*; returns the number of failed clips."""
+    if not os.path.isdir(job['output_dir']):
+        os.makedirs(job['output_dir'])
+    if not dry_run:
+        _open_scene(job)
+        from . import export
+        export.prepare_fbx_export()
+    emit('ready', clips=len(job['clips']))
+    failed = 0
+    for clip in job['clips']:
+        t0 = time.time()
+        try:
+            path = _export_one(job, clip, dry_run)
+        except Exception as e:
+            failed += 1
+            emit('clip', name=clip['name'], ok=False,
+                 error='{}: {}'.format(type(e).__name__, e))
+            continue
+        emit('clip', name=clip['name'], ok=True, path=path,
+             ms=(time.time() - t0) * 1000.0)
+    return failed
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    dry_run = '--dry-run' in args
+    args = [a for a in args if a != '--dry-run']
+    if len(args) != 1:
+        sys.stderr.write('usage: export_worker [--dry-run] JOB.json\n')
+        return 2
+    try:
+        with open(args[0], 'r') as f:
+            job = json.load(f)
+        failed = run(job, dry_run)
+    except Exception as e:
+        emit('error', error='{}: {}'.format(type(e).__name__, e),
+             detail=traceback.format_exc())
+        return 1
+    emit('done', failed=failed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
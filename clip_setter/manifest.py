@@ -0,0 +1,211 @@
+"""Incremental export manifest -- skip clips whose animation didn't change.
+
+The manifest is a JSON file next to the output folder
+(``<output_dir>.export_manifest.json``).  Per clip it records a hash of
+the keyed curve data inside the clip's ``[start, end]`` upstream of the
+exported nodes, and a hash of the FBX settings and node list it was exported
+with.  A clip is *dirty* when either hash differs from the manifest
+or its ``.fbx`` is missing::
+
+    m = ExportManifest(out_dir)
+    dirty = m.check(layout, selection_only=True)
+    for clip in dirty:
+        export.export_clip(clip, out_dir)
+        m.record(clip['name'])
+    m.save()
+
+Curves are read in bulk -- a handful of queries per animCurve, however
+many clips and frames there are -- and each clip hashes only the keys
+inside its range (plus the neighbouring key on each side, which shapes
+the first and last segment).  The curves come from the exported nodes'
+history, so a skeleton driven by constraints picks up the controls'
+keys that the FBX bake reads.  Only keyed animation is hashed: edits to
+the mesh, skin or static (unkeyed) values don't make a clip dirty, so
+export without the manifest after those.
+"""
+
+import bisect
+import datetime
+import hashlib
+import json
+import os
+
+import maya.cmds as cmds
+
+from .clips import clip_path
+
+MANIFEST_VERSION = 2
+MANIFEST_SUFFIX = '.export_manifest.json'
+
+
+def manifest_path(output_dir):
+    """Return the manifest path for *output_dir* (a sibling file)."""
+    return os.path.normpath(os.path.abspath(output_dir)) + MANIFEST_SUFFIX
+
+
+# ── scene reading ──
+
+def export_nodes(selection_only=True):
+    """Long names of the nodes an export writes.
+
+    The selection and everything below it, or every transform when
+    *selection_only* is False, plus the blendShape nodes deforming
+    their meshes (FBX exports shape animation).
+    """
+    if selection_only:
+        sel = cmds.ls(sl=True, long=True) or []
+        nodes = sel + (cmds.listRelatives(sel, allDescendents=True,
+                                          fullPath=True) or []) if sel else []
+    else:
+        nodes = cmds.ls(type='transform', long=True) or []
+    if nodes:
+        nodes += cmds.ls(cmds.listHistory(nodes) or [], type='blendShape') or []
+    return sorted(set(nodes))
+
+
+def read_curves(nodes):
+    """Key data of every animCurve upstream of *nodes*, read once.
+
+    Returns ``[{'curve', 'plug', 'times', 'keys'}, ...]`` sorted by
+    driven plug, where ``keys[i]`` is a tuple of key *i*'s time, value,
+    tangent types and angles.  Curves in the nodes' history (controls
+    feeding constraints, driven keys) are included along with the ones
+    keyed on the nodes themselves or reached through character sets
+    (``keyframe -q -name`` follows them).
+    """
+    if not nodes:
+        return []
+    upstream = cmds.ls(cmds.listHistory(nodes) or [], type='animCurve') or []
+    curves = sorted(set(upstream)
+                    | set(cmds.keyframe(nodes, q=True, name=True) or []))
+    if not curves:
+        return []
+    conns = cmds.listConnections(curves, s=False, d=True, plugs=True,
+                                 connections=True, skipConversionNodes=True) or []
+    plug_of = {}
+    for src, dst in zip(conns[0::2], conns[1::2]):
+        plug_of.setdefault(src.split('.', 1)[0], dst)
+    out = []
+    for curve in curves:
+        tv = cmds.keyframe(curve, q=True, timeChange=True,
+                           valueChange=True) or []
+        times = tv[0::2]
+        keys = list(zip(times, tv[1::2],
+                        _per_key(curve, len(times), itt=True),
+                        _per_key(curve, len(times), ott=True),
+                        _per_key(curve, len(times), inAngle=True),
+                        _per_key(curve, len(times), outAngle=True)))
+        out.append({'curve': curve, 'plug': plug_of.get(curve, curve),
+                    'times': times, 'keys': keys})
+    out.sort(key=lambda c: c['plug'])
+    return out
+
+
+def _per_key(curve, count, **flag):
+    """One ``keyTangent -q`` flag for every key of *curve*."""
+    values = cmds.keyTangent(curve, q=True, **flag) or []
+    return values if len(values) == count else [None] * count
+
+
+def _infinity(curve):
+    return (cmds.getAttr(curve + '.preInfinity'),
+            cmds.getAttr(curve + '.postInfinity'))
+
+
+# ── hashing ──
+
+def _round(v):
+    return round(v, 5) if isinstance(v, float) else v
+
+
+def clip_hash(clip, curves, infinity=None):
+    """Hash of the keys shaping *clip* on every curve in *curves*.
+
+    *infinity*: ``{curve: (pre, post)}`` cache, filled lazily for curves
+    whose keys don't cover the whole clip.
+    """
+    if infinity is None:
+        infinity = {}
+    h = hashlib.sha1()
+    h.update(repr((clip['start'], clip['end'])).encode('utf-8'))
+    for c in curves:
+        times = c['times']
+        if not times:
+            continue
+        lo = max(0, bisect.bisect_right(times, clip['start']) - 1)
+        hi = min(len(times), bisect.bisect_left(times, clip['end']) + 1)
+        keys = c['keys'][lo:hi]
+        if not keys:
+            continue
+        row = [c['plug']] + [tuple(_round(v) for v in k) for k in keys]
+        if times[0] > clip['start'] or times[-1] < clip['end']:
+            if c['curve'] not in infinity:
+                infinity[c['curve']] = _infinity(c['curve'])
+            row.append(infinity[c['curve']])
+        h.update(repr(row).encode('utf-8'))
+    return h.hexdigest()
+
+
+def settings_hash(selection_only, nodes):
+    """Hash of the FBX settings and exported node list."""
+    from . import export
+    data = {'fbx': export.FBX_SETTINGS, 'selection_only': bool(selection_only),
+            'nodes': list(nodes)}
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+# ── manifest ──
+
+class ExportManifest:
+    """The manifest of one output folder plus the hashes of a pending export."""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = manifest_path(output_dir)
+        self.clips = {}        # clip name -> manifest entry
+        self.pending = {}      # clip name -> (hash, clip) from the last check()
+        self.settings = None   # settings hash from the last check()
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.clips = data.get('clips', {})
+            except (IOError, OSError, ValueError) as e:
+                print('!! unreadable export manifest, ignoring it: {}'.format(e))
+
+    def check(self, layout, selection_only=True, nodes=None):
+        """Hash every clip of *layout*; return the dirty clips in order.
+
+        *nodes*: exported nodes (default :func:`export_nodes`).
+        """
+        if nodes is None:
+            nodes = export_nodes(selection_only)
+        curves = read_curves(nodes)
+        self.settings = settings_hash(selection_only, nodes)
+        infinity = {}
+        self.pending = {}
+        dirty = []
+        for clip in layout:
+            digest = clip_hash(clip, curves, infinity)
+            self.pending[clip['name']] = (digest, clip)
+            old = self.clips.get(clip['name'], {})
+            if old.get('hash') != digest or old.get('settings') != self.settings \
+                    or not os.path.isfile(clip_path(self.output_dir, clip)):
+                dirty.append(clip)
+        return dirty
+
+    def record(self, name):
+        """Mark clip *name* as exported with the hashes from :meth:`check`."""
+        digest, clip = self.pending[name]
+        self.clips[name] = {
+            'hash': digest, 'settings': self.settings,
+            'start': clip['start'], 'end': clip['end'],
+            'file': os.path.basename(clip_path(self.output_dir, clip)),
+            'exported': datetime.datetime.now().isoformat(timespec='seconds')}
+
+    def save(self):
+        """Write the manifest file."""
+        with open(self.path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'clips': self.clips},
+                      f, indent=2, sort_keys=True)
@@ -0,0 +1,338 @@
+"""Parallel clip export -- fan a clip layout out to headless Maya workers.
+
+``export_clips_parallel()`` saves the scene to a temporary file, splits
+the clips into one balanced batch per worker and starts one
+:mod:`.export_worker` process per batch.  Each worker opens the scene
+once and exports its clips; results are read from the workers' stdout
+as they happen and handed to *on_result* (on Maya's main thread, via
+``maya.utils.executeDeferred``), so the UI stays responsive::
+
+    job = parallel.export_clips_parallel(
+        layout, out_dir, workers=4,
+        on_result=lambda r: print(r['name'], r['ok']),
+        on_done=lambda results: print(len(results), 'clips'))
+
+How a worker process is started is pluggable: a *launcher* is any
+callable ``launcher(job_path) -> argv``.  :func:`mayapy_launcher` (the
+default) runs the worker in mayapy; :func:`standin_launcher` runs it
+in this Python with ``--dry-run`` (placeholder files, no Maya) so the
+pool can be exercised anywhere.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+
+try:
+    import maya.cmds as cmds
+    import maya.utils as maya_utils
+except ImportError:   # plain Python process (stand-in workers)
+    cmds = maya_utils = None
+
+from .export_worker import MARKER
+
+DEFAULT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ── launchers ──
+
+def find_mayapy():
+    """Return the mayapy executable for this Maya install, or None.
+
+    Checks ``$MAYAPY``, the folder of the running Maya executable and
+    ``$MAYA_LOCATION/bin``.
+    """
+    exe_name = 'mayapy.exe' if sys.platform == 'win32' else 'mayapy'
+    env = os.environ.get('MAYAPY')
+    if env and os.path.isfile(env):
+        return env
+    folders = [os.path.dirname(sys.executable)]
+    if os.environ.get('MAYA_LOCATION'):
+        folders.append(os.path.join(os.environ['MAYA_LOCATION'], 'bin'))
+    for folder in folders:
+        path = os.path.join(folder, exe_name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def mayapy_launcher(mayapy=None):
+    """Launcher running :mod:`.export_worker` in a headless mayapy."""
+    exe = mayapy or find_mayapy()
+    if not exe:
+        raise RuntimeError('mayapy not found. Set the MAYAPY env var to '
+                           'the mayapy executable.')
+
+    def launch(job_path):
+        return [exe, '-m', 'clip_setter.export_worker', job_path]
+    return launch
+
+
+def standin_launcher(python=None):
+    """Launcher running the worker in plain Python with ``--dry-run``.
+
+    No Maya is started; each clip gets a small placeholder file.  Used
+    to exercise the pool (and the UI streaming) without mayapy.
+    """
+    exe = python or sys.executable
+
+    def launch(job_path):
+        return [exe, '-m', 'clip_setter.export_worker', '--dry-run',
+                job_path]
+    return launch
+
+
+# ── batching ──
+
+def split_clips(layout, workers):
+    """Split *layout* into at most *workers* batches of similar length.
+
+    Longest clips are placed first, each on the batch with the fewest
+    frames so far, so one long clip doesn't leave the other workers
+    idle.  Clips keep their layout order inside a batch.
+    """
+    count = max(1, min(workers, len(layout)))
+    batches = [[] for _ in range(count)]
+    frames = [0] * count
+    order = sorted(range(len(layout)),
+                   key=lambda i: -(layout[i]['end'] - layout[i]['start']))
+    for i in order:
+        b = frames.index(min(frames))
+        batches[b].append(i)
+        frames[b] += layout[i]['end'] - layout[i]['start'] + 1
+    return [[layout[i] for i in sorted(batch)] for batch in batches if batch]
+
+
+def save_temp_scene(folder):
+    """Export the whole scene to *folder* (the open scene keeps its name)."""
+    path = os.path.join(folder, 'clip_export_scene.mb')
+    cmds.file(path, exportAll=True, type='mayaBinary', force=True,
+              preserveReferences=True)
+    return path
+
+
+# ── running export ──
+
+class ParallelExport:
+    """Handle on a running parallel export.
+
+    ``results`` maps clip name to ``{'name', 'ok', 'path', 'error',
+    'worker', 'ms'}`` and fills in as workers report.  Callbacks are
+    delivered through *deliver* (``executeDeferred`` inside Maya).
+    ``manifest``, if set, records the exported clips once all finish.
+    """
+
+    def __init__(self, layout, on_result=None, on_done=None, deliver=None,
+                 temp_dir=None):
+        self.layout = list(layout)
+        self.results = {}
+        self.skipped = []       # clip names left out as unchanged
+        self.manifest = None    # manifest.ExportManifest updated at the end
+        self.started = time.time()
+        self.elapsed = None
+        self._on_result = on_result
+        self._on_done = on_done
+        self._deliver = deliver or _default_deliver
+        self._temp_dir = temp_dir
+        self._procs = []
+        self._running = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._cancelled = False
+
+    # ── queries ──
+
+    def done(self):
+        """True once every worker has exited."""
+        return self._finished.is_set()
+
+    def failed(self):
+        """Results of the clips that did not export."""
+        return [r for r in self.ordered_results() if not r['ok']]
+
+    def ordered_results(self):
+        """Results in layout order (clips without a result are skipped)."""
+        return [self.results[c['name']] for c in self.layout
+                if c['name'] in self.results]
+
+    def wait(self, timeout=None):
+        """Block until all workers exit; returns :meth:`ordered_results`.
+
+        Inside the Maya GUI, deferred callbacks only run once control
+        returns to the event loop -- prefer *on_done* there.
+        """
+        self._finished.wait(timeout)
+        return self.ordered_results()
+
+    def cancel(self):
+        """Terminate every worker; unreported clips are marked failed."""
+        self._cancelled = True
+        for proc in self._procs:
+            if proc.poll() is None:
+                try:
+                    proc.terminate()
+                except OSError:
+                    pass
+
+    # ── workers ──
+
+    def start(self, batches, launcher, job_base):
+        """Start one worker per batch; *job_base* is the shared job data."""
+        self._running = len(batches)
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            p for p in (_REPO_ROOT, env.get('PYTHONPATH')) if p)
+        for i, batch in enumerate(batches):
+            job = dict(job_base, worker=i,
+                       clips=[{'name': c['name'], 'start': c['start'],
+                               'end': c['end']} for c in batch])
+            job_path = os.path.join(self._temp_dir, 'job_{:02d}.json'.format(i))
+            with open(job_path, 'w') as f:
+                json.dump(job, f, indent=2)
+            try:
+                proc = subprocess.Popen(
+                    launcher(job_path), stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                    env=env, cwd=self._temp_dir, universal_newlines=True,
+                    creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+            except (OSError, ValueError) as e:
+                self._close(i, batch, 'could not start worker: {}'.format(e))
+                continue
+            self._procs.append(proc)
+            threading.Thread(target=self._read, args=(i, proc, batch),
+                             daemon=True).start()
+
+    def _read(self, worker, proc, batch):
+        tail = deque(maxlen=20)   # last plain output lines, for errors
+        error = None
+        for line in proc.stdout:
+            if not line.startswith(MARKER):
+                tail.append(line.rstrip())
+                continue
+            try:
+                msg = json.loads(line[len(MARKER):])
+            except ValueError:
+                continue
+            if msg.get('event') == 'clip':
+                self._report(dict(
+                    name=msg['name'], ok=bool(msg.get('ok')),
+                    path=msg.get('path'), error=msg.get('error'),
+                    ms=msg.get('ms'), worker=worker))
+            elif msg.get('event') == 'error':
+                error = msg.get('error')
+        code = proc.wait()
+        if error is None:
+            if self._cancelled:
+                error = 'cancelled'
+            elif code:
+                error = 'worker exited with code {}: {}'.format(
+                    code, ' | '.join(tail) or 'no output')
+            else:
+                error = 'worker did not report this clip'
+        self._close(worker, batch, error)
+
+    def _close(self, worker, batch, error):
+        """Mark unreported clips of *batch* failed; finish after the last."""
+        for clip in batch:
+            if clip['name'] not in self.results:
+                self._report(dict(name=clip['name'], ok=False, path=None,
+                                  error=error, ms=None, worker=worker))
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+        if last:
+            self._finish()
+
+    def _report(self, result):
+        with self._lock:
+            self.results[result['name']] = result
+        if self._on_result is not None:
+            self._deliver(self._on_result, result)
+
+    def _finish(self):
+        self.elapsed = time.time() - self.started
+        if self.manifest is not None:
+            for r in self.ordered_results():
+                if r['ok']:
+                    self.manifest.record(r['name'])
+            try:
+                self.manifest.save()
+            except (IOError, OSError) as e:
+                print('!! could not write export manifest: {}'.format(e))
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+        self._finished.set()
+        if self._on_done is not None:
+            self._deliver(self._on_done, self.ordered_results())
+
+
+def _default_deliver(fn, arg):
+    if maya_utils is not None:
+        maya_utils.executeDeferred(fn, arg)
+    else:
+        fn(arg)
+
+
+def export_clips_parallel(layout, output_dir, selection_only=True,
+                          workers=None, launcher=None, on_result=None,
+                          on_done=None, scene=None, deliver=None,
+                          incremental=False):
+    """Export each clip as a separate FBX through background workers.
+
+    Same output as ``export.export_clips()`` (``<clip_name>.fbx`` in
+    *output_dir*).  *workers*: process count (default
+    :data:`DEFAULT_WORKERS`, never more than there are clips).
+    *launcher*: ``launcher(job_path) -> argv`` (default
+    :func:`mayapy_launcher`).  *scene*: an already saved scene to open
+    in the workers instead of saving the current one.
+    *on_result(result)* is called once per clip as it finishes,
+    *on_done(results)* once at the end; *deliver(fn, arg)* overrides how
+    they are called (default: ``executeDeferred`` inside Maya,
+    directly from the reader thread otherwise).  Inside Maya the export
+    manifest (:mod:`.manifest`) is updated when all workers finish;
+    with *incremental*, unchanged clips are not exported at all (their
+    names are in the handle's ``skipped``).
+
+    Returns a :class:`ParallelExport` handle immediately.
+    """
+    launcher = launcher or mayapy_launcher()
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    book, skipped = None, []
+    if cmds is not None:
+        from . import manifest
+        book = manifest.ExportManifest(output_dir)
+        dirty = book.check(layout, selection_only)
+        if incremental:
+            skipped = [c['name'] for c in layout if c not in dirty]
+            layout = dirty
+    temp_dir = tempfile.mkdtemp(prefix='clip_export_')
+    selection = []
+    if scene is None and layout:
+        scene = save_temp_scene(temp_dir)
+    if selection_only and cmds is not None:
+        selection = cmds.ls(sl=True, long=True) or []
+    job = ParallelExport(layout, on_result, on_done, deliver, temp_dir)
+    job.manifest = book
+    job.skipped = skipped
+    if skipped:
+        print('// Unchanged since last export, skipped: {}'.format(
+            ', '.join(skipped)))
+    batches = split_clips(layout, workers or DEFAULT_WORKERS)
+    if not batches:
+        job._finish()
+        return job
+    job.start(batches, launcher, {'scene': scene,
+                                  'output_dir': os.path.abspath(output_dir),
+                                  'selection': selection})
+    print('// Clip export: {} clips on {} workers -> {}'.format(
+        len(layout), len(batches), output_dir))
+    return job
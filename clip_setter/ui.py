@@ -15,12 +15,19 @@ from shiboken6 import wrapInstance
 from PySide6 import QtWidgets
 
 from .clips import (DEFAULT_CLIPS, DEFAULT_BUFFER, DEFAULT_START,
-                    layout_clips, timeline_end, clip_by_name)
-from . import export
+                    layout_clips, pack_clips, timeline_end, clip_by_name)
+from . import export, manifest, parallel
 
 WINDOW_NAME = 'clipSetterWin'
 WINDOW_TITLE = 'Clip Setter — s&box Character'
 
+# clip name field colours for export / manifest states
+ROW_COLOURS = {
+    'exported': (0.2, 0.45, 0.2),
+    'failed': (0.55, 0.2, 0.2),
+    'dirty': (0.6, 0.45, 0.15),
+}
+
 
 class ClipSetterWindow:
 
@@ -28,6 +35,16 @@ class ClipSetterWindow:
         self._clip_rows = []   # [(name_fld, frames_fld, loop_cb, cat_fld)]
         self._buffer_fld = None
         self._start_fld = None
+        self._parallel_cb = None
+        self._workers_fld = None
+        self._export_status = None
+        self._export_job = None    # running parallel.ParallelExport
+        self._export_rows = {}     # clip name -> row entry of that export
+        self._incremental_cb = None
+        self._per_clip_cb = None
+        self._output_dir = None    # last export folder (for the manifest)
+        self._overshoot = None     # {clip: (pre, post)} while the timeline is packed
+        self._pack_status = None
 
     # ──────────────────────────────────────────────
     #  Show
@@ -55,6 +72,18 @@ class ClipSetterWindow:
         self._buffer_fld = cmds.intField(v=DEFAULT_BUFFER, min=0, width=50,
                                          changeCommand=lambda *_: self._update_ranges())
         cmds.setParent('..')
+        cmds.rowLayout(numberOfColumns=3, columnWidth3=(120, 80, 300),
+                       adjustableColumn=3)
+        cmds.button(label='Pack Timeline',
+                    annotation='Measure how far each clip\'s keys run past '
+                               'its range and shrink every buffer to fit, '
+                               'moving the keys',
+                    command=lambda *_: self._pack_timeline())
+        cmds.button(label='Unpack',
+                    annotation='Move the clips back to uniform buffers',
+                    command=lambda *_: self._unpack_timeline())
+        self._pack_status = cmds.text(label='Uniform buffers', align='left')
+        cmds.setParent('..')
         cmds.setParent('..')
         cmds.setParent(main_col)
 
@@ -128,6 +157,42 @@ class ClipSetterWindow:
         bottom = cmds.columnLayout(adjustableColumn=True)
         cmds.separator(height=8, style='in')
 
+        cmds.rowLayout(numberOfColumns=4, columnWidth4=(150, 60, 50, 290),
+                       adjustableColumn=4)
+        self._parallel_cb = cmds.checkBox(
+            label='Parallel export', v=False,
+            annotation='Export FBX clips in background mayapy workers '
+                       '(the scene is saved to a temp file first)')
+        cmds.text(label='Workers:', align='right')
+        self._workers_fld = cmds.intField(v=parallel.DEFAULT_WORKERS, min=1,
+                                          max=32, width=45)
+        self._export_status = cmds.text(label='', align='left')
+        cmds.setParent(bottom)
+
+        cmds.rowLayout(numberOfColumns=2, columnWidth2=(260, 300),
+                       adjustableColumn=2)
+        self._incremental_cb = cmds.checkBox(
+            label='Skip unchanged clips', v=False,
+            annotation='Only export clips whose keys or export settings '
+                       'changed since the last export to that folder')
+        cmds.button(label='Show Changed Clips',
+                    annotation='Highlight clips that differ from the last '
+                               'export (export manifest of the folder)',
+                    command=lambda *_: self._show_dirty())
+        cmds.setParent(bottom)
+
+        cmds.rowLayout(numberOfColumns=2, columnWidth2=(260, 300),
+                       adjustableColumn=2)
+        self._per_clip_cb = cmds.checkBox(
+            label='Also write per-clip files', v=False,
+            annotation='With Export Multi-Take FBX, also export each clip '
+                       'as its own FBX next to the multi-take file')
+        cmds.button(label='Export Multi-Take FBX',
+                    annotation='Export one FBX holding every clip as a '
+                               'separate take (geometry written once)',
+                    command=lambda *_: self._export_multitake())
+        cmds.setParent(bottom)
+
         cmds.rowLayout(numberOfColumns=3, columnWidth3=(186, 186, 186),
                        adjustableColumn=2)
         cmds.button(label='Apply to Timeline', height=32,
@@ -153,6 +218,13 @@ class ClipSetterWindow:
             attachControl=[(scroll, 'bottom', 0, bottom)],
             attachNone=[(bottom, 'top')])
 
+        # the packed state lives in the scene; pick it up now and
+        # whenever another scene is opened while the window is up
+        self._restore_pack_state()
+        for event in ('SceneOpened', 'NewSceneOpened'):
+            cmds.scriptJob(event=[event, self._restore_pack_state],
+                           parent=win)
+
         cmds.showWindow(win)
         ui_word_weighting.apply_deferred(WINDOW_NAME)
 
@@ -218,6 +290,8 @@ class ClipSetterWindow:
         clips = self._read_clips()
         buf = cmds.intField(self._buffer_fld, q=True, v=True)
         start = cmds.intField(self._start_fld, q=True, v=True)
+        if self._overshoot is not None:
+            return pack_clips(clips, self._overshoot, start=start, buffer=buf)
         return layout_clips(clips, buffer=buf, start=start)
 
     def _update_ranges(self):
@@ -230,6 +304,64 @@ class ClipSetterWindow:
                 cmds.text(entry['end_lbl'], e=True,
                           label=str(int(layout[i]['end'])))
 
+    def _pack_timeline(self):
+        """Shrink every buffer to the measured overshoot and move the keys."""
+        old = self._get_layout()
+        if not old:
+            return
+        buf = cmds.intField(self._buffer_fld, q=True, v=True)
+        start = cmds.intField(self._start_fld, q=True, v=True)
+        overshoot = export.measure_overshoot(old, buf)
+        new = pack_clips(self._read_clips(), overshoot, start=start,
+                         buffer=buf)
+        result = cmds.confirmDialog(
+            title='Pack Timeline',
+            message='Timeline ends at frame {} instead of {}.\n'
+                    'Move the keys of every clip and delete the bind-pose '
+                    'separators?'.format(timeline_end(new), timeline_end(old)),
+            button=['Pack', 'Cancel'], defaultButton='Pack',
+            cancelButton='Cancel')
+        if result != 'Pack':
+            return
+        export.move_clips(old, new, overshoot, buf)
+        self._overshoot = overshoot
+        export.save_pack_state(overshoot, start, buf)
+        self._update_ranges()
+        cmds.text(self._pack_status, e=True,
+                  label='Packed: {} frames saved -- key the separators '
+                        'again'.format(timeline_end(old) - timeline_end(new)))
+
+    def _restore_pack_state(self):
+        """Read the packed layout saved in the scene into the window."""
+        state = export.load_pack_state()
+        if state is None:
+            self._overshoot = None
+            cmds.text(self._pack_status, e=True, label='Uniform buffers')
+        else:
+            if state.get('start') is not None:
+                cmds.intField(self._start_fld, e=True, v=state['start'])
+            if state.get('buffer') is not None:
+                cmds.intField(self._buffer_fld, e=True, v=state['buffer'])
+            self._overshoot = state['overshoot']
+            cmds.text(self._pack_status, e=True,
+                      label='Packed (saved with the scene)')
+        self._update_ranges()
+
+    def _unpack_timeline(self):
+        """Move the clips of a packed timeline back to uniform buffers."""
+        if self._overshoot is None:
+            return
+        old = self._get_layout()
+        buf = cmds.intField(self._buffer_fld, q=True, v=True)
+        new = layout_clips(self._read_clips(), buffer=buf,
+                           start=cmds.intField(self._start_fld, q=True, v=True))
+        export.move_clips(old, new, self._overshoot, buf)
+        self._overshoot = None
+        export.save_pack_state(None)
+        self._update_ranges()
+        cmds.text(self._pack_status, e=True,
+                  label='Uniform buffers -- key the separators again')
+
     # ──────────────────────────────────────────────
     #  Clip playback
     # ──────────────────────────────────────────────
@@ -314,38 +446,177 @@ class ClipSetterWindow:
                         len(layout), node),
             button=['OK'])
 
+    @staticmethod
+    def _confirm_selection():
+        """Return True to export the selection, False for everything,
+        None if the user cancelled."""
+        if cmds.ls(sl=True):
+            return True
+        result = cmds.confirmDialog(
+            title='No Selection',
+            message='No nodes are selected. Export all?\n'
+                    '(For cleaner FBX, select the skeleton root + mesh first.)',
+            button=['Export All', 'Cancel'],
+            defaultButton='Cancel',
+            cancelButton='Cancel')
+        return False if result == 'Export All' else None
+
     def _export_fbx(self):
         layout = self._get_layout()
         self._update_ranges()
 
-        # Warn if nothing is selected
-        sel = cmds.ls(sl=True)
-        if not sel:
-            result = cmds.confirmDialog(
-                title='No Selection',
-                message='No nodes are selected. Export all?\n'
-                        '(For cleaner FBX, select the skeleton root + mesh first.)',
-                button=['Export All', 'Cancel'],
-                defaultButton='Cancel',
-                cancelButton='Cancel')
-            if result != 'Export All':
-                return
+        selection_only = self._confirm_selection()
+        if selection_only is None:
+            return
 
         result = cmds.fileDialog2(
             fileMode=3, caption='Choose Export Folder')
         if not result:
             return
         output_dir = result[0]
-        selection_only = bool(sel)
+        self._output_dir = output_dir
+        incremental = cmds.checkBox(self._incremental_cb, q=True, v=True)
+
+        if cmds.checkBox(self._parallel_cb, q=True, v=True):
+            self._export_parallel(layout, output_dir, selection_only,
+                                  incremental)
+            return
 
         exported = export.export_clips(layout, output_dir,
-                                       selection_only=selection_only)
+                                       selection_only=selection_only,
+                                       incremental=incremental)
+        for entry in self._clip_rows:
+            self._tint_row(entry, None)
         cmds.confirmDialog(
             title='Export Complete',
-            message='Exported {} clips to:\n{}'.format(
-                len(exported), output_dir),
+            message='Exported {} of {} clips to:\n{}'.format(
+                len(exported), len(layout), output_dir),
             button=['OK'])
 
+    def _export_multitake(self):
+        layout = self._get_layout()
+        self._update_ranges()
+        if not layout:
+            return
+
+        selection_only = self._confirm_selection()
+        if selection_only is None:
+            return
+
+        result = cmds.fileDialog2(
+            fileMode=0, fileFilter='FBX (*.fbx)',
+            caption='Save Multi-Take FBX')
+        if not result:
+            return
+        filepath = result[0]
+        if not filepath.lower().endswith('.fbx'):
+            filepath += '.fbx'
+        per_clip = cmds.checkBox(self._per_clip_cb, q=True, v=True)
+        if per_clip:
+            self._output_dir = os.path.dirname(filepath)
+
+        written = export.export_multitake(layout, filepath,
+                                          selection_only=selection_only,
+                                          per_clip=per_clip)
+        message = 'Exported {} takes to:\n{}'.format(len(layout), filepath)
+        if per_clip:
+            message += '\n\nplus {} per-clip files'.format(len(written) - 1)
+        cmds.confirmDialog(title='Export Complete', message=message,
+                           button=['OK'])
+
+    def _show_dirty(self):
+        """Tint clips that changed since the last export to the folder."""
+        output_dir = self._output_dir
+        if not output_dir:
+            result = cmds.fileDialog2(fileMode=3,
+                                      caption='Choose Export Folder')
+            if not result:
+                return
+            output_dir = self._output_dir = result[0]
+        layout = self._get_layout()
+        selection_only = bool(cmds.ls(sl=True))
+        dirty = manifest.ExportManifest(output_dir).check(layout,
+                                                          selection_only)
+        names = set(c['name'] for c in dirty)
+        for entry, clip in zip(self._clip_rows, layout):
+            self._tint_row(entry, 'dirty' if clip['name'] in names else None)
+        self._set_export_status('{} of {} clips changed since the last '
+                                'export'.format(len(dirty), len(layout)))
+
+    # ──────────────────────────────────────────────
+    #  Parallel export
+    # ──────────────────────────────────────────────
+
+    def _export_parallel(self, layout, output_dir, selection_only,
+                         incremental=False):
+        """Start a background export; rows light up as clips finish."""
+        if self._export_job is not None and not self._export_job.done():
+            cmds.warning('A parallel export is still running.')
+            return
+        try:
+            launcher = parallel.mayapy_launcher()
+        except RuntimeError as e:
+            cmds.warning(str(e))
+            return
+        self._export_rows = {}
+        for entry, clip in zip(self._clip_rows, layout):
+            self._export_rows[clip['name']] = entry
+            self._tint_row(entry, None)
+        workers = cmds.intField(self._workers_fld, q=True, v=True)
+        self._export_job = parallel.export_clips_parallel(
+            layout, output_dir, selection_only=selection_only,
+            workers=workers, launcher=launcher,
+            on_result=self._on_export_result,
+            on_done=self._on_export_done, incremental=incremental)
+        self._set_export_status('Exporting {} clips ({} unchanged)...'.format(
+            len(self._export_job.layout), len(self._export_job.skipped)))
+
+    def _on_export_result(self, result):
+        if result['ok']:
+            print('// Exported: {} -> {} ({:.0f} ms, worker {})'.format(
+                result['name'], result['path'], result['ms'] or 0.0,
+                result['worker']))
+        else:
+            print('!! Export failed: {}: {}'.format(result['name'],
+                                                    result['error']))
+        entry = self._export_rows.get(result['name'])
+        if entry is not None:
+            self._tint_row(entry, 'exported' if result['ok'] else 'failed')
+        job = self._export_job
+        if job is not None:
+            self._set_export_status('Exported {} / {} ({} failed)'.format(
+                len(job.results), len(job.layout), len(job.failed())))
+
+    def _on_export_done(self, results):
+        failed = [r for r in results if not r['ok']]
+        elapsed = self._export_job.elapsed if self._export_job else 0.0
+        summary = 'Exported {} / {} clips in {:.1f} s'.format(
+            len(results) - len(failed), len(results), elapsed or 0.0)
+        print('// ' + summary)
+        self._set_export_status(summary)
+        if failed:
+            cmds.confirmDialog(
+                title='Export Finished With Errors',
+                message='{}\n\nFailed:\n{}'.format(summary, '\n'.join(
+                    '{}: {}'.format(r['name'], r['error']) for r in failed)),
+                button=['OK'])
+
+    def _set_export_status(self, label):
+        if self._export_status and cmds.text(self._export_status, exists=True):
+            cmds.text(self._export_status, e=True, label=label)
+
+    @staticmethod
+    def _tint_row(entry, state):
+        """Colour a clip's name field by *state* (``ROW_COLOURS``); None resets."""
+        fld = entry['name']
+        if not cmds.textField(fld, exists=True):
+            return
+        if state is None:
+            cmds.textField(fld, e=True, enableBackground=False)
+            return
+        cmds.textField(fld, e=True, enableBackground=True,
+                       backgroundColor=ROW_COLOURS[state])
+
     def _qt_parent(self):
         ptr = omui.MQtUtil.mainWindow()
         return wrapInstance(int(ptr), QtWidgets.QWidget) if ptr else None
@@ -312,9 +312,17 @@ _BUTTONS = [
             'ui_word_weighting',
             'anim_gen_v2.core.patterns',
             'anim_gen_v2.core.channel',
+            'anim_gen_v2.core.chain',
             'anim_gen_v2.core.resolver',
+            'anim_gen_v2.core.plugs',
+            'anim_gen_v2.core.evaluator',
+            'anim_gen_v2.core.reduce',
+            'anim_gen_v2.core.plan',
             'anim_gen_v2.core.engine',
+            'anim_gen_v2.core.preview',
             'anim_gen_v2.core.presets',
+            'anim_gen_v2.core.params',
+            'anim_gen_v2.core.batch',
             'anim_gen_v2.layers',
             'anim_gen_v2.layers.walk_primary',
             'anim_gen_v2.layers.walk_secondary',
@@ -322,6 +330,7 @@ _BUTTONS = [
             'anim_gen_v2.layers.run_primary',
             'anim_gen_v2.layers.sidestep_primary',
             'anim_gen_v2.ui.range_slider',
+            'anim_gen_v2.ui.scheduler',
             'anim_gen_v2.ui.window',
             'anim_gen_v2.launcher',
         ],
@@ -333,7 +342,10 @@ _BUTTONS = [
         'modules': [
             'ui_word_weighting',
             'clip_setter.clips',
+            'clip_setter.manifest',
             'clip_setter.export',
+            'clip_setter.export_worker',
+            'clip_setter.parallel',
             'clip_setter.ui',
         ],
         'entry': 'clip_setter.ui.show()',